@@ -1,18 +1,37 @@
+import math
 import random
+from collections import Counter
 
+import numpy as np
 
+from cache_fitness import CacheFitness, chave_genoma_binario
+from instancias_knapsack import instancia_classica
+from execucao_paralela import executar_repeticoes
+from knapsack_exato import gap_otimalidade, resolver_knapsack
+from telemetria import proporcao_distintos
+from checkpoint import restaurar_rng
+from selecao import (
+    POLITICAS_SUBSTITUICAO, MelhorAteAgora, indices_substituicao, melhores_indices, torneios,
+)
+from instrumentacao import Instrumentacao, exportar_flame, imprimir_perfil
 
 
 # ==============================================================================
 # PROBLEMA DA MOCHILA (KNAPSACK PROBLEM)
 # ==============================================================================
 
-PESOS = [44, 46, 90, 72, 91, 40, 75, 35, 8, 54, 78, 40, 77, 15, 61, 17, 75, 29, 75, 63]
-GANHOS = [92, 4, 43, 83, 84, 68, 92, 82, 6, 44, 32, 18, 56, 83, 25, 96, 70, 48, 14, 58]
-CAPACIDADE_MAXIMA = 878
+# Instância de 20 itens compartilhada com o Hill Climbing (instancias_knapsack).
+INSTANCIA = instancia_classica(20)
+PESOS = INSTANCIA.pesos_lista
+GANHOS = INSTANCIA.ganhos_lista
+CAPACIDADE_MAXIMA = INSTANCIA.capacidade
 
 # O número de itens é a dimensão.
-NUMERO_ITENS = len(PESOS)
+NUMERO_ITENS = INSTANCIA.dimensao
+
+# Vetores NumPy usados na avaliação da população inteira de uma só vez.
+GANHOS_ARRAY = INSTANCIA.ganhos
+PESOS_ARRAY = INSTANCIA.pesos
 
 # ==============================================================================
 # PARÂMETROS DO ALGORITMO GENÉTICO
@@ -26,6 +45,14 @@ TAXA_MUTACAO = 0.02          # Probabilidade de um gene (bit) ser alterado.
 QTD_ELITISMO = 2             # Quantidade dos melhores indivíduos que passam direto.
 NUMERO_EXECUCOES = 30       # Quantidade de vezes que o AG será rodado para ter estatísticas.
 
+# Modelo estacionário (steady-state): em vez de trocar a população inteira a
+# cada geração, FILHOS_POR_PASSO filhos por vez sobrescrevem, no lugar, os
+# indivíduos escolhidos pela política SUBSTITUICAO ("pior" ou "torneio").
+MODELO = "geracional"        # "geracional" ou "estacionario"
+FILHOS_POR_PASSO = 2         # Filhos gerados e inseridos a cada passo estacionário.
+SUBSTITUICAO = "pior"        # Quem sai da população para dar lugar a um filho.
+REJEITAR_DUPLICADOS = False  # Descarta filhos iguais a um indivíduo da população.
+
 # ==============================================================================
 # FUNÇÕES BÁSICAS
 # ==============================================================================
@@ -51,6 +78,24 @@ def calcular_fitness(individuo):
     return ganho_total, peso_total
 
 
+def avaliar_populacao(populacao):
+    """
+    Avalia todos os indivíduos de uma vez com dois produtos matriz-vetor.
+    A população é tratada como uma matriz (indivíduos x itens) de 0/1.
+    Indivíduos que excedem a capacidade recebem ganho 0.
+    Retorna uma tupla de arrays: (ganhos, pesos)
+    """
+    return INSTANCIA.avaliar_populacao(populacao)
+
+
+def avaliacoes_como_tuplas(ganhos, pesos):
+    """
+    Converte o resultado de 'avaliar_populacao' para a lista de tuplas
+    (ganho_total, peso_total) usada pela seleção.
+    """
+    return list(zip(ganhos.tolist(), pesos.tolist()))
+
+
 def gerar_individuo_aleatorio():
     """
     Cria uma solução inicial aleatória (lista binária).
@@ -61,40 +106,44 @@ def gerar_individuo_aleatorio():
     return individuo
 
 
-def gerar_populacao_inicial():
+def gerar_populacao_inicial(tamanho_populacao=None):
     """
-    Cria a primeira população, um conjunto de soluções aleatórias.
+    Cria a primeira população, um conjunto de soluções aleatórias
+    ('tamanho_populacao', padrão: TAMANHO_POPULACAO).
     """
     populacao = []
-    for _ in range(TAMANHO_POPULACAO):
+    for _ in range(tamanho_populacao or TAMANHO_POPULACAO):
         populacao.append(gerar_individuo_aleatorio())
     return populacao
 
 
-def selecao_torneio(populacao, avaliacoes_fitness):
+def selecao_torneio(populacao, avaliacoes_fitness, tamanho_torneio=None):
     """
-    Seleciona o melhor indivíduo entre 'TAMANHO_TORNEIO' candidatos aleatórios.
+    Seleciona o melhor indivíduo entre 'tamanho_torneio' candidatos
+    aleatórios (padrão: TAMANHO_TORNEIO).
+    Para uma geração inteira, 'selecao.torneios' sorteia todos de uma vez.
     """
-    # Combina indivíduos e suas avaliações
-    populacao_com_fitness = list(zip(populacao, avaliacoes_fitness))
-    
-    # Escolhe candidatos aleatórios
-    candidatos = random.sample(populacao_com_fitness, TAMANHO_TORNEIO)
-    
+    # Sorteia só os índices dos candidatos, sem copiar a população
+    candidatos = random.sample(range(len(populacao)), tamanho_torneio or TAMANHO_TORNEIO)
+
     # Encontra o vencedor (maior ganho/fitness)
-    # x[1][0] acessa o ganho_total
-    vencedor = max(candidatos, key=lambda x: x[1][0])
-    
+    # avaliacoes_fitness[i][0] é o ganho_total
+    vencedor = max(candidatos, key=lambda i: avaliacoes_fitness[i][0])
+
     # Retorna APENAS o indivíduo
-    return vencedor[0] 
+    return populacao[vencedor]
 
 
-def crossover_um_ponto(pai1, pai2):
+def crossover_um_ponto(pai1, pai2, taxa_crossover=None):
     """
     Combina pais trocando genes a partir de um ponto de corte aleatório.
+    Todos os crossovers ocorrem com probabilidade 'taxa_crossover'
+    (padrão: TAXA_CROSSOVER).
     """
     # Verifica a taxa de crossover
-    if random.random() > TAXA_CROSSOVER:
+    if taxa_crossover is None:
+        taxa_crossover = TAXA_CROSSOVER
+    if random.random() > taxa_crossover:
         # Se não ocorrer, retorna cópias idênticas dos pais
         return pai1[:], pai2[:]
     
@@ -108,11 +157,13 @@ def crossover_um_ponto(pai1, pai2):
     return filho1, filho2
 
 
-def crossover_dois_pontos(pai1, pai2):
+def crossover_dois_pontos(pai1, pai2, taxa_crossover=None):
     """
     Combina pais trocando a seção entre dois pontos de corte aleatórios.
     """
-    if random.random() > TAXA_CROSSOVER:
+    if taxa_crossover is None:
+        taxa_crossover = TAXA_CROSSOVER
+    if random.random() > taxa_crossover:
         return pai1[:], pai2[:]
         
     # Escolhe os pontos de corte garantindo que ponto1 < ponto2
@@ -128,11 +179,13 @@ def crossover_dois_pontos(pai1, pai2):
     return filho1, filho2
 
 
-def crossover_uniforme(pai1, pai2):
+def crossover_uniforme(pai1, pai2, taxa_crossover=None):
     """
     Combina pais, decidindo aleatoriamente qual gene de qual pai será herdado.
     """
-    if random.random() > TAXA_CROSSOVER:
+    if taxa_crossover is None:
+        taxa_crossover = TAXA_CROSSOVER
+    if random.random() > taxa_crossover:
         return pai1[:], pai2[:]
         
     filho1, filho2 = [], []
@@ -148,83 +201,686 @@ def crossover_uniforme(pai1, pai2):
     return filho1, filho2
 
 
-def mutacao_bit_flip(individuo):
+def mutacao_bit_flip(individuo, taxa_mutacao=None):
     """
-    Inverte (flipa) cada gene (bit) com uma pequena probabilidade (TAXA_MUTACAO).
+    Inverte (flipa) cada gene (bit) com uma pequena probabilidade
+    ('taxa_mutacao', padrão: TAXA_MUTACAO).
     """
+    if taxa_mutacao is None:
+        taxa_mutacao = TAXA_MUTACAO
     for i in range(NUMERO_ITENS):
-        if random.random() < TAXA_MUTACAO:
+        if random.random() < taxa_mutacao:
             # 1 - valor inverte o bit (0 vira 1, 1 vira 0)
             individuo[i] = 1 - individuo[i] 
 
 
+# ==============================================================================
+# GENOMA COMPACTADO (BITMASK)
+# ==============================================================================
+# O bit i do inteiro representa o gene i. Crossover e mutação viram operações
+# AND/OR/XOR sobre a máscara inteira, e a população pode ser convertida para
+# linhas de 'np.packbits' (um byte a cada 8 itens) para a avaliação em lote.
+
+NUMERO_BYTES = (NUMERO_ITENS + 7) // 8
+MASCARA_COMPLETA = (1 << NUMERO_ITENS) - 1
+
+
+def _tabela_por_byte(valores):
+    """
+    Pré-calcula, para cada byte do genoma e cada um dos 256 valores possíveis,
+    a soma dos valores dos itens cujos bits estão ligados.
+    Retorna uma matriz (NUMERO_BYTES x 256).
+    """
+    valores_por_byte = np.zeros(NUMERO_BYTES * 8, dtype=np.int64)
+    valores_por_byte[:len(valores)] = valores
+    valores_por_byte = valores_por_byte.reshape(NUMERO_BYTES, 8)
+
+    # bits[b, k] = k-ésimo bit (do menos significativo) do byte b
+    bits = np.unpackbits(
+        np.arange(256, dtype=np.uint8)[:, None], axis=1, bitorder="little"
+    ).astype(np.int64)
+
+    return valores_por_byte @ bits.T
+
+
+TABELA_GANHOS_BYTE = _tabela_por_byte(GANHOS)
+TABELA_PESOS_BYTE = _tabela_por_byte(PESOS)
+_INDICES_BYTES = np.arange(NUMERO_BYTES)
+
+
+def compactar_individuo(individuo):
+    """
+    Converte um indivíduo em lista binária para a máscara inteira.
+    """
+    linha = np.packbits(np.asarray(individuo, dtype=np.uint8), bitorder="little")
+    return int.from_bytes(linha.tobytes(), "little")
+
+
+def descompactar_individuo(mascara):
+    """
+    Converte a máscara inteira de volta para a lista binária.
+    """
+    linha = np.frombuffer(mascara.to_bytes(NUMERO_BYTES, "little"), dtype=np.uint8)
+    return np.unpackbits(linha, count=NUMERO_ITENS, bitorder="little").tolist()
+
+
+def compactar_populacao(mascaras):
+    """
+    Converte uma lista de máscaras inteiras em uma matriz (indivíduos x NUMERO_BYTES)
+    no mesmo formato de 'np.packbits(..., bitorder="little")'.
+    """
+    dados = b"".join(m.to_bytes(NUMERO_BYTES, "little") for m in mascaras)
+    return np.frombuffer(dados, dtype=np.uint8).reshape(len(mascaras), NUMERO_BYTES)
+
+
+def calcular_fitness_compactado(mascara):
+    """
+    Versão de 'calcular_fitness' para a máscara inteira, usando as tabelas
+    pré-calculadas por byte.
+    Retorna uma tupla: (ganho_total, peso_total)
+    """
+    linha = np.frombuffer(mascara.to_bytes(NUMERO_BYTES, "little"), dtype=np.uint8)
+    peso_total = int(TABELA_PESOS_BYTE[_INDICES_BYTES, linha].sum())
+
+    if peso_total > CAPACIDADE_MAXIMA:
+        return 0, peso_total
+
+    return int(TABELA_GANHOS_BYTE[_INDICES_BYTES, linha].sum()), peso_total
+
+
+def avaliar_populacao_compactada(matriz_compactada):
+    """
+    Versão de 'avaliar_populacao' para a matriz de bytes produzida por
+    'compactar_populacao' (ou por 'np.packbits' com bitorder="little").
+    Retorna uma tupla de arrays: (ganhos, pesos)
+    """
+    ganhos = TABELA_GANHOS_BYTE[_INDICES_BYTES, matriz_compactada].sum(axis=1)
+    pesos = TABELA_PESOS_BYTE[_INDICES_BYTES, matriz_compactada].sum(axis=1)
+    ganhos[pesos > CAPACIDADE_MAXIMA] = 0
+
+    return ganhos, pesos
+
+
+def gerar_individuo_compactado():
+    """
+    Cria uma solução inicial aleatória já na forma de máscara.
+    """
+    return random.getrandbits(NUMERO_ITENS)
+
+
+def crossover_um_ponto_compactado(pai1, pai2, taxa_crossover=None):
+    """
+    Crossover de um ponto sobre máscaras: os bits abaixo do corte vêm de um pai
+    e os demais do outro.
+    """
+    if taxa_crossover is None:
+        taxa_crossover = TAXA_CROSSOVER
+    if random.random() > taxa_crossover:
+        return pai1, pai2
+
+    ponto_corte = random.randint(1, NUMERO_ITENS - 1)
+    troca = (pai1 ^ pai2) & (MASCARA_COMPLETA ^ ((1 << ponto_corte) - 1))
+
+    return pai1 ^ troca, pai2 ^ troca
+
+
+def crossover_dois_pontos_compactado(pai1, pai2, taxa_crossover=None):
+    """
+    Crossover de dois pontos sobre máscaras: troca os bits entre os cortes.
+    """
+    if taxa_crossover is None:
+        taxa_crossover = TAXA_CROSSOVER
+    if random.random() > taxa_crossover:
+        return pai1, pai2
+
+    ponto1 = random.randint(1, NUMERO_ITENS - 2)
+    ponto2 = random.randint(ponto1 + 1, NUMERO_ITENS - 1)
+    troca = (pai1 ^ pai2) & (((1 << ponto2) - 1) ^ ((1 << ponto1) - 1))
+
+    return pai1 ^ troca, pai2 ^ troca
+
+
+def crossover_uniforme_compactado(pai1, pai2, taxa_crossover=None):
+    """
+    Crossover uniforme sobre máscaras: uma máscara aleatória decide quais bits
+    são trocados entre os pais.
+    """
+    if taxa_crossover is None:
+        taxa_crossover = TAXA_CROSSOVER
+    if random.random() > taxa_crossover:
+        return pai1, pai2
+
+    troca = (pai1 ^ pai2) & random.getrandbits(NUMERO_ITENS)
+
+    return pai1 ^ troca, pai2 ^ troca
+
+
+def mutacao_bit_flip_compactada(mascara, taxa_mutacao=None):
+    """
+    Inverte cada bit com probabilidade 'taxa_mutacao' (padrão: TAXA_MUTACAO)
+    usando XOR com uma máscara esparsa. As posições são sorteadas por saltos
+    geométricos, então o custo é proporcional ao número de bits invertidos e
+    não a NUMERO_ITENS.
+    Retorna a nova máscara (inteiros são imutáveis).
+    """
+    if taxa_mutacao is None:
+        taxa_mutacao = TAXA_MUTACAO
+    if taxa_mutacao <= 0:
+        return mascara
+
+    log_complemento = math.log(1.0 - taxa_mutacao) if taxa_mutacao < 1 else None
+    inversoes = 0
+    pos = -1
+
+    while True:
+        if log_complemento is None:
+            pos += 1
+        else:
+            pos += 1 + int(math.log(1.0 - random.random()) / log_complemento)
+        if pos >= NUMERO_ITENS:
+            break
+        inversoes |= 1 << pos
+
+    return mascara ^ inversoes
+
+
+# Versão compactada de cada operador de crossover
+CROSSOVERS_COMPACTADOS = {
+    crossover_um_ponto: crossover_um_ponto_compactado,
+    crossover_dois_pontos: crossover_dois_pontos_compactado,
+    crossover_uniforme: crossover_uniforme_compactado,
+}
+
+
 # ==============================================================================
 # FLUXO DE EVOLUÇÃO E EXECUÇÃO
 # ==============================================================================
 
-def evoluir_populacao(populacao_atual, funcao_crossover):
+def _avaliar(populacao, compactado, cache=None):
     """
-    Aplica Elitismo, Seleção, Crossover e Mutação para criar a próxima geração.
+    Avalia a população em lote na representação escolhida.
+    Com um CacheFitness, apenas os genomas ausentes do cache são avaliados.
     """
-    # 1. Avalia a população
-    avaliacoes_fitness = [calcular_fitness(ind) for ind in populacao_atual]
-    
-    # 2. Prepara para o Elitismo: Ordena por ganho (fitness)
-    populacao_ordenada_com_fitness = list(zip(populacao_atual, avaliacoes_fitness))
-    # Ordena pelo ganho (primeiro elemento do tuple de fitness), do maior para o menor
-    populacao_ordenada_com_fitness.sort(key=lambda x: x[1][0], reverse=True)
-
-    # 3. Aplica Elitismo: Os melhores vão direto para a próxima geração
-    individuos_ordenados = [ind for ind, fit in populacao_ordenada_com_fitness]
-    nova_populacao = individuos_ordenados[:QTD_ELITISMO]
-    
-    # 4. Cria novos indivíduos até atingir o TAMANHO_POPULACAO
-    while len(nova_populacao) < TAMANHO_POPULACAO:
-        # Seleção
-        pai1 = selecao_torneio(populacao_atual, avaliacoes_fitness)
-        pai2 = selecao_torneio(populacao_atual, avaliacoes_fitness)
-        
-        # Crossover
-        filho1, filho2 = funcao_crossover(pai1, pai2)
-        
-        # Mutação (altera os filhos)
-        mutacao_bit_flip(filho1)
-        mutacao_bit_flip(filho2)
-        
-        # Adiciona filhos à nova população
-        nova_populacao.append(filho1)
-        if len(nova_populacao) < TAMANHO_POPULACAO:
-            nova_populacao.append(filho2)
-            
-    return nova_populacao
+    if cache is not None:
+        avaliacoes = cache.avaliar_lote(
+            populacao, lambda faltantes: avaliacoes_como_tuplas(*_avaliar(faltantes, compactado))
+        )
+        ganhos = np.array([ganho for ganho, _ in avaliacoes], dtype=np.int64)
+        pesos = np.array([peso for _, peso in avaliacoes], dtype=np.int64)
+        return ganhos, pesos
+    if compactado:
+        return avaliar_populacao_compactada(compactar_populacao(populacao))
+    return avaliar_populacao(populacao)
 
 
-def executar_ag_knapsack(funcao_crossover):
+def _avaliar_filhos(filhos, compactado, cache=None):
     """
-    Executa o Algoritmo Genético por um número fixo de gerações.
+    Avalia os poucos filhos de um passo estacionário, um a um (sem o custo
+    fixo da avaliação em lote). Retorna: (ganhos, pesos)
     """
-    populacao = gerar_populacao_inicial()
-    melhor_individuo_geral = None
-    melhor_fitness_geral = (0, 0) # (ganho, peso)
+    if cache is not None:
+        return _avaliar(filhos, compactado, cache)
+    funcao = calcular_fitness_compactado if compactado else calcular_fitness
+    avaliacoes = [funcao(filho) for filho in filhos]
+    return [ganho for ganho, _ in avaliacoes], [peso for _, peso in avaliacoes]
 
-    for _ in range(NUMERO_GERSACOES):
-        # Gera a próxima população
-        populacao = evoluir_populacao(populacao, funcao_crossover)
-        
-        # Avalia a nova população para encontrar o melhor
-        avaliacoes_fitness = [calcular_fitness(ind) for ind in populacao]
-        
-        # Encontra a melhor fitness (maior ganho) da geração
-        melhor_fitness_geracao = max(avaliacoes_fitness, key=lambda x: x[0])
-        
-        # Atualiza o melhor global
-        if melhor_fitness_geracao[0] > melhor_fitness_geral[0]:
-            melhor_fitness_geral = melhor_fitness_geracao
-            # Encontra o indivíduo correspondente ao melhor fitness
-            indice_melhor = avaliacoes_fitness.index(melhor_fitness_geral)
-            melhor_individuo_geral = populacao[indice_melhor]
-            
-    return melhor_fitness_geral, melhor_individuo_geral
+
+def _sem_duplicados(filhos, chave, presentes):
+    """Filhos cujo genoma não está na população nem se repete no próprio passo."""
+    vistos, unicos = set(), []
+    for filho in filhos:
+        genoma = chave(filho)
+        if presentes[genoma] > 0 or genoma in vistos:
+            continue
+        vistos.add(genoma)
+        unicos.append(filho)
+    return unicos
+
+
+def _populacao_como_array(populacao, compactado):
+    """População como matriz uint8 (bytes das máscaras ou genes 0/1), para o checkpoint."""
+    if compactado:
+        return compactar_populacao(populacao).copy()
+    return np.array(populacao, dtype=np.uint8)
+
+
+def _populacao_de_array(matriz, compactado):
+    """Inverso de '_populacao_como_array'."""
+    if compactado:
+        return [int.from_bytes(linha.tobytes(), "little") for linha in matriz]
+    return matriz.astype(np.int64).tolist()
+
+
+def _melhor_como_arrays(melhor_individuo, compactado):
+    """Melhor indivíduo até agora (pode não existir) como arrays do checkpoint."""
+    if melhor_individuo is None:
+        return {"tem_melhor": np.array(False), "melhor_individuo": np.zeros(0, dtype=np.uint8)}
+    linha = _populacao_como_array([melhor_individuo], compactado)[0]
+    return {"tem_melhor": np.array(True), "melhor_individuo": linha}
+
+
+def _registrar_geracao(telemetria, geracao, populacao, ganhos, compactado):
+    """Envia melhor, média e diversidade da geração para a telemetria."""
+    chaves = populacao if compactado else map(tuple, populacao)
+    telemetria.registrar(
+        geracao, ganhos.max(), float(ganhos.mean()), proporcao_distintos(chaves)
+    )
+
+
+# ==============================================================================
+# CONFIGURAÇÃO E MOTOR DO AG
+# ==============================================================================
+# Os parâmetros acima são os padrões. Uma ConfiguracaoAG guarda os parâmetros
+# de uma variante e um AlgoritmoGeneticoKnapsack executa o AG com ela, sem
+# ler nem alterar as constantes do módulo: várias configurações rodam lado a
+# lado no mesmo processo ou em um pool. As funções do módulo
+# (evoluir_populacao, executar_ag_knapsack, ...) usam as constantes atuais.
+
+# Parâmetro da configuração -> constante do módulo com o valor padrão
+PARAMETROS = {
+    "tamanho_populacao": "TAMANHO_POPULACAO",
+    "numero_geracoes": "NUMERO_GERSACOES",
+    "tamanho_torneio": "TAMANHO_TORNEIO",
+    "taxa_crossover": "TAXA_CROSSOVER",
+    "taxa_mutacao": "TAXA_MUTACAO",
+    "qtd_elitismo": "QTD_ELITISMO",
+    "numero_execucoes": "NUMERO_EXECUCOES",
+    "modelo": "MODELO",
+    "filhos_por_passo": "FILHOS_POR_PASSO",
+    "substituicao": "SUBSTITUICAO",
+    "rejeitar_duplicados": "REJEITAR_DUPLICADOS",
+}
+MODELOS = ("geracional", "estacionario")
+
+
+class ConfiguracaoAG:
+    def __init__(self, **parametros):
+        """
+        Inicializa a configuração
+
+        Args:
+            **parametros: valores que substituem os padrões do módulo, pelos
+                nomes das chaves de PARAMETROS (ex.: tamanho_populacao=100)
+        """
+        desconhecidos = sorted(set(parametros) - set(PARAMETROS))
+        if desconhecidos:
+            raise TypeError(f"Parâmetros desconhecidos: {desconhecidos}. Use {tuple(PARAMETROS)}.")
+        padroes = globals()
+        for nome, constante in PARAMETROS.items():
+            setattr(self, nome, parametros.get(nome, padroes[constante]))
+
+        if not 0 <= self.qtd_elitismo < self.tamanho_populacao:
+            raise ValueError("O elitismo deve ser menor que o tamanho da população.")
+        if not 1 <= self.tamanho_torneio <= self.tamanho_populacao:
+            raise ValueError("O torneio deve ter entre 1 e 'tamanho_populacao' competidores.")
+        if self.modelo not in MODELOS:
+            raise ValueError(f"Modelo desconhecido: {self.modelo}. Use um de {MODELOS}.")
+        if self.substituicao not in POLITICAS_SUBSTITUICAO:
+            raise ValueError(
+                f"Substituição desconhecida: {self.substituicao}. "
+                f"Use uma de {POLITICAS_SUBSTITUICAO}."
+            )
+        if not 1 <= self.filhos_por_passo <= self.tamanho_populacao - self.qtd_elitismo:
+            raise ValueError(
+                "'filhos_por_passo' deve ficar entre 1 e tamanho_populacao - qtd_elitismo."
+            )
+
+    def __repr__(self):
+        valores = ", ".join(f"{nome}={valor!r}" for nome, valor in self.como_dict().items())
+        return f"ConfiguracaoAG({valores})"
+
+    def como_dict(self):
+        return {nome: getattr(self, nome) for nome in PARAMETROS}
+
+    def substituir(self, **parametros):
+        """Nova configuração igual a esta, exceto pelos parâmetros dados."""
+        return ConfiguracaoAG(**{**self.como_dict(), **parametros})
+
+
+class AlgoritmoGeneticoKnapsack:
+    def __init__(self, configuracao=None):
+        """
+        Inicializa o motor do AG
+
+        Args:
+            configuracao: ConfiguracaoAG (padrão: constantes atuais do módulo)
+        """
+        self.configuracao = configuracao if configuracao is not None else ConfiguracaoAG()
+
+    def __repr__(self):
+        return f"AlgoritmoGeneticoKnapsack({self.configuracao!r})"
+
+    def gerar_populacao_inicial(self, compactado=False):
+        """População inicial como listas binárias ou máscaras inteiras."""
+        if compactado:
+            return [gerar_individuo_compactado() for _ in range(self.configuracao.tamanho_populacao)]
+        return gerar_populacao_inicial(self.configuracao.tamanho_populacao)
+
+    def evoluir_populacao(self, populacao_atual, funcao_crossover, avaliacoes_fitness=None,
+                          compactado=False, perfil=None):
+        """
+        Aplica Elitismo, Seleção, Crossover e Mutação para criar a próxima geração.
+        Se 'avaliacoes_fitness' já foi calculada para a população atual, ela é
+        reaproveitada em vez de avaliar tudo de novo.
+        Com 'compactado=True' os indivíduos são máscaras inteiras e
+        'funcao_crossover' deve ser um dos operadores '*_compactado'.
+        Com um 'perfil' (instrumentacao.Instrumentacao), o tempo e as chamadas
+        de cada fase são acumulados na geração atual do perfil.
+        """
+        config = self.configuracao
+        if perfil is not None:
+            inicio = perfil.inicio()
+
+        # 1. Avalia a população (uma única chamada para todos os indivíduos)
+        if avaliacoes_fitness is None:
+            avaliacoes_fitness = avaliacoes_como_tuplas(*_avaliar(populacao_atual, compactado))
+            if perfil is not None:
+                inicio = perfil.acumular("avaliacao", inicio)
+
+        # 2. Ganho (fitness) de cada indivíduo, usado no elitismo e nos torneios
+        ganhos = np.fromiter(
+            (ganho for ganho, _ in avaliacoes_fitness), dtype=np.int64, count=len(avaliacoes_fitness)
+        )
+
+        # 3. Aplica Elitismo: Os melhores vão direto para a próxima geração
+        # (seleção parcial dos maiores ganhos, sem ordenar a população inteira)
+        elite = melhores_indices(ganhos, config.qtd_elitismo)
+        nova_populacao = [populacao_atual[indice] for indice in elite.tolist()]
+        if perfil is not None:
+            inicio = perfil.acumular("elitismo", inicio)
+
+        # 4. Seleção: todos os torneios da geração de uma vez (dois pais por par de filhos)
+        numero_pares = (config.tamanho_populacao - len(nova_populacao) + 1) // 2
+        pais = torneios(ganhos, 2 * numero_pares, config.tamanho_torneio).tolist()
+        if perfil is not None:
+            inicio = perfil.acumular("selecao", inicio, len(pais))
+
+        # 5. Cria novos indivíduos até atingir o tamanho da população
+        for indice1, indice2 in zip(pais[::2], pais[1::2]):
+            pai1, pai2 = populacao_atual[indice1], populacao_atual[indice2]
+
+            # Crossover
+            filho1, filho2 = funcao_crossover(pai1, pai2, config.taxa_crossover)
+            if perfil is not None:
+                inicio = perfil.acumular("crossover", inicio)
+
+            # Mutação (altera os filhos)
+            if compactado:
+                filho1 = mutacao_bit_flip_compactada(filho1, config.taxa_mutacao)
+                filho2 = mutacao_bit_flip_compactada(filho2, config.taxa_mutacao)
+            else:
+                mutacao_bit_flip(filho1, config.taxa_mutacao)
+                mutacao_bit_flip(filho2, config.taxa_mutacao)
+            if perfil is not None:
+                inicio = perfil.acumular("mutacao", inicio, 2)
+
+            # Adiciona filhos à nova população
+            nova_populacao.append(filho1)
+            if len(nova_populacao) < config.tamanho_populacao:
+                nova_populacao.append(filho2)
+
+        return nova_populacao
+
+    def evoluir_estacionario(self, populacao, ganhos, pesos, funcao_crossover,
+                             compactado=False, cache=None, perfil=None):
+        """
+        Uma geração do modelo estacionário, no lugar: em passos de
+        'filhos_por_passo' filhos, seleciona os pais por torneio, aplica
+        crossover e mutação, avalia os filhos e os grava sobre os indivíduos
+        escolhidos pela política 'substituicao' (a elite nunca sai). A geração
+        tem tamanho_populacao - qtd_elitismo filhos, o mesmo orçamento do
+        modelo geracional. Com 'rejeitar_duplicados', filhos iguais a um
+        indivíduo da população (ou a outro filho do passo) são descartados
+        antes da avaliação.
+        'populacao', 'ganhos' e 'pesos' são atualizados no lugar.
+
+        Returns:
+            int: filhos avaliados
+        """
+        config = self.configuracao
+        chave = (lambda individuo: individuo) if compactado else tuple
+        presentes = Counter(map(chave, populacao)) if config.rejeitar_duplicados else None
+        restantes = config.tamanho_populacao - config.qtd_elitismo
+        avaliados = 0
+        if perfil is not None:
+            inicio = perfil.inicio()
+
+        # Competidores de todos os torneios da geração sorteados de uma vez; os
+        # vencedores são decididos a cada passo, com os ganhos já atualizados
+        pais_por_passo = 2 * ((config.filhos_por_passo + 1) // 2)
+        passos = -(-restantes // config.filhos_por_passo)
+        competidores = np.random.randint(
+            0, len(populacao), size=(passos, pais_por_passo, config.tamanho_torneio)
+        ).tolist()
+        valores = ganhos.tolist()
+
+        for torneios_passo in competidores:
+            numero_filhos = min(config.filhos_por_passo, restantes)
+            restantes -= numero_filhos
+
+            pais = [max(linha, key=valores.__getitem__) for linha in torneios_passo]
+            if perfil is not None:
+                inicio = perfil.acumular("selecao", inicio, len(pais))
+            filhos = []
+            for indice1, indice2 in zip(pais[::2], pais[1::2]):
+                filhos.extend(
+                    funcao_crossover(populacao[indice1], populacao[indice2], config.taxa_crossover)
+                )
+            del filhos[numero_filhos:]
+            if perfil is not None:
+                inicio = perfil.acumular("crossover", inicio, len(pais) // 2)
+            if compactado:
+                filhos = [mutacao_bit_flip_compactada(filho, config.taxa_mutacao) for filho in filhos]
+            else:
+                for filho in filhos:
+                    mutacao_bit_flip(filho, config.taxa_mutacao)
+            if perfil is not None:
+                inicio = perfil.acumular("mutacao", inicio, len(filhos))
+
+            if presentes is not None:
+                filhos = _sem_duplicados(filhos, chave, presentes)
+            alvos = indices_substituicao(
+                ganhos, len(filhos), config.substituicao, config.tamanho_torneio,
+                protegidos=config.qtd_elitismo,
+            ).tolist()
+            filhos = filhos[:len(alvos)]
+            if not filhos:
+                continue
+
+            novos_ganhos, novos_pesos = _avaliar_filhos(filhos, compactado, cache)
+            avaliados += len(filhos)
+            if perfil is not None:
+                inicio = perfil.acumular("avaliacao", inicio, len(filhos))
+
+            # Substituição no lugar: a lista e os arrays de fitness não são recriados
+            for alvo, filho, ganho, peso in zip(alvos, filhos, novos_ganhos, novos_pesos):
+                if presentes is not None:
+                    presentes[chave(populacao[alvo])] -= 1
+                    presentes[chave(filho)] += 1
+                populacao[alvo] = filho
+                ganhos[alvo] = valores[alvo] = ganho
+                pesos[alvo] = peso
+            if perfil is not None:
+                inicio = perfil.acumular("substituicao", inicio, len(filhos))
+
+        return avaliados
+
+    def executar(self, funcao_crossover, compactado=False, cache=None, criterio=None,
+                 telemetria=None, checkpoint=None, perfil=None):
+        """
+        Executa o Algoritmo Genético por até 'numero_geracoes' gerações.
+        Com 'compactado=True' o genoma é uma máscara inteira durante a evolução;
+        o melhor indivíduo é devolvido como lista binária nos dois modos.
+        Com um 'cache' (CacheFitness), genomas repetidos não são reavaliados.
+        Com um 'criterio' (criterios_parada), a execução pode parar antes;
+        o motivo fica em 'criterio.relatorio()'.
+        Com uma 'telemetria' (telemetria.Telemetria), cada geração amostrada é
+        gravada em disco em vez de mantida em memória.
+        Com um 'checkpoint' (checkpoint.Checkpoint), o estado é gravado
+        periodicamente e a execução pode ser retomada.
+        Com um 'perfil' (instrumentacao.Instrumentacao), o tempo de cada fase
+        é medido por geração.
+        """
+        config = self.configuracao
+        if compactado:
+            funcao_crossover = CROSSOVERS_COMPACTADOS[funcao_crossover]
+        estado = checkpoint.carregar() if checkpoint is not None else None
+        if estado is not None and estado["concluida"]:
+            if criterio is not None:
+                criterio.iniciar(maximizar=True)
+                criterio.registrar("concluída em sessão anterior (checkpoint)", 0)
+            melhor_individuo = estado["melhor_individuo"].tolist() if estado["tem_melhor"] else None
+            return tuple(estado["melhor_fitness"].tolist()), melhor_individuo
+
+        inicio = 0
+        if estado is not None:
+            populacao = _populacao_de_array(estado["populacao"], compactado)
+            ganhos, pesos = estado["ganhos"].astype(np.int64), estado["pesos"].astype(np.int64)
+            melhor_fitness_geral = tuple(estado["melhor_fitness"].tolist())
+            melhor_individuo_geral = None
+            if estado["tem_melhor"]:
+                melhor_individuo_geral = _populacao_de_array(
+                    estado["melhor_individuo"][None], compactado
+                )[0]
+            melhor = MelhorAteAgora(True, melhor_fitness_geral[0], melhor_individuo_geral)
+            inicio, avaliacoes = int(estado["geracao"]), int(estado["avaliacoes"])
+            restaurar_rng(estado)
+        else:
+            if perfil is not None:
+                inicio_fase = perfil.inicio()
+            populacao = self.gerar_populacao_inicial(compactado)
+            melhor_individuo_geral = None
+            melhor_fitness_geral = (0, 0) # (ganho, peso)
+            melhor = MelhorAteAgora(True, fitness=0)  # só um ganho positivo entra
+
+            # Cada geração é avaliada uma única vez, em lote
+            falhas_antes = cache.falhas if cache is not None else 0
+            ganhos, pesos = _avaliar(populacao, compactado, cache)
+            avaliacoes = cache.falhas - falhas_antes if cache is not None else len(populacao)
+            if perfil is not None:
+                perfil.acumular("avaliacao", inicio_fase)
+        geracao = inicio
+        if criterio is not None:
+            criterio.iniciar(maximizar=True)
+        if telemetria is not None:
+            telemetria.iniciar_execucao()
+
+        for geracao in range(inicio + 1, config.numero_geracoes + 1):
+            if perfil is not None:
+                perfil.iniciar_geracao()
+            falhas_antes = cache.falhas if cache is not None else 0
+            if config.modelo == "estacionario":
+                # Os filhos substituem indivíduos no lugar, já avaliados
+                avaliados = self.evoluir_estacionario(
+                    populacao, ganhos, pesos, funcao_crossover, compactado, cache, perfil
+                )
+            else:
+                # Gera a próxima população
+                populacao = self.evoluir_populacao(
+                    populacao, funcao_crossover, avaliacoes_como_tuplas(ganhos, pesos),
+                    compactado, perfil
+                )
+
+                # Avalia a nova população para encontrar o melhor
+                if perfil is not None:
+                    inicio_fase = perfil.inicio()
+                ganhos, pesos = _avaliar(populacao, compactado, cache)
+                avaliados = len(populacao)
+                if perfil is not None:
+                    perfil.acumular("avaliacao", inicio_fase, len(populacao))
+
+            # Atualiza o melhor global com o melhor (maior ganho) da geração
+            if melhor.atualizar(ganhos, populacao):
+                melhor_fitness_geral = (int(ganhos[melhor.indice]), int(pesos[melhor.indice]))
+                melhor_individuo_geral = melhor.individuo
+
+            if telemetria is not None and telemetria.amostrar(geracao):
+                _registrar_geracao(telemetria, geracao, populacao, ganhos, compactado)
+
+            # Avaliações reais da função objetivo (com cache, apenas as falhas desta
+            # geração: o cache não vai para o checkpoint e recomeça do zero ao retomar)
+            if cache is not None:
+                avaliados = cache.falhas - falhas_antes
+            avaliacoes += avaliados
+
+            if checkpoint is not None and checkpoint.deve_salvar(geracao):
+                checkpoint.salvar(
+                    geracao=geracao, avaliacoes=avaliacoes,
+                    populacao=_populacao_como_array(populacao, compactado),
+                    ganhos=ganhos, pesos=pesos,
+                    melhor_fitness=np.array(melhor_fitness_geral),
+                    **_melhor_como_arrays(melhor_individuo_geral, compactado),
+                )
+            if criterio is not None and criterio.parar(geracao, melhor_fitness_geral[0], avaliacoes):
+                break
+        else:
+            if criterio is not None:
+                criterio.registrar(
+                    f"máximo de gerações ({config.numero_geracoes})", geracao, avaliacoes
+                )
+
+        if telemetria is not None:
+            telemetria.descarregar()
+
+        if compactado and melhor_individuo_geral is not None:
+            melhor_individuo_geral = descompactar_individuo(melhor_individuo_geral)
+        if checkpoint is not None:
+            checkpoint.concluir(
+                melhor_fitness=np.array(melhor_fitness_geral),
+                **_melhor_como_arrays(melhor_individuo_geral, False),
+            )
+
+        return melhor_fitness_geral, melhor_individuo_geral
+
+    def executar_com_estatisticas(self, funcao_crossover, compactado=False,
+                                  tamanho_cache=None, criterio=None, telemetria=None,
+                                  checkpoint=None, perfilar=False):
+        """
+        Executa o AG com cache e/ou critério de parada próprios da execução.
+        Retorna: (melhor_fitness, melhor_individuo, estatisticas), em que
+        'estatisticas' tem as chaves "cache", "parada" e "perfil" (o resumo
+        da instrumentação, com 'perfilar'), None quando não usadas.
+        """
+        cache = None
+        if tamanho_cache:
+            cache = CacheFitness(calcular_fitness, chave_genoma_binario, tamanho_cache)
+        perfil = Instrumentacao() if perfilar else None
+        melhor_f, melhor_ind = self.executar(
+            funcao_crossover, compactado, cache, criterio, telemetria, checkpoint, perfil
+        )
+        estatisticas = {
+            "cache": cache.estatisticas() if cache is not None else None,
+            "parada": criterio.relatorio() if criterio is not None else None,
+            "perfil": perfil.resumo() if perfil is not None else None,
+        }
+        return melhor_f, melhor_ind, estatisticas
+
+
+# Funções do módulo: o motor com as constantes atuais
+
+def evoluir_populacao(populacao_atual, funcao_crossover, avaliacoes_fitness=None,
+                      compactado=False):
+    """Próxima geração (ver AlgoritmoGeneticoKnapsack.evoluir_populacao)."""
+    return AlgoritmoGeneticoKnapsack().evoluir_populacao(
+        populacao_atual, funcao_crossover, avaliacoes_fitness, compactado
+    )
+
+
+def executar_ag_knapsack(funcao_crossover, compactado=False, cache=None, criterio=None,
+                         telemetria=None):
+    """Uma execução com as constantes do módulo (ver AlgoritmoGeneticoKnapsack.executar)."""
+    return AlgoritmoGeneticoKnapsack().executar(
+        funcao_crossover, compactado, cache, criterio, telemetria
+    )
+
+
+def executar_ag_knapsack_com_estatisticas(funcao_crossover, compactado=False,
+                                          tamanho_cache=None, criterio=None,
+                                          telemetria=None):
+    """Ver AlgoritmoGeneticoKnapsack.executar_com_estatisticas."""
+    return AlgoritmoGeneticoKnapsack().executar_com_estatisticas(
+        funcao_crossover, compactado, tamanho_cache, criterio, telemetria
+    )
 
 
 def calcular_media_desvio(resultados):
@@ -246,52 +902,130 @@ def calcular_media_desvio(resultados):
     return media, desvio_padrao
 
 
-def executar_instancia(funcao_crossover, nome_instancia):
+def executar_instancia(funcao_crossover, nome_instancia, compactado=False,
+                       num_workers=None, semente=None, tamanho_cache=None,
+                       criterio=None, telemetria=None, configuracao=None, checkpoint=None,
+                       perfil=None, rotulo="ag_knapsack"):
     """
     Executa o AG 30 vezes e coleta as estatísticas de desempenho.
+    'configuracao' (ConfiguracaoAG) substitui as constantes do módulo.
+    As execuções são distribuídas entre 'num_workers' processos
+    (ver execucao_paralela.executar_repeticoes).
+    Com 'tamanho_cache', cada execução usa um cache de fitness com esse
+    limite de entradas e imprime seus acertos/falhas.
+    Com 'criterio', cada execução pode parar antes e imprime o motivo.
+    Com 'telemetria', o progresso de cada geração vai para o arquivo dela.
+    Com 'checkpoint' (checkpoint.Checkpoint), cada execução grava o seu
+    estado e, com 'retomar', continua de onde parou.
+    Com 'perfil', imprime o tempo de cada fase somado nas execuções; se for
+    um caminho, acrescenta a esse arquivo as pilhas do flame graph, sob 'rotulo'.
     """
     resultados_ganho = []
     print(f"Executando {nome_instancia}...")
+
+    # Ótimo exato da instância, para reportar o gap de cada execução
+    otimo = resolver_knapsack(GANHOS_ARRAY, PESOS_ARRAY, CAPACIDADE_MAXIMA)["valor"]
+
+    motor = AlgoritmoGeneticoKnapsack(configuracao)
+    numero_execucoes = motor.configuracao.numero_execucoes
+    if checkpoint is not None:
+        semente = checkpoint.semente_sessao(semente)
+    execucoes = executar_repeticoes(
+        motor.executar_com_estatisticas, numero_execucoes,
+        (funcao_crossover, compactado, tamanho_cache, criterio, telemetria, checkpoint,
+         bool(perfil)),
+        num_workers=num_workers, semente=semente,
+    )
     
-    for exec_num in range(1, NUMERO_EXECUCOES + 1):
-        melhor_f, melhor_ind = executar_ag_knapsack(funcao_crossover)
+    for exec_num, (melhor_f, melhor_ind, estatisticas) in enumerate(execucoes, start=1):
         resultados_ganho.append(melhor_f[0]) # Salva apenas o ganho (fitness)
         
         print(
             f"Execução {exec_num}: Melhor ganho = {melhor_f[0]}, "
-            f"Peso = {melhor_f[1]}"
+            f"Peso = {melhor_f[1]}, "
+            f"Gap = {gap_otimalidade(melhor_f[0], otimo):.2%}"
         )
+        if estatisticas["cache"]:
+            cache = estatisticas["cache"]
+            print(
+                f"  Cache: {cache['acertos']} acertos, {cache['falhas']} falhas "
+                f"({cache['taxa_acerto']:.1%})"
+            )
+        if estatisticas["parada"]:
+            parada = estatisticas["parada"]
+            print(
+                f"  Parada: {parada['motivo']} na geração {parada['iteracoes']} "
+                f"({parada['avaliacoes']} avaliações, {parada['tempo']:.2f} s)"
+            )
         
     # Calcula e imprime as estatísticas
     media, desvio = calcular_media_desvio(resultados_ganho)
     
-    print(f"\n--- {nome_instancia} - {NUMERO_EXECUCOES} Melhores fitness ---")
+    print(f"\n--- {nome_instancia} - {numero_execucoes} Melhores fitness ---")
     print(resultados_ganho)
     print(f"Média fitness final: {media:.2f}")
-    print(f"Desvio padrão fitness final: {desvio:.2f}\n")
+    print(f"Desvio padrão fitness final: {desvio:.2f}")
+    print(f"Ótimo: {otimo} | Gap médio: {gap_otimalidade(media, otimo):.2%}\n")
+    if perfil:
+        imprimir_perfil(
+            [estatisticas["perfil"] for _, _, estatisticas in execucoes],
+            arquivo=perfil if isinstance(perfil, str) else None, raiz=rotulo, acrescentar=True,
+        )
     
     return resultados_ganho, media, desvio
 
 
-def main():
+def main(num_workers=None, semente=None, criterio=None, telemetria=None, configuracao=None,
+         checkpoint=None, perfil=None):
     """
     Função principal que compara os diferentes tipos de crossover.
+    'criterio' (criterios_parada) permite encerrar cada execução antes
+    de NUMERO_GERSACOES gerações.
+    'telemetria' (telemetria.Telemetria) grava o progresso das três
+    variantes no mesmo arquivo, com o crossover no identificador da execução.
+    'configuracao' (ConfiguracaoAG) substitui as constantes do módulo.
+    'checkpoint' (checkpoint.Checkpoint) grava o estado das execuções das
+    três variantes, com um prefixo de arquivo por crossover.
+    'perfil' mede o tempo de cada fase; se for um caminho, as pilhas do flame
+    graph das três variantes vão para esse arquivo.
     """
     print("Iniciando comparação de Algoritmos Genéticos para o Problema da Mochila.")
+    if telemetria is not None:
+        telemetria.criar_arquivo(manter_existente=checkpoint is not None and checkpoint.retomar)
+    if checkpoint is not None:
+        # Uma única semente da sessão para as três variantes
+        semente = checkpoint.semente_sessao(semente)
+    if isinstance(perfil, str):
+        exportar_flame(perfil, {})  # cria o arquivo vazio; as variantes acrescentam
+
+    def _telemetria(rotulo):
+        return telemetria.com_rotulo(rotulo) if telemetria is not None else None
+
+    def _checkpoint(rotulo):
+        return checkpoint.com_rotulo(rotulo) if checkpoint is not None else None
     
     # 1. Crossover de Um Ponto
     resultados_um_ponto = executar_instancia(
-        crossover_um_ponto, "AG Crossover Um Ponto"
+        crossover_um_ponto, "AG Crossover Um Ponto",
+        num_workers=num_workers, semente=semente, criterio=criterio,
+        configuracao=configuracao, telemetria=_telemetria("um_ponto"),
+        checkpoint=_checkpoint("um_ponto"), perfil=perfil, rotulo="ag_knapsack;um_ponto",
     )
     
     # 2. Crossover de Dois Pontos
     resultados_dois_pontos = executar_instancia(
-        crossover_dois_pontos, "AG Crossover Dois Pontos"
+        crossover_dois_pontos, "AG Crossover Dois Pontos",
+        num_workers=num_workers, semente=semente, criterio=criterio,
+        configuracao=configuracao, telemetria=_telemetria("dois_pontos"),
+        checkpoint=_checkpoint("dois_pontos"), perfil=perfil, rotulo="ag_knapsack;dois_pontos",
     )
     
     # 3. Crossover Uniforme
     resultados_uniforme = executar_instancia(
-        crossover_uniforme, "AG Crossover Uniforme"
+        crossover_uniforme, "AG Crossover Uniforme",
+        num_workers=num_workers, semente=semente, criterio=criterio,
+        configuracao=configuracao, telemetria=_telemetria("uniforme"),
+        checkpoint=_checkpoint("uniforme"), perfil=perfil, rotulo="ag_knapsack;uniforme",
     )
     
     print("--- FIM DA EXECUÇÃO ---")
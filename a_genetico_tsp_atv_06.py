@@ -1,11 +1,21 @@
 import random
 import statistics
+from collections import Counter
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import gridspec
-import matplotlib.patheffects as pe
-import seaborn as sns
 from tsp_problem_atv_05 import rota_valida, USA13
+from movimentos_tsp import delta_swap, aplicar_swap
+from execucao_paralela import executar_repeticoes
+from cache_fitness import CacheFitness, chave_rota
+from operadores_permutacao import OPERADORES_CROSSOVER
+from tsp_exato import LIMITE_HELD_KARP, resolver_tsp
+from busca_local_tsp import K_VIZINHOS, busca_local
+from instancias_tsp import instancia_de_matriz
+from telemetria import proporcao_distintos
+from checkpoint import restaurar_rng
+from selecao import (
+    POLITICAS_SUBSTITUICAO, MelhorAteAgora, indices_substituicao, melhores_indices, torneios,
+)
+from instrumentacao import Instrumentacao, imprimir_perfil
 
 
 
@@ -31,123 +41,671 @@ CIDADES = [
 # --------------------------------------------------------
 # PARÂMETROS DO ALGORITMO GENÉTICO
 # --------------------------------------------------------
-NUM_CIDADES = len(USA13)
+INSTANCIA = instancia_de_matriz(USA13, "usa13", nomes=CIDADES)  # ver instancias_tsp.carregar_tsplib
+NUM_CIDADES = INSTANCIA.dimensao
 POPULACAO_TAMANHO = 50
 GERACOES = 400
 TAMANHO_TORNEIO = 3
 TAXA_CROSSOVER = 0.9
 TAXA_MUTACAO = 0.05
 ELITISMO = 5
+CROSSOVER = "ox"  # operador de operadores_permutacao: "ox", "pmx", "cx" ou "erx"
 NUMERO_EXECUCOES = 30 
 
-def gerar_rota_inicial():
-    """Gera uma rota aleatória começando e terminando em 0 (Nova York)."""
+# Busca local memética (2-opt / Or-opt) aplicada em 'nova_geracao'
+BUSCA_LOCAL = None  # None (desligada), "filhos" ou "elite"
+USAR_OROPT = False
+MOVIMENTOS_BUSCA_LOCAL = None  # orçamento de movimentos por indivíduo (None = sem limite)
+TEMPO_BUSCA_LOCAL = None  # orçamento de tempo (s) por indivíduo (None = sem limite)
+
+# Modelo estacionário (steady-state): em vez de trocar a população inteira a
+# cada geração, FILHOS_POR_PASSO filhos por vez sobrescrevem, no lugar, os
+# indivíduos escolhidos pela política SUBSTITUICAO ("pior" ou "torneio").
+MODELO = "geracional"  # "geracional" ou "estacionario"
+FILHOS_POR_PASSO = 2
+SUBSTITUICAO = "pior"
+REJEITAR_DUPLICADOS = False  # descarta filhos com rota igual à de um indivíduo da população
+
+def gerar_rota_inicial(instancia=INSTANCIA):
+    """Gera uma rota aleatória começando e terminando em 0 (Nova York, na USA13)."""
     while True:
         # cria uma lista de cidades exceto a cidade inicial/final (0)
-        cidades = list(range(1, NUM_CIDADES))
+        cidades = list(range(1, instancia.dimensao))
         # embaralha a lista de cidades sem repetições
         random.shuffle(cidades)
         # completa a rota inicial adicionando a cidade inicial/final (0)
         rota_inicial = [0] + cidades + [0]
         #obs: a forma que a rota inicial é gerada neste trecho já garante q ela é válida
-        if rota_valida(rota_inicial, NUM_CIDADES):
+        if rota_valida(rota_inicial, instancia):
             return rota_inicial
 
 
-def fitness(rota):
+def fitness(rota, instancia=INSTANCIA):
     """O fitness é a distância total (quanto menor, melhor)."""
-    return distancia_total(rota, USA13)
-
-
-def selecao_torneio(populacao):
-    """Seleciona um indivíduo usando torneio."""
-    competidores = random.sample(populacao, TAMANHO_TORNEIO)
-    competidores.sort(key=lambda ind: ind["fitness"])
-    return competidores[0]  # melhor (menor distância)
+    return distancia_total(rota, instancia.linhas)
+
+
+def avaliar_rotas(rotas, instancia=INSTANCIA):
+    """
+    Distância total de várias rotas de uma só vez.
+    'rotas' é uma matriz (rotas x NUM_CIDADES+1) de inteiros; todas as
+    arestas são buscadas com um único indexamento da matriz de distâncias
+    (ou calculadas pelas coordenadas, nas instâncias preguiçosas).
+    """
+    return instancia.avaliar_rotas(rotas)
+
+
+def _distancia_da_instancia(funcao_fitness, instancia):
+    """
+    Indica se 'funcao_fitness' é a distância total das rotas da instância
+    ('fitness' é sempre avaliado na instância passada junto com ele).
+    """
+    return funcao_fitness is fitness or funcao_fitness == instancia.comprimento
+
+
+def avaliar_lote(rotas, funcao_fitness=fitness, instancia=INSTANCIA):
+    """
+    Fitness de uma lista de rotas, em lote sempre que possível.
+    Aceita o 'fitness' padrão (ou 'instancia.comprimento'), um CacheFitness
+    (apenas as rotas ausentes do cache são avaliadas, juntas) ou qualquer
+    outra função rota -> fitness.
+
+    A população continua sendo uma lista de {"rota", "fitness"} e a matriz
+    (rotas x NUM_CIDADES+1) é montada só aqui, para os filhos que precisam
+    de avaliação: os operadores de crossover, a mutação por delta e a busca
+    local trabalham sobre listas, e gravar cada filho em uma linha de um
+    array custaria o mesmo que montar a matriz do lote.
+    """
+    if not rotas:
+        return []
+    if _distancia_da_instancia(funcao_fitness, instancia):
+        return avaliar_rotas(rotas, instancia).tolist()
+    if isinstance(funcao_fitness, CacheFitness) and _distancia_da_instancia(funcao_fitness.funcao_fitness, instancia):
+        return funcao_fitness.avaliar_lote(
+            rotas, lambda faltantes: avaliar_rotas(faltantes, instancia).tolist()
+        )
+    return [funcao_fitness(rota) for rota in rotas]
+
+
+def avaliar_lote_contando(rotas, funcao_fitness=fitness, instancia=INSTANCIA):
+    """
+    Igual a 'avaliar_lote', mas também conta as distâncias de fato
+    calculadas: com um CacheFitness, só as falhas; sem cache, todas as rotas.
+    Retorna: (distancias, calculadas)
+    """
+    falhas = funcao_fitness.falhas if isinstance(funcao_fitness, CacheFitness) else None
+    distancias = avaliar_lote(rotas, funcao_fitness, instancia)
+    return distancias, len(rotas) if falhas is None else funcao_fitness.falhas - falhas
+
+
+def selecao_torneio(populacao, tamanho_torneio=None):
+    """
+    Seleciona um indivíduo usando torneio (padrão: TAMANHO_TORNEIO competidores).
+    Para uma geração inteira, 'selecao.torneios' sorteia todos de uma vez.
+    """
+    competidores = random.sample(populacao, tamanho_torneio or TAMANHO_TORNEIO)
+    return min(competidores, key=lambda ind: ind["fitness"])  # melhor (menor distância)
+
+
+def mutacao_swap(rota, taxa_mutacao=None):
+    """Realiza mutação trocando duas cidades (padrão: TAXA_MUTACAO)."""
+    if taxa_mutacao is None:
+        taxa_mutacao = TAXA_MUTACAO
+    nova_rota = rota[:]
+    if random.random() < taxa_mutacao:
+        i, j = random.sample(range(1, len(rota) - 1), 2)
+        nova_rota[i], nova_rota[j] = nova_rota[j], nova_rota[i]
+    return nova_rota
 
 
-def crossover_ox(pai1, pai2):
-    """Order Crossover (OX)."""
-    tamanho = len(pai1) - 2  # exclui a cidade inicial e final
-    p1, p2 = random.sample(range(1, tamanho + 1), 2)
-    inicio, fim = min(p1, p2), max(p1, p2)
+def mutacao_swap_delta(rota, distancia, instancia=INSTANCIA, taxa_mutacao=None):
+    """
+    Igual a 'mutacao_swap', mas também devolve a nova distância calculada
+    pelo delta das quatro arestas alteradas (sem somar a rota inteira).
+    """
+    if taxa_mutacao is None:
+        taxa_mutacao = TAXA_MUTACAO
+    nova_rota = rota[:]
+    if random.random() < taxa_mutacao:
+        i, j = random.sample(range(1, len(rota) - 1), 2)
+        distancia += delta_swap(nova_rota, instancia.linhas, i, j)
+        aplicar_swap(nova_rota, i, j)
+    return nova_rota, distancia
 
-    filho = [None] * (tamanho + 2)
-    filho[0] = filho[-1] = 0
 
-    # Copia o segmento do pai1
-    filho[inicio:fim] = pai1[inicio:fim]
+def distancias_da_populacao(populacao):
+    """Distância (fitness) de cada indivíduo como array, na ordem da população."""
+    return np.fromiter((ind["fitness"] for ind in populacao), dtype=np.float64, count=len(populacao))
 
-    # Preenche o restante mantendo a ordem do pai2
-    pos = fim
-    for cidade in pai2[1:-1]:
-        if cidade not in filho:
-            if pos == tamanho + 1:
-                pos = 1
-            filho[pos] = cidade
-            pos += 1
 
-    return filho
+def _registrar_geracao(telemetria, geracao, populacao):
+    """Envia melhor, média e diversidade (rotas distintas) da geração."""
+    distancias = [ind["fitness"] for ind in populacao]
+    telemetria.registrar(
+        geracao, min(distancias), statistics.fmean(distancias),
+        proporcao_distintos(tuple(ind["rota"]) for ind in populacao),
+    )
 
 
-def mutacao_swap(rota):
-    """Realiza mutação trocando duas cidades."""
-    nova_rota = rota[:]
-    if random.random() < TAXA_MUTACAO:
-        i, j = random.sample(range(1, len(rota) - 1), 2)
-        nova_rota[i], nova_rota[j] = nova_rota[j], nova_rota[i]
-    return nova_rota
+# ==============================================================================
+# CONFIGURAÇÃO E MOTOR DO AG
+# ==============================================================================
+# As constantes acima são apenas os valores padrão. Uma ConfiguracaoAG guarda
+# os parâmetros de uma variante e um AlgoritmoGeneticoTSP executa o AG com a
+# sua configuração e a sua instância, sem ler nem alterar o estado do módulo.
+# Assim várias configurações (ex.: populações de 20, 50 e 100) rodam lado a
+# lado no mesmo processo ou em um pool: os dois objetos são serializáveis.
+# As funções do módulo (criar_populacao_inicial, nova_geracao,
+# executar_ag_tsp, ...) continuam valendo e usam as constantes atuais.
+
+PARAMETROS = (
+    "populacao_tamanho", "geracoes", "tamanho_torneio", "taxa_crossover",
+    "taxa_mutacao", "elitismo", "crossover", "numero_execucoes",
+    "busca_local", "usar_oropt", "movimentos_busca_local", "tempo_busca_local",
+    "modelo", "filhos_por_passo", "substituicao", "rejeitar_duplicados",
+)
+MODOS_BUSCA_LOCAL = (None, "filhos", "elite")
+MODELOS = ("geracional", "estacionario")
+
+
+class ConfiguracaoAG:
+    def __init__(self, **parametros):
+        """
+        Inicializa a configuração
+
+        Args:
+            **parametros: valores que substituem os padrões do módulo, pelos
+                nomes de PARAMETROS em minúsculas (ex.: populacao_tamanho=100
+                no lugar de POPULACAO_TAMANHO)
+        """
+        desconhecidos = sorted(set(parametros) - set(PARAMETROS))
+        if desconhecidos:
+            raise TypeError(f"Parâmetros desconhecidos: {desconhecidos}. Use {PARAMETROS}.")
+        padroes = globals()
+        for nome in PARAMETROS:
+            setattr(self, nome, parametros.get(nome, padroes[nome.upper()]))
+
+        if self.crossover not in OPERADORES_CROSSOVER:
+            raise ValueError(
+                f"Crossover desconhecido: {self.crossover}. Use um de {tuple(OPERADORES_CROSSOVER)}."
+            )
+        if self.busca_local not in MODOS_BUSCA_LOCAL:
+            raise ValueError(
+                f"Busca local desconhecida: {self.busca_local}. Use uma de {MODOS_BUSCA_LOCAL}."
+            )
+        if not 0 <= self.elitismo < self.populacao_tamanho:
+            raise ValueError("O elitismo deve ser menor que o tamanho da população.")
+        if not 1 <= self.tamanho_torneio <= self.populacao_tamanho:
+            raise ValueError("O torneio deve ter entre 1 e 'populacao_tamanho' competidores.")
+        if self.modelo not in MODELOS:
+            raise ValueError(f"Modelo desconhecido: {self.modelo}. Use um de {MODELOS}.")
+        if self.substituicao not in POLITICAS_SUBSTITUICAO:
+            raise ValueError(
+                f"Substituição desconhecida: {self.substituicao}. "
+                f"Use uma de {POLITICAS_SUBSTITUICAO}."
+            )
+        if not 1 <= self.filhos_por_passo <= self.populacao_tamanho - self.elitismo:
+            raise ValueError("'filhos_por_passo' deve ficar entre 1 e populacao_tamanho - elitismo.")
+
+    def __repr__(self):
+        valores = ", ".join(f"{nome}={valor!r}" for nome, valor in self.como_dict().items())
+        return f"ConfiguracaoAG({valores})"
+
+    def como_dict(self):
+        return {nome: getattr(self, nome) for nome in PARAMETROS}
+
+    def substituir(self, **parametros):
+        """Nova configuração igual a esta, exceto pelos parâmetros dados."""
+        return ConfiguracaoAG(**{**self.como_dict(), **parametros})
+
+
+class AlgoritmoGeneticoTSP:
+    def __init__(self, configuracao=None, instancia=INSTANCIA):
+        """
+        Inicializa o motor do AG
+
+        Args:
+            configuracao: ConfiguracaoAG (padrão: constantes atuais do módulo)
+            instancia: InstanciaTSP resolvida
+        """
+        self.configuracao = configuracao if configuracao is not None else ConfiguracaoAG()
+        self.instancia = instancia
+
+    def __repr__(self):
+        return f"AlgoritmoGeneticoTSP({self.configuracao!r}, instancia={self.instancia.nome!r})"
+
+    def criar_populacao_inicial(self, funcao_fitness=fitness):
+        """Cria a população inicial."""
+        rotas = [
+            gerar_rota_inicial(self.instancia)
+            for _ in range(self.configuracao.populacao_tamanho)
+        ]
+        return [
+            {"rota": rota, "fitness": fit}
+            for rota, fit in zip(rotas, avaliar_lote(rotas, funcao_fitness, self.instancia))
+        ]
+
+    def melhorar_individuos(self, individuos):
+        """
+        Aplica a busca local (2-opt e, se 'usar_oropt', Or-opt) a cada
+        indivíduo, respeitando os orçamentos de movimentos e de tempo por
+        indivíduo. Devolve novos dicionários: os originais podem estar na
+        geração anterior.
+        """
+        config = self.configuracao
+        vizinhos = self.instancia.vizinhos(K_VIZINHOS)
+        melhorados = []
+        for ind in individuos:
+            rota, distancia, _ = busca_local(
+                ind["rota"], self.instancia.linhas, vizinhos, ind["fitness"],
+                usar_oropt=config.usar_oropt,
+                max_movimentos=config.movimentos_busca_local,
+                tempo_limite=config.tempo_busca_local,
+            )
+            melhorados.append({"rota": rota, "fitness": distancia})
+        return melhorados
+
+    def nova_geracao(self, populacao, funcao_fitness=fitness, perfil=None):
+        """
+        Cria uma nova geração com elitismo, crossover e mutação.
+        'funcao_fitness' pode ser um CacheFitness para não reavaliar rotas repetidas.
+        Com um 'perfil' (instrumentacao.Instrumentacao), o tempo e as chamadas
+        de cada fase são acumulados na geração atual do perfil.
+        """
+        return self.nova_geracao_contando(populacao, funcao_fitness, perfil)[0]
+
+    def nova_geracao_contando(self, populacao, funcao_fitness=fitness, perfil=None):
+        """
+        Igual a 'nova_geracao', mas também devolve quantas avaliações de
+        fitness foram de fato feitas: as falhas do cache (ou todas as rotas,
+        sem cache) entre os filhos de crossover, mais uma avaliação por delta
+        para cada cópia de um pai ('mutacao_swap_delta').
+        Retorna: (nova_populacao, avaliacoes)
+        """
+        config = self.configuracao
+        funcao_crossover = OPERADORES_CROSSOVER[config.crossover]
+        if perfil is not None:
+            inicio = perfil.inicio()
+        distancias_populacao = distancias_da_populacao(populacao)
+        # Mantém os melhores (seleção parcial, sem ordenar a população inteira)
+        elite = melhores_indices(distancias_populacao, config.elitismo, maximizar=False)
+        nova_pop = [populacao[indice] for indice in elite.tolist()]
+        pendentes = []  # filhos de crossover, avaliados juntos no fim
+        if perfil is not None:
+            inicio = perfil.acumular("elitismo", inicio)
+
+        # Todos os torneios da geração de uma vez: dois pais por filho
+        numero_filhos = config.populacao_tamanho - len(nova_pop)
+        pais = torneios(distancias_populacao, 2 * numero_filhos, config.tamanho_torneio, maximizar=False)
+        pais = pais.tolist()
+        if perfil is not None:
+            inicio = perfil.acumular("selecao", inicio, len(pais))
+
+        for indice1, indice2 in zip(pais[::2], pais[1::2]):
+            pai1, pai2 = populacao[indice1], populacao[indice2]
+
+            if random.random() < config.taxa_crossover:
+                filho_rota = funcao_crossover(pai1["rota"], pai2["rota"])
+                if perfil is not None:
+                    inicio = perfil.acumular("crossover", inicio)
+                filho_rota = mutacao_swap(filho_rota, config.taxa_mutacao)
+                filho = {"rota": filho_rota, "fitness": None}
+                pendentes.append(filho)
+            else:
+                # Cópia do pai: a distância dele já é conhecida, basta o delta da mutação
+                filho_rota, filho_fitness = mutacao_swap_delta(
+                    pai1["rota"], pai1["fitness"], self.instancia, config.taxa_mutacao
+                )
+                filho = {"rota": filho_rota, "fitness": filho_fitness}
+            if perfil is not None:
+                inicio = perfil.acumular("mutacao", inicio)
+
+            nova_pop.append(filho)
+
+        # Avalia todos os filhos de crossover em uma única chamada
+        distancias, calculadas = avaliar_lote_contando(
+            [filho["rota"] for filho in pendentes], funcao_fitness, self.instancia
+        )
+        avaliacoes = calculadas + numero_filhos - len(pendentes)  # lote + deltas
+        for filho, distancia in zip(pendentes, distancias):
+            filho["fitness"] = distancia
+        if perfil is not None:
+            inicio = perfil.acumular("avaliacao", inicio, len(pendentes))
+
+        # Passo memético: a distância já conhecida é atualizada pelos deltas
+        if config.busca_local == "filhos":
+            nova_pop[config.elitismo:] = self.melhorar_individuos(nova_pop[config.elitismo:])
+        elif config.busca_local == "elite":
+            nova_pop[:config.elitismo] = self.melhorar_individuos(nova_pop[:config.elitismo])
+        if perfil is not None and config.busca_local is not None:
+            perfil.acumular("busca_local", inicio)
+
+        return nova_pop, avaliacoes
+
+    def geracao_estacionaria(self, populacao, distancias, funcao_fitness=fitness, perfil=None):
+        """
+        Uma geração do modelo estacionário, no lugar: em passos de
+        'filhos_por_passo' filhos, seleciona os pais por torneio, aplica
+        crossover e mutação, avalia os filhos e os grava sobre os indivíduos
+        escolhidos pela política 'substituicao' (a elite nunca sai). A geração
+        tem populacao_tamanho - elitismo filhos, o mesmo orçamento do modelo
+        geracional. Com 'rejeitar_duplicados', filhos com a rota de um
+        indivíduo da população (ou de outro filho do passo) são descartados
+        antes da avaliação. A busca local "filhos" é aplicada a cada passo e
+        a "elite", ao fim da geração.
+        'populacao' e 'distancias' são atualizados no lugar.
+
+        Returns:
+            int: avaliações feitas (falhas do cache entre os filhos de
+            crossover, mais um delta por cópia de um pai), como em
+            'nova_geracao_contando'
+        """
+        config = self.configuracao
+        funcao_crossover = OPERADORES_CROSSOVER[config.crossover]
+        presentes = (
+            Counter(tuple(ind["rota"]) for ind in populacao) if config.rejeitar_duplicados else None
+        )
+        restantes = config.populacao_tamanho - config.elitismo
+        avaliados = 0
+        if perfil is not None:
+            inicio = perfil.inicio()
+
+        # Competidores de todos os torneios da geração sorteados de uma vez; os
+        # vencedores são decididos a cada passo, com as distâncias já atualizadas
+        passos = -(-restantes // config.filhos_por_passo)
+        competidores = np.random.randint(
+            0, len(populacao), size=(passos, 2 * config.filhos_por_passo, config.tamanho_torneio)
+        ).tolist()
+        valores = distancias.tolist()
+
+        for torneios_passo in competidores:
+            numero_filhos = min(config.filhos_por_passo, restantes)
+            restantes -= numero_filhos
+
+            pais = [min(linha, key=valores.__getitem__) for linha in torneios_passo[:2 * numero_filhos]]
+            if perfil is not None:
+                inicio = perfil.acumular("selecao", inicio, len(pais))
+            filhos = []
+            for indice1, indice2 in zip(pais[::2], pais[1::2]):
+                pai1, pai2 = populacao[indice1], populacao[indice2]
+                if random.random() < config.taxa_crossover:
+                    filho_rota = funcao_crossover(pai1["rota"], pai2["rota"])
+                    if perfil is not None:
+                        inicio = perfil.acumular("crossover", inicio)
+                    filho = {"rota": mutacao_swap(filho_rota, config.taxa_mutacao), "fitness": None}
+                else:
+                    filho_rota, filho_fitness = mutacao_swap_delta(
+                        pai1["rota"], pai1["fitness"], self.instancia, config.taxa_mutacao
+                    )
+                    filho = {"rota": filho_rota, "fitness": filho_fitness}
+                filhos.append(filho)
+                if perfil is not None:
+                    inicio = perfil.acumular("mutacao", inicio)
+
+            if presentes is not None:
+                vistos, unicos = set(), []
+                for filho in filhos:
+                    rota = tuple(filho["rota"])
+                    if presentes[rota] == 0 and rota not in vistos:
+                        vistos.add(rota)
+                        unicos.append(filho)
+                filhos = unicos
+            alvos = indices_substituicao(
+                distancias, len(filhos), config.substituicao, config.tamanho_torneio,
+                protegidos=config.elitismo, maximizar=False,
+            ).tolist()
+            filhos = filhos[:len(alvos)]
+            if not filhos:
+                continue
+
+            pendentes = [filho for filho in filhos if filho["fitness"] is None]
+            rotas = [filho["rota"] for filho in pendentes]
+            distancias_filhos, calculadas = avaliar_lote_contando(rotas, funcao_fitness, self.instancia)
+            for filho, distancia in zip(pendentes, distancias_filhos):
+                filho["fitness"] = distancia
+            avaliados += calculadas + len(filhos) - len(pendentes)
+            if perfil is not None:
+                inicio = perfil.acumular("avaliacao", inicio, len(pendentes))
+            if config.busca_local == "filhos":
+                filhos = self.melhorar_individuos(filhos)
+                if perfil is not None:
+                    inicio = perfil.acumular("busca_local", inicio, len(filhos))
+
+            # Substituição no lugar: a lista e o array de distâncias não são recriados
+            for alvo, filho in zip(alvos, filhos):
+                if presentes is not None:
+                    presentes[tuple(populacao[alvo]["rota"])] -= 1
+                    presentes[tuple(filho["rota"])] += 1
+                populacao[alvo] = filho
+                distancias[alvo] = valores[alvo] = filho["fitness"]
+            if perfil is not None:
+                inicio = perfil.acumular("substituicao", inicio, len(filhos))
+
+        if config.busca_local == "elite":
+            elite = melhores_indices(distancias, config.elitismo, maximizar=False).tolist()
+            for alvo, ind in zip(elite, self.melhorar_individuos([populacao[i] for i in elite])):
+                populacao[alvo] = ind
+                distancias[alvo] = ind["fitness"]
+            if perfil is not None:
+                perfil.acumular("busca_local", inicio, len(elite))
+        return avaliados
+
+    def executar(self, funcao_fitness=fitness, criterio=None, telemetria=None,
+                 checkpoint=None, perfil=None):
+        """
+        Executa uma repetição do AG (até 'geracoes' gerações) e devolve o
+        melhor indivíduo. Com um 'criterio' (criterios_parada), a execução
+        pode parar antes; o motivo fica em 'criterio.relatorio()'. Com uma
+        'telemetria' (telemetria.Telemetria), cada geração amostrada é
+        gravada em disco. Com um 'checkpoint' (checkpoint.Checkpoint), o
+        estado é gravado periodicamente e a execução pode ser retomada. Com
+        um 'perfil' (instrumentacao.Instrumentacao), o tempo de cada fase é
+        medido por geração.
+        """
+        config = self.configuracao
+        estado = checkpoint.carregar() if checkpoint is not None else None
+        if estado is not None and estado["concluida"]:
+            if criterio is not None:
+                criterio.iniciar(maximizar=False)
+                criterio.registrar("concluída em sessão anterior (checkpoint)", 0)
+            return {"rota": estado["melhor_rota"].tolist(), "fitness": estado["melhor_fitness"].item()}
+
+        inicio = 0
+        if estado is not None:
+            populacao = [
+                {"rota": rota, "fitness": fit}
+                for rota, fit in zip(estado["rotas"].tolist(), estado["fitness"].tolist())
+            ]
+            inicio, avaliacoes = int(estado["geracao"]), int(estado["avaliacoes"])
+            melhor = MelhorAteAgora(
+                False, estado["melhor_fitness"].item(),
+                {"rota": estado["melhor_rota"].tolist(), "fitness": estado["melhor_fitness"].item()},
+            )
+            restaurar_rng(estado)
+        else:
+            if perfil is not None:
+                inicio_fase = perfil.inicio()
+            falhas = funcao_fitness.falhas if isinstance(funcao_fitness, CacheFitness) else None
+            populacao = self.criar_populacao_inicial(funcao_fitness)
+            avaliacoes = len(populacao) if falhas is None else funcao_fitness.falhas - falhas
+            if perfil is not None:
+                perfil.acumular("avaliacao", inicio_fase, len(populacao))
+            melhor = MelhorAteAgora(maximizar=False)
+            melhor.atualizar(distancias_da_populacao(populacao), populacao)
+        distancias = distancias_da_populacao(populacao)
+        geracao = inicio
+        if criterio is not None:
+            criterio.iniciar(maximizar=False)
+        if telemetria is not None:
+            telemetria.iniciar_execucao()
+
+        for geracao in range(inicio + 1, config.geracoes + 1):
+            if perfil is not None:
+                perfil.iniciar_geracao()
+            if config.modelo == "estacionario":
+                # Os filhos substituem indivíduos no lugar, já avaliados
+                avaliados = self.geracao_estacionaria(populacao, distancias, funcao_fitness, perfil)
+            else:
+                # Elites mantêm o fitness; com cache, só as falhas contam como avaliação
+                populacao, avaliados = self.nova_geracao_contando(populacao, funcao_fitness, perfil)
+                distancias = distancias_da_populacao(populacao)
+            melhor.atualizar(distancias, populacao)
+            avaliacoes += avaliados
+
+            if checkpoint is not None and checkpoint.deve_salvar(geracao):
+                checkpoint.salvar(
+                    geracao=geracao, avaliacoes=avaliacoes,
+                    rotas=np.array([ind["rota"] for ind in populacao]),
+                    fitness=np.array([ind["fitness"] for ind in populacao]),
+                    melhor_rota=np.array(melhor.individuo["rota"]),
+                    melhor_fitness=np.array(melhor.individuo["fitness"]),
+                )
+
+            if telemetria is not None and telemetria.amostrar(geracao):
+                _registrar_geracao(telemetria, geracao, populacao)
+
+            if criterio is not None and criterio.parar(geracao, melhor.fitness, avaliacoes):
+                break
+        else:
+            if criterio is not None:
+                criterio.registrar(f"máximo de gerações ({config.geracoes})", geracao, avaliacoes)
+        if telemetria is not None:
+            telemetria.descarregar()
+
+        if checkpoint is not None:
+            checkpoint.concluir(
+                melhor_rota=np.array(melhor.individuo["rota"]),
+                melhor_fitness=np.array(melhor.individuo["fitness"]),
+            )
+        return melhor.individuo
+
+    def executar_com_estatisticas(self, tamanho_cache=None, criterio=None, telemetria=None,
+                                  checkpoint=None, perfilar=False):
+        """
+        Executa o AG com cache e/ou critério de parada próprios da execução.
+        Retorna: (melhor_individuo, estatisticas), em que 'estatisticas' tem as
+        chaves "cache", "parada" e "perfil" (o resumo da instrumentação, com
+        'perfilar'), None quando não usadas.
+        """
+        funcao_fitness = fitness
+        cache = None
+        if tamanho_cache:
+            cache = funcao_fitness = CacheFitness(self.instancia.comprimento, chave_rota, tamanho_cache)
+        perfil = Instrumentacao() if perfilar else None
+        melhor = self.executar(funcao_fitness, criterio, telemetria, checkpoint, perfil)
+        return melhor, {
+            "cache": cache.estatisticas() if cache is not None else None,
+            "parada": criterio.relatorio() if criterio is not None else None,
+            "perfil": perfil.resumo() if perfil is not None else None,
+        }
+
+    def executar_repeticoes(self, num_workers=None, semente=None, tamanho_cache=None,
+                            criterio=None, telemetria=None, checkpoint=None, perfilar=False):
+        """
+        Executa 'numero_execucoes' repetições independentes, distribuídas
+        entre processos (execucao_paralela.executar_repeticoes). Com um
+        'checkpoint', a semente base vem da sessão gravada quando ela é
+        retomada. Com 'perfilar', cada execução mede o tempo das fases.
+
+        Returns:
+            list: (melhor_individuo, estatisticas) de cada execução, em ordem
+        """
+        if checkpoint is not None:
+            semente = checkpoint.semente_sessao(semente)
+        return executar_repeticoes(
+            self.executar_com_estatisticas, self.configuracao.numero_execucoes,
+            (tamanho_cache, criterio, telemetria, checkpoint, perfilar),
+            num_workers=num_workers, semente=semente,
+        )
+
+
+# Funções do módulo: o motor com as constantes atuais
+
+def criar_populacao_inicial(funcao_fitness=fitness, instancia=INSTANCIA):
+    """Cria a população inicial."""
+    return AlgoritmoGeneticoTSP(instancia=instancia).criar_populacao_inicial(funcao_fitness)
 
 
-def criar_populacao_inicial():
-    """Cria a população inicial."""
-    populacao = []
-    for _ in range(POPULACAO_TAMANHO):
-        rota = gerar_rota_inicial()
-        populacao.append({"rota": rota, "fitness": fitness(rota)})
-    return populacao
+def melhorar_individuos(individuos, instancia=INSTANCIA):
+    """Busca local de cada indivíduo (ver AlgoritmoGeneticoTSP.melhorar_individuos)."""
+    return AlgoritmoGeneticoTSP(instancia=instancia).melhorar_individuos(individuos)
 
 
-def nova_geracao(populacao):
-    """Cria uma nova geração com elitismo, crossover e mutação."""
-    populacao.sort(key=lambda ind: ind["fitness"])
-    nova_pop = populacao[:ELITISMO]  # mantém os melhores
+def nova_geracao(populacao, funcao_fitness=fitness, crossover=None, busca_local=None,
+                 instancia=INSTANCIA):
+    """
+    Cria uma nova geração com elitismo, crossover e mutação.
+    'funcao_fitness' pode ser um CacheFitness para não reavaliar rotas repetidas.
+    'crossover' é o nome do operador (padrão: CROSSOVER).
+    'busca_local' aplica a busca local aos "filhos" ou à "elite" (padrão: BUSCA_LOCAL).
+    """
+    configuracao = ConfiguracaoAG(
+        crossover=crossover or CROSSOVER, busca_local=busca_local or BUSCA_LOCAL
+    )
+    return AlgoritmoGeneticoTSP(configuracao, instancia).nova_geracao(populacao, funcao_fitness)
 
-    while len(nova_pop) < POPULACAO_TAMANHO:
-        pai1 = selecao_torneio(populacao)
-        pai2 = selecao_torneio(populacao)
 
-        if random.random() < TAXA_CROSSOVER:
-            filho_rota = crossover_ox(pai1["rota"], pai2["rota"])
-        else:
-            filho_rota = pai1["rota"][:]
+def executar_ag_tsp(funcao_fitness=fitness, instancia=INSTANCIA, criterio=None,
+                    telemetria=None):
+    """Uma repetição do AG com as constantes do módulo (ver AlgoritmoGeneticoTSP.executar)."""
+    return AlgoritmoGeneticoTSP(instancia=instancia).executar(funcao_fitness, criterio, telemetria)
 
-        filho_rota = mutacao_swap(filho_rota)
-        nova_pop.append({"rota": filho_rota, "fitness": fitness(filho_rota)})
 
-    return nova_pop
+def executar_ag_tsp_com_estatisticas(tamanho_cache=None, instancia=INSTANCIA, criterio=None,
+                                     telemetria=None):
+    """Ver AlgoritmoGeneticoTSP.executar_com_estatisticas."""
+    return AlgoritmoGeneticoTSP(instancia=instancia).executar_com_estatisticas(
+        tamanho_cache, criterio, telemetria
+    )
 
 
-def main():
-    # EXECUÇÃO PRINCIPAL (30 REPETIÇÕES)
+def main(num_workers=None, semente=None, tamanho_cache=None, instancia=INSTANCIA,
+         criterio=None, telemetria=None, grafico=True, arquivo_grafico=None,
+         configuracao=None, checkpoint=None, perfil=None):
+    """
+    Executa as repetições do AG e imprime os resultados.
+    'configuracao' (ConfiguracaoAG) substitui as constantes do módulo.
+    'checkpoint' (checkpoint.Checkpoint) grava o estado de cada execução e,
+    com 'retomar', continua uma comparação interrompida.
+    Com 'perfil', imprime o tempo de cada fase somado nas execuções; se for
+    um caminho, grava também as pilhas dobradas (flame graph) nesse arquivo.
+    Com 'grafico', gera o gráfico de convergência (relatorios); sem tela ele
+    é gravado em 'arquivo_grafico' (ou em relatorios.ARQUIVO_GRAFICO_TSP).
+    """
+    # EXECUÇÃO PRINCIPAL (30 REPETIÇÕES, DISTRIBUÍDAS ENTRE PROCESSOS)
     # --------------------------------------------------------
+    motor = AlgoritmoGeneticoTSP(configuracao, instancia)
     melhores_resultados = []
+    if telemetria is not None:
+        telemetria.criar_arquivo(manter_existente=checkpoint is not None and checkpoint.retomar)
 
-    for execucao in range(1, NUMERO_EXECUCOES + 1):
-        populacao = criar_populacao_inicial()
-
-        for _ in range(GERACOES):
-            populacao = nova_geracao(populacao)
+    execucoes = motor.executar_repeticoes(
+        num_workers=num_workers, semente=semente, tamanho_cache=tamanho_cache,
+        criterio=criterio, telemetria=telemetria, checkpoint=checkpoint,
+        perfilar=bool(perfil),
+    )
 
-        populacao.sort(key=lambda ind: ind["fitness"])
-        melhor = populacao[0]
+    for execucao, (melhor, estatisticas) in enumerate(execucoes, start=1):
         melhores_resultados.append(melhor["fitness"])
-        rota_nomes = " -> ".join(CIDADES[i] for i in melhor["rota"])
-
         print(f"Execução {execucao:02d}:")
         print(f"  Melhor rota: {melhor['rota']}")
-        print(f"  Cidades: {rota_nomes}")
+        if instancia.nomes:
+            rota_nomes = " -> ".join(instancia.nomes[i] for i in melhor["rota"])
+            print(f"  Cidades: {rota_nomes}")
         print(f"  Menor distância: {melhor['fitness']} milhas")
+        if estatisticas and estatisticas["cache"]:
+            cache = estatisticas["cache"]
+            print(
+                f"  Cache: {cache['acertos']} acertos, "
+                f"{cache['falhas']} falhas "
+                f"({cache['taxa_acerto']:.1%})"
+            )
+        if estatisticas and estatisticas["parada"]:
+            parada = estatisticas["parada"]
+            print(
+                f"  Parada: {parada['motivo']} na geração {parada['iteracoes']} "
+                f"({parada['avaliacoes']} avaliações, {parada['tempo']:.2f} s)"
+            )
         print("-" * 60)
 
     media = statistics.mean(melhores_resultados)
@@ -157,218 +715,29 @@ def main():
     print(f"Média das melhores distâncias: {media:.2f} milhas")
     print(f"Desvio padrão: {desvio:.2f} milhas")
 
-    # =============================================================
-    # GRÁFICO DE CONVERGÊNCIA (MELHOR FITNESS POR EXECUÇÃO)
-    # =============================================================
-    # sns.set_theme(style="whitegrid", context="notebook", palette="viridis")
-
-    # plt.rcParams.update({
-    #     "figure.figsize": (12, 7),
-    #     "axes.titlesize": 18,
-    #     "axes.labelsize": 14,
-    #     "xtick.labelsize": 12,
-    #     "ytick.labelsize": 12,
-    #     "legend.fontsize": 12,
-    #     "lines.linewidth": 2.5,
-    #     "axes.edgecolor": "#444444",
-    #     "axes.linewidth": 1.2
-    # })
-
-
-    # execucoes = np.arange(1, len(melhores_resultados) + 1)
-    # fit =  np.array(melhores_resultados)
-
-    # fig, ax = plt.subplots()
-
-    # ax.plot(
-    #     execucoes,
-    #     fit,
-    #     color=sns.color_palette("crest")[4],
-    #     linewidth=2.5,
-    #     label="Melhor fitness por execução",
-    #     path_effects=[pe.SimpleLineShadow(alpha=0.4), pe.Normal()]
-    # )
-
-    # # Marcadores com cor distinta
-    # ax.scatter(
-    #     execucoes,
-    #     fit,
-    #     color=sns.color_palette("flare", 10)[6],
-    #     s=70,
-    #     zorder=3,
-    #     label="Execuções individuais"
-    # )
-
-    # ax.set_title("Convergência do Algoritmo Genético\nMelhor Fitness por Execução", pad=20)
-    # ax.set_xlabel("Execução")
-    # ax.set_ylabel("Melhor distância (milhas)")
-
-    # ax.legend(frameon=True, loc="best", fancybox=True)
-    # ax.grid(True, linestyle="--", alpha=0.5)
-
-    # for spine in ["top", "right"]:
-    #     ax.spines[spine].set_visible(False)
-
-
-
-    # ax.text(
-    #     0.02, -0.12,
-    #     f"População: {POPULACAO_TAMANHO} | Gerações: {GERACOES} | Execuções: {NUMERO_EXECUCOES}",
-    #     transform=ax.transAxes,
-    #     fontsize=10,
-    #     color="#555555"
-    # )
-
-    # fig.tight_layout()
-    # plt.show()
-
-
-
-    # =============================================================
-    # CONFIGURAÇÃO DE ESTILO
-    # =============================================================
-    sns.set_theme(style="whitegrid", context="notebook", palette="crest")
-
-    plt.rcParams.update({
-        "figure.figsize": (10, 9),
-        "axes.titlesize": 18,
-        "axes.titleweight": 'bold',
-        "axes.labelsize": 14,
-        "xtick.labelsize": 12,
-        "ytick.labelsize": 12,
-        "axes.edgecolor": "#444",
-        "axes.linewidth": 1.2
-    })
-
-    # =============================================================
-    # DADOS
-    # =============================================================
-    execucoes = np.arange(1, len(melhores_resultados) + 1)
-    fit= np.array(melhores_resultados)
-
-    # =============================================================
-    # SUBPLOTS: 2 GRÁFICOS (CONVERGÊNCIA + BOXPLOT)
-    # =============================================================
-    # fig, (ax1, ax2) = plt.subplots(2, 1, sharex=False, height_ratios=[3, 1.2], figsize=(10, 10))
-    # fig.subplots_adjust(hspace=0.45)
-
-    fig = plt.figure(constrained_layout=False, figsize=(10, 9))
-    gs = gridspec.GridSpec(
-        2, 1,             # 2 linhas, 1 coluna
-        height_ratios=[3, 1.2],  # proporção entre os gráficos
-        hspace=0.5        # espaço vertical entre eles
-    )
-    # Cria os eixos com base no grid
-    ax1 = fig.add_subplot(gs[0, 0])  # gráfico de convergência
-    ax2 = fig.add_subplot(gs[1, 0])  # gráfico boxplot
-
-
-    # -------------------------------------------------------------
-    # 1️⃣ GRÁFICO DE CONVERGÊNCIA
-    # -------------------------------------------------------------
-    ax1.plot(
-        execucoes,
-        fit,
-        color=sns.color_palette("crest")[4],
-        linewidth=2.5,
-        label="Melhor fitness por execução",
-        path_effects=[pe.SimpleLineShadow(alpha=0.4), pe.Normal()]
-    )
-
-    ax1.scatter(
-        execucoes,
-        fit,
-        color=sns.color_palette("flare", 10)[5],
-        s=70,
-        zorder=3,
-        label="Execuções individuais"
-    )
-
-    # Tendência linear
-    z = np.polyfit(execucoes, fit, 1)
-    trend = np.poly1d(z)
-    ax1.plot(
-        execucoes,
-        trend(execucoes),
-        color="#E76F51",
-        linestyle="--",
-        linewidth=1.8,
-        label="Tendência linear"
-    )
-
-    ax1.set_title("Convergência do Algoritmo Genético", fontweight='bold', pad=15)
-    ax1.set_ylabel("Melhor distância (milhas)")
-    ax1.set_xlabel("Execução")
-    ax1.legend(frameon=True, loc="best", fancybox=True)
-    ax1.grid(True, linestyle="--", alpha=0.5)
-
-    for spine in ["top", "right"]:
-        ax1.spines[spine].set_visible(False)
+    # Referência exata (Held-Karp) quando a instância é pequena o bastante
+    if instancia.dimensao <= LIMITE_HELD_KARP:
+        otimo = resolver_tsp(instancia.bloco(0, instancia.dimensao))
+        print(f"Distância ótima: {otimo['distancia']} milhas ({otimo['metodo']})")
+        print(f"Limite inferior da 1-árvore: {otimo['limite_1_arvore']:.2f} milhas")
+        print(f"Gap médio até o ótimo: {(media - otimo['distancia']) / otimo['distancia']:.2%}")
 
+    if perfil:
+        imprimir_perfil(
+            [estatisticas["perfil"] for _, estatisticas in execucoes],
+            arquivo=perfil if isinstance(perfil, str) else None, raiz="ag_tsp",
+        )
 
-    ax1.text(
-        0.02, -0.12,
-        f"População: {POPULACAO_TAMANHO} | Gerações: {GERACOES} | Execuções: {NUMERO_EXECUCOES}",
-        transform=ax1.transAxes,
-        fontsize=10,
-        color="#555555"
-    )
-    # -------------------------------------------------------------
-    # 2️⃣ BOXPLOT DA DISTRIBUIÇÃO FINAL
-    # -------------------------------------------------------------
-    sns.boxplot(
-        y=fit,
-        width=0.3,
-        color=sns.color_palette("crest")[4],
-        boxprops={"alpha": 0.8, "linewidth": 1.2},
-        medianprops={"color": "#E76F51", "linewidth": 2},
-        whiskerprops={"linewidth": 1.2},
-        capprops={"linewidth": 1.2},
-        flierprops={"marker": "o", "color": "#243FD8", "alpha": 0.8, "markersize": 7},
-        ax=ax2
-    )
-
-
-    sns.stripplot(
-        y=fit,
-        color=sns.color_palette("flare", 10)[5],
-        alpha=0.7,
-        jitter=0.18,     # espalhamento horizontal
-        size=6,
-        zorder=3,
-        ax=ax2
-    )
-
-
-    ax2.set_title("Distribuição dos Melhores Fitness", pad=10)
-    ax2.set_ylabel("Distância (milhas)")
-    ax2.set_xticks([])
-
-    # Estatísticas
-    media = np.mean(fit)
-    mediana = np.median(fit)
-    desvio = np.std(fit)
-
-    ax2.text(
-        0.05, 0.95,
-        f"Média: {media:.2f}\nMediana: {mediana:.2f}\nDesvio: {desvio:.2f}",
-        transform=ax2.transAxes,
-        fontsize=10,
-        color="#333333",
-        verticalalignment="top",
-        bbox=dict(facecolor="white", alpha=0.8, edgecolor="#AAAAAA")
-    )
-
-    for spine in ["top", "right"]:
-        ax2.spines[spine].set_visible(False)
+    if grafico:
+        # Importado só aqui: matplotlib/seaborn não pesam no import do módulo
+        from relatorios import grafico_execucoes_tsp
 
-    # =============================================================
-    # LAYOUT FINAL
-    # =============================================================
-    fig.suptitle("Análise de Desempenho do Algoritmo Genético (TSP)", fontsize=20, y=2.02)
-    fig.tight_layout()
-    plt.show()
+        config = motor.configuracao
+        grafico_execucoes_tsp(
+            melhores_resultados, config.populacao_tamanho, config.geracoes,
+            config.numero_execucoes, arquivo=arquivo_grafico,
+        )
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,387 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+from time import perf_counter
+
+import numpy as np
+
+import a_genetico_knapsack_ativ04 as ag_knapsack
+import a_genetico_tsp_atv_06 as ag_tsp
+import hill_climbing
+from instancias_knapsack import gerar_instancia, instancia_classica
+from instancias_tsp import instancia_de_matriz
+from knapsack_20dim import AvaliacaoDeltaKnapsack, knapsack
+from movimentos_tsp import AvaliacaoDeltaTSP, comprimento_rota, gerar_movimentos_tsp
+from operadores_permutacao import OPERADORES_CROSSOVER
+
+# ==============================================================================
+# SUÍTE DE BENCHMARKS (VAZÃO DAS FUNÇÕES E DOS ALGORITMOS)
+# ==============================================================================
+# Cada caso é medido repetindo a chamada até somar pelo menos 'tempo_minimo'
+# segundos. O resultado principal de cada caso é uma vazão (quanto maior,
+# melhor): avaliações/s para fitness e operadores, gerações/s ou iterações/s
+# para as execuções completas. As medições podem ser gravadas em um arquivo
+# JSON de referência (baseline) e comparadas depois para detectar regressões.
+#
+# Uso:
+#   python benchmark.py --salvar                 # grava benchmark_baseline.json
+#   python benchmark.py --comparar               # compara com o baseline
+#   python benchmark.py --filtro crossover_      # apenas os casos que casam
+
+ARQUIVO_BASELINE = "benchmark_baseline.json"
+LIMIAR_REGRESSAO = 0.10      # queda de vazão tolerada antes de apontar regressão
+TEMPO_MINIMO = 0.2           # segundos de medição por caso
+TAMANHOS_TSP = (13, 100, 1000)
+DIMENSOES_KNAPSACK = (20, 1_000, 100_000)
+POPULACAO_LOTE = 50          # rotas/indivíduos por chamada nas avaliações em lote
+GERACOES_BENCHMARK = 50      # gerações das execuções completas dos AGs
+ITERACOES_HILL_CLIMBING = 200
+
+# Módulos que um processo do pool importa para rodar uma execução
+MODULOS_WORKER = (
+    "execucao_paralela", "a_genetico_tsp_atv_06", "a_genetico_knapsack_ativ04",
+    "hill_climbing", "stochastic_hill_climbing", "modelo_ilhas_tsp",
+)
+
+
+def medir(funcao, tempo_minimo=TEMPO_MINIMO):
+    """
+    Repete 'funcao()' até somar pelo menos 'tempo_minimo' segundos.
+
+    Returns:
+        tuple: (chamadas, tempo_total)
+    """
+    chamadas = 0
+    inicio = perf_counter()
+    while True:
+        funcao()
+        chamadas += 1
+        decorrido = perf_counter() - inicio
+        if decorrido >= tempo_minimo:
+            return chamadas, decorrido
+
+
+def instancia_tsp_sintetica(num_cidades, semente=0):
+    """
+    Cidades aleatórias no plano com distâncias euclidianas arredondadas.
+
+    Returns:
+        list: matriz de distâncias (listas aninhadas de inteiros)
+    """
+    rng = np.random.default_rng(semente)
+    pontos = rng.random((num_cidades, 2)) * 1000
+    diferencas = pontos[:, None, :] - pontos[None, :, :]
+    return np.rint(np.sqrt((diferencas ** 2).sum(axis=2))).astype(np.int64).tolist()
+
+
+def _instancia_knapsack(num_itens, semente=0):
+    """Instância clássica com 10/20 itens; gerada (não correlacionada) nos demais tamanhos."""
+    if num_itens in (10, 20):
+        return instancia_classica(num_itens)
+    return gerar_instancia(num_itens, semente=semente)
+
+
+def _rota_aleatoria(num_cidades):
+    miolo = list(range(1, num_cidades))
+    random.shuffle(miolo)
+    return [0] + miolo + [0]
+
+
+# ==============================================================================
+# CASOS
+# ==============================================================================
+# Cada fábrica recebe o tamanho do problema e devolve (funcao, unidades,
+# metrica): 'unidades' é quanto de 'metrica' uma chamada de 'funcao' produz.
+
+def _caso_calcular_fitness(_):
+    individuo = ag_knapsack.gerar_individuo_aleatorio()
+    return lambda: ag_knapsack.calcular_fitness(individuo), 1, "avaliacoes_por_segundo"
+
+
+def _caso_calcular_fitness_compactado(_):
+    mascara = ag_knapsack.gerar_individuo_compactado()
+    return lambda: ag_knapsack.calcular_fitness_compactado(mascara), 1, "avaliacoes_por_segundo"
+
+
+def _caso_avaliar_populacao(_):
+    populacao = [ag_knapsack.gerar_individuo_aleatorio() for _ in range(POPULACAO_LOTE)]
+    return lambda: ag_knapsack.avaliar_populacao(populacao), POPULACAO_LOTE, "avaliacoes_por_segundo"
+
+
+def _caso_knapsack(dim):
+    instancia = _instancia_knapsack(dim)
+    solucao = [random.randint(0, 1) for _ in range(dim)]
+    return lambda: knapsack(solucao, instancia=instancia), 1, "avaliacoes_por_segundo"
+
+
+def _caso_crossover_knapsack(operador, compactado):
+    def fabrica(_):
+        if compactado:
+            pai1, pai2 = ag_knapsack.gerar_individuo_compactado(), ag_knapsack.gerar_individuo_compactado()
+        else:
+            pai1, pai2 = ag_knapsack.gerar_individuo_aleatorio(), ag_knapsack.gerar_individuo_aleatorio()
+        return lambda: operador(pai1, pai2), 1, "operacoes_por_segundo"
+    return fabrica
+
+
+def _caso_mutacao_bit_flip(_):
+    individuo = ag_knapsack.gerar_individuo_aleatorio()
+    return lambda: ag_knapsack.mutacao_bit_flip(individuo), 1, "operacoes_por_segundo"
+
+
+def _caso_mutacao_bit_flip_compactada(_):
+    mascara = ag_knapsack.gerar_individuo_compactado()
+    return lambda: ag_knapsack.mutacao_bit_flip_compactada(mascara), 1, "operacoes_por_segundo"
+
+
+def _caso_distancia_total(num_cidades):
+    matriz = instancia_tsp_sintetica(num_cidades)
+    rota = _rota_aleatoria(num_cidades)
+    return lambda: ag_tsp.distancia_total(rota, matriz), 1, "avaliacoes_por_segundo"
+
+
+def _caso_avaliar_rotas(num_cidades):
+    instancia = instancia_de_matriz(instancia_tsp_sintetica(num_cidades))
+    rotas = [_rota_aleatoria(num_cidades) for _ in range(POPULACAO_LOTE)]
+    return lambda: ag_tsp.avaliar_rotas(rotas, instancia), POPULACAO_LOTE, "avaliacoes_por_segundo"
+
+
+def _caso_crossover_tsp(operador):
+    def fabrica(num_cidades):
+        pai1, pai2 = _rota_aleatoria(num_cidades), _rota_aleatoria(num_cidades)
+        return lambda: operador(pai1, pai2), 1, "operacoes_por_segundo"
+    return fabrica
+
+
+def _caso_mutacao_swap(num_cidades):
+    rota = _rota_aleatoria(num_cidades)
+    return lambda: ag_tsp.mutacao_swap(rota), 1, "operacoes_por_segundo"
+
+
+def _caso_hill_climbing_knapsack(dim):
+    instancia = _instancia_knapsack(dim)
+    avaliacao = AvaliacaoDeltaKnapsack(instancia=instancia)
+    hc = hill_climbing.HillClimbing(
+        funcao_fitness=lambda sol: knapsack(sol, instancia=instancia)[0],
+        gerar_vizinhos=hill_climbing.gerar_movimentos_knapsack,
+        avaliacao_delta=avaliacao,
+    )
+
+    def executar():
+        inicial = [int(random.random() > 0.8) for _ in range(dim)]
+        hc.executar(inicial, max_iteracoes=ITERACOES_HILL_CLIMBING)
+        return len(hc.historico)
+
+    return executar, None, "iteracoes_por_segundo"
+
+
+def _caso_hill_climbing_tsp(num_cidades):
+    matriz = instancia_tsp_sintetica(num_cidades)
+    hc = hill_climbing.HillClimbing(
+        funcao_fitness=lambda rota: comprimento_rota(rota, matriz),
+        gerar_vizinhos=gerar_movimentos_tsp,
+        maximizar=False,
+        avaliacao_delta=AvaliacaoDeltaTSP(matriz),
+    )
+
+    def executar():
+        hc.executar(_rota_aleatoria(num_cidades), max_iteracoes=ITERACOES_HILL_CLIMBING)
+        return len(hc.historico)
+
+    return executar, None, "iteracoes_por_segundo"
+
+
+def _caso_ag_knapsack(compactado):
+    def fabrica(_):
+        motor = ag_knapsack.AlgoritmoGeneticoKnapsack(
+            ag_knapsack.ConfiguracaoAG(numero_geracoes=GERACOES_BENCHMARK)
+        )
+
+        def executar():
+            motor.executar(ag_knapsack.crossover_um_ponto, compactado)
+        return executar, GERACOES_BENCHMARK, "geracoes_por_segundo"
+    return fabrica
+
+
+def _caso_ag_tsp(_):
+    motor = ag_tsp.AlgoritmoGeneticoTSP(ag_tsp.ConfiguracaoAG(geracoes=GERACOES_BENCHMARK))
+    return motor.executar, GERACOES_BENCHMARK, "geracoes_por_segundo"
+
+
+def _caso_inicializacao_worker(_):
+    # Um interpretador novo importando o que um worker importa (como no
+    # start method "spawn"/"forkserver"); mede o custo fixo por processo
+    comando = [sys.executable, "-c", "import " + ", ".join(MODULOS_WORKER)]
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+
+    def executar():
+        subprocess.run(comando, cwd=diretorio, check=True)
+    return executar, 1, "processos_por_segundo"
+
+
+def _casos():
+    """
+    Lista de (nome, tamanhos, fabrica). Os operadores do AG da mochila só
+    existem para a instância de 20 itens do módulo.
+    """
+    n_knapsack = (ag_knapsack.NUMERO_ITENS,)
+    casos = [
+        ("calcular_fitness", n_knapsack, _caso_calcular_fitness),
+        ("calcular_fitness_compactado", n_knapsack, _caso_calcular_fitness_compactado),
+        ("avaliar_populacao", n_knapsack, _caso_avaliar_populacao),
+        ("knapsack", DIMENSOES_KNAPSACK, _caso_knapsack),
+    ]
+    for operador, operador_compactado in ag_knapsack.CROSSOVERS_COMPACTADOS.items():
+        casos.append((operador.__name__, n_knapsack, _caso_crossover_knapsack(operador, False)))
+        casos.append((operador_compactado.__name__, n_knapsack,
+                      _caso_crossover_knapsack(operador_compactado, True)))
+    casos += [
+        ("mutacao_bit_flip", n_knapsack, _caso_mutacao_bit_flip),
+        ("mutacao_bit_flip_compactada", n_knapsack, _caso_mutacao_bit_flip_compactada),
+        ("distancia_total", TAMANHOS_TSP, _caso_distancia_total),
+        ("avaliar_rotas", TAMANHOS_TSP, _caso_avaliar_rotas),
+    ]
+    for nome, operador in OPERADORES_CROSSOVER.items():
+        casos.append((f"crossover_{nome}", TAMANHOS_TSP, _caso_crossover_tsp(operador)))
+    casos += [
+        ("mutacao_swap", TAMANHOS_TSP, _caso_mutacao_swap),
+        ("hill_climbing_knapsack", DIMENSOES_KNAPSACK, _caso_hill_climbing_knapsack),
+        ("hill_climbing_tsp", TAMANHOS_TSP, _caso_hill_climbing_tsp),
+        ("ag_knapsack", n_knapsack, _caso_ag_knapsack(False)),
+        ("ag_knapsack_compactado", n_knapsack, _caso_ag_knapsack(True)),
+        ("ag_tsp", (ag_tsp.NUM_CIDADES,), _caso_ag_tsp),
+        ("inicializacao_worker", (len(MODULOS_WORKER),), _caso_inicializacao_worker),
+    ]
+    return casos
+
+
+# ==============================================================================
+# EXECUÇÃO, BASELINE E COMPARAÇÃO
+# ==============================================================================
+
+def executar_benchmarks(filtro=None, tempo_minimo=TEMPO_MINIMO, semente=0, verbose=True):
+    """
+    Executa todos os casos (ou os que contêm 'filtro' no nome).
+
+    Returns:
+        dict: {"metadados": {...}, "resultados": {"nome[n=tamanho]": {...}}}
+    """
+    resultados = {}
+    for nome, tamanhos, fabrica in _casos():
+        if filtro and filtro not in nome:
+            continue
+        for tamanho in tamanhos:
+            random.seed(semente)
+            np.random.seed(semente)
+            funcao, unidades, metrica = fabrica(tamanho)
+
+            if unidades is None:
+                # A própria função informa quanto produziu (ex.: iterações do hill climbing)
+                produzido = [0]
+
+                def funcao_medida(funcao=funcao, produzido=produzido):
+                    produzido[0] += funcao()
+
+                chamadas, tempo_total = medir(funcao_medida, tempo_minimo)
+                total_unidades = produzido[0]
+            else:
+                chamadas, tempo_total = medir(funcao, tempo_minimo)
+                total_unidades = chamadas * unidades
+
+            chave = f"{nome}[n={tamanho}]"
+            resultados[chave] = {
+                "caso": nome,
+                "tamanho": tamanho,
+                "metrica": metrica,
+                "valor": total_unidades / tempo_total,
+                "chamadas": chamadas,
+                "tempo_por_chamada": tempo_total / chamadas,
+            }
+            if verbose:
+                print(f"{chave:<42} {resultados[chave]['valor']:>14,.1f} {metrica}")
+
+    return {
+        "metadados": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "tempo_minimo": tempo_minimo,
+            "semente": semente,
+        },
+        "resultados": resultados,
+    }
+
+
+def salvar_baseline(medicoes, caminho=ARQUIVO_BASELINE):
+    """Grava as medições no arquivo JSON de referência."""
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(medicoes, arquivo, indent=2, ensure_ascii=False)
+
+
+def carregar_baseline(caminho=ARQUIVO_BASELINE):
+    """Lê um arquivo JSON gravado por 'salvar_baseline'."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def comparar(medicoes, baseline, limiar=LIMIAR_REGRESSAO):
+    """
+    Compara a vazão de cada caso com o baseline.
+
+    Args:
+        limiar: queda relativa de vazão tolerada (0.1 = 10%)
+
+    Returns:
+        list: (chave, valor_baseline, valor_atual, variacao, regressao) de
+            cada caso presente nos dois; 'regressao' é True quando a vazão
+            caiu mais que o limiar (variacao < -limiar)
+    """
+    comparacoes = []
+    referencia = baseline["resultados"]
+    for chave, atual in medicoes["resultados"].items():
+        if chave not in referencia:
+            continue
+        anterior = referencia[chave]["valor"]
+        variacao = atual["valor"] / anterior - 1 if anterior else 0.0
+        comparacoes.append((chave, anterior, atual["valor"], variacao, variacao < -limiar))
+    return comparacoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de vazão do projeto.")
+    parser.add_argument("--salvar", action="store_true", help="grava o resultado como baseline")
+    parser.add_argument("--comparar", action="store_true", help="compara com o baseline")
+    parser.add_argument("--baseline", default=ARQUIVO_BASELINE, help="arquivo JSON do baseline")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_REGRESSAO,
+                        help="queda relativa de vazão considerada regressão (ex.: 0.1)")
+    parser.add_argument("--tempo-minimo", type=float, default=TEMPO_MINIMO,
+                        help="segundos de medição por caso")
+    parser.add_argument("--filtro", help="executa apenas os casos cujo nome contém o texto")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    medicoes = executar_benchmarks(args.filtro, args.tempo_minimo, args.semente)
+
+    regressoes = 0
+    if args.comparar:
+        print(f"\n=== Comparação com {args.baseline} (limiar {args.limiar:.0%}) ===")
+        comparacoes = comparar(medicoes, carregar_baseline(args.baseline), args.limiar)
+        for chave, anterior, atual, variacao, regressao in comparacoes:
+            regressoes += regressao
+            marca = "REGRESSÃO" if regressao else ""
+            print(f"{chave:<42} {anterior:>14,.1f} -> {atual:>14,.1f} ({variacao:+.1%}) {marca}")
+        print(f"\n{regressoes} regressão(ões) acima do limiar.")
+
+    if args.salvar:
+        salvar_baseline(medicoes, args.baseline)
+        print(f"\nBaseline gravado em {args.baseline}")
+
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
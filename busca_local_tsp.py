@@ -0,0 +1,159 @@
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+
+from movimentos_tsp import aplicar_oropt, comprimento_rota, delta_oropt
+
+# ==============================================================================
+# BUSCA LOCAL 2-OPT / OR-OPT COM LISTAS DE VIZINHOS E DON'T-LOOK BITS
+# ==============================================================================
+# Em vez de testar todos os pares de arestas (O(n²) por passada), cada cidade
+# só tenta se ligar às suas K cidades mais próximas (listas de candidatos).
+# As cidades ficam em uma fila de "ativas" (don't-look bits): uma cidade sem
+# movimento de melhora sai da fila e só volta quando uma aresta sua muda.
+# As rotas seguem o formato do projeto, [0, ..., 0]; a matriz deve ser
+# simétrica (o 2-opt inverte o sentido de um trecho).
+
+K_VIZINHOS = 8
+TAMANHO_MAXIMO_OROPT = 3
+TAMANHO_BLOCO_VIZINHOS = 1024
+
+
+def listas_vizinhos(matriz_distancias, k=K_VIZINHOS, tamanho_bloco=TAMANHO_BLOCO_VIZINHOS):
+    """
+    K cidades mais próximas de cada cidade, da mais próxima para a mais distante.
+    A matriz é percorrida em blocos de linhas; se ela tiver um método
+    'bloco(inicio, fim)' (ex.: InstanciaTSP), só o bloco corrente fica em memória.
+
+    Returns:
+        list: vizinhos[cidade] = lista de até k cidades
+    """
+    bloco = getattr(matriz_distancias, "bloco", None)
+    if bloco is None:
+        matriz = np.asarray(matriz_distancias)
+        bloco = lambda inicio, fim: matriz[inicio:fim]
+    n = len(matriz_distancias)
+    k = min(k, n - 1)
+
+    vizinhos = []
+    for inicio in range(0, n, tamanho_bloco):
+        fim = min(inicio + tamanho_bloco, n)
+        d = np.array(bloco(inicio, fim), dtype=np.float64)
+        d[np.arange(fim - inicio), np.arange(inicio, fim)] = np.inf
+
+        # argpartition seleciona os k menores em O(n) por linha; só eles são ordenados
+        candidatos = np.argpartition(d, k - 1, axis=1)[:, :k]
+        ordem = np.take_along_axis(d, candidatos, axis=1).argsort(axis=1)
+        vizinhos.extend(np.take_along_axis(candidatos, ordem, axis=1).tolist())
+    return vizinhos
+
+
+def busca_local(rota, matriz_distancias, vizinhos, distancia=None,
+                usar_oropt=False, max_movimentos=None, tempo_limite=None):
+    """
+    Aplica 2-opt (e opcionalmente Or-opt) até não haver melhora entre os
+    candidatos ou até esgotar o orçamento.
+
+    Args:
+        rota: rota no formato [0, ..., 0] (não é alterada)
+        matriz_distancias: matriz simétrica (listas aninhadas são mais rápidas)
+        vizinhos: resultado de 'listas_vizinhos'
+        distancia: distância atual da rota (calculada se não informada)
+        usar_oropt: também tenta mover segmentos de 1 a 3 cidades
+        max_movimentos: número máximo de movimentos aplicados
+        tempo_limite: tempo máximo em segundos
+
+    Returns:
+        tuple: (nova_rota, nova_distancia, movimentos_aplicados)
+    """
+    d = matriz_distancias
+    rota = list(rota)
+    n = len(rota) - 1
+    if distancia is None:
+        distancia = comprimento_rota(rota, d)
+
+    posicao = [0] * n
+    for i in range(1, n):
+        posicao[rota[i]] = i
+
+    ativa = [True] * n
+    fila = deque(range(n))
+    movimentos = 0
+    fim = perf_counter() + tempo_limite if tempo_limite is not None else None
+
+    def ativar(*cidades):
+        for cidade in cidades:
+            if not ativa[cidade]:
+                ativa[cidade] = True
+                fila.append(cidade)
+
+    def inverter(i, j):
+        # Inverte rota[i..j] e atualiza as posições do trecho
+        rota[i:j + 1] = rota[i:j + 1][::-1]
+        for p in range(i, j + 1):
+            posicao[rota[p]] = p
+
+    def tentar_2opt(a):
+        # A aresta e (e = 0..n-1) liga rota[e] a rota[e+1]. Remover as arestas
+        # e1 < e2 e inverter rota[e1+1..e2] cria (rota[e1], rota[e2]) e
+        # (rota[e1+1], rota[e2+1]); como e2 <= n-1, a cidade 0 nunca se move.
+        i = posicao[a]
+        for sucessor in (True, False):
+            # Aresta de 'a' no sentido escolhido: (a, sucessor) ou (antecessor, a)
+            e_a = i if sucessor else (i - 1 if i > 0 else n - 1)
+            outro = rota[i + 1] if sucessor else rota[e_a]
+            d_atual = d[a][outro]
+            for c in vizinhos[a]:
+                d_nova = d[a][c]
+                if d_nova >= d_atual:
+                    break  # listas ordenadas: nenhum vizinho seguinte serve
+                j = posicao[c]
+                e_c = j if sucessor else (j - 1 if j > 0 else n - 1)
+                outro_c = rota[j + 1] if sucessor else rota[e_c]
+                ganho = d_atual + d[c][outro_c] - d_nova - d[outro][outro_c]
+                if ganho > 0:
+                    inverter(min(e_a, e_c) + 1, max(e_a, e_c))
+                    return ganho, (a, outro, c, outro_c)
+        return 0, None
+
+    def tentar_oropt(a):
+        # Move o segmento que começa em 'a' para logo depois de um vizinho c
+        i = posicao[a]
+        if a == 0:
+            return 0, None
+        for k in range(1, TAMANHO_MAXIMO_OROPT + 1):
+            if i + k - 1 > n - 1:
+                break
+            for c in vizinhos[a]:
+                p = posicao[c]
+                if not (p < i - 1 or p >= i + k):
+                    continue
+                delta = delta_oropt(rota, d, i, k, p)
+                if delta < 0:
+                    afetadas = (rota[i - 1], rota[i + k], c, rota[p + 1], a, rota[i + k - 1])
+                    aplicar_oropt(rota, i, k, p)
+                    for q in range(min(i, p + 1), max(i + k, p + 1)):
+                        posicao[rota[q]] = q
+                    return -delta, afetadas
+        return 0, None
+
+    while fila:
+        if max_movimentos is not None and movimentos >= max_movimentos:
+            break
+        if fim is not None and perf_counter() > fim:
+            break
+
+        a = fila.popleft()
+        ativa[a] = False
+
+        ganho, afetadas = tentar_2opt(a)
+        if not ganho and usar_oropt:
+            ganho, afetadas = tentar_oropt(a)
+
+        if ganho:
+            distancia -= ganho
+            movimentos += 1
+            ativar(*afetadas)
+
+    return rota, distancia, movimentos
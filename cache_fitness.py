@@ -0,0 +1,118 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# ==============================================================================
+# CACHE DE FITNESS COM DESCARTE LRU
+# ==============================================================================
+# Nos dois AGs, elites e filhos gerados sem crossover reaparecem a cada
+# geração e, no fim da execução, boa parte da população é formada por
+# duplicatas. O cache guarda o fitness indexado por uma chave compacta do
+# genoma e descarta a entrada usada há mais tempo quando atinge o limite.
+
+TAMANHO_MAXIMO_PADRAO = 10_000
+
+
+def chave_genoma_binario(individuo):
+    """
+    Chave compacta de um genoma binário: a própria máscara no modo compactado
+    ou os bits empacotados (np.packbits) de uma lista 0/1.
+    """
+    if isinstance(individuo, int):
+        return individuo
+    return np.packbits(np.asarray(individuo, dtype=np.uint8)).tobytes()
+
+
+def chave_rota(rota):
+    """Chave de uma rota do TSP."""
+    return tuple(rota)
+
+
+class CacheFitness:
+    def __init__(self, funcao_fitness, chave, tamanho_maximo=TAMANHO_MAXIMO_PADRAO):
+        """
+        Inicializa o cache
+
+        Args:
+            funcao_fitness: função que avalia um indivíduo
+            chave: função que gera a chave compacta do genoma
+            tamanho_maximo: quantidade máxima de entradas (LRU)
+        """
+        self.funcao_fitness = funcao_fitness
+        self.chave = chave
+        self.tamanho_maximo = tamanho_maximo
+        self.entradas = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    def _guardar(self, chave, valor):
+        self.entradas[chave] = valor
+        if len(self.entradas) > self.tamanho_maximo:
+            self.entradas.popitem(last=False)
+            self.descartes += 1
+
+    def __call__(self, individuo):
+        """Fitness do indivíduo, consultando o cache antes de avaliar."""
+        chave = self.chave(individuo)
+        valor = self.entradas.get(chave)
+        if valor is not None:
+            self.entradas.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+        self.falhas += 1
+        valor = self.funcao_fitness(individuo)
+        self._guardar(chave, valor)
+        return valor
+
+    def avaliar_lote(self, individuos, funcao_lote):
+        """
+        Avalia uma população inteira: os acertos vêm do cache e as falhas
+        são avaliadas juntas, em uma única chamada.
+
+        Args:
+            individuos: lista de indivíduos
+            funcao_lote: função que recebe a lista de indivíduos ausentes do
+                cache e devolve a lista de fitness correspondente
+
+        Returns:
+            list: fitness de cada indivíduo, na ordem recebida
+        """
+        chaves = [self.chave(ind) for ind in individuos]
+        valores = [None] * len(individuos)
+        faltantes = {}  # chave -> posições (duplicatas na mesma geração)
+
+        for pos, chave in enumerate(chaves):
+            valor = self.entradas.get(chave)
+            if valor is not None:
+                self.entradas.move_to_end(chave)
+                self.acertos += 1
+                valores[pos] = valor
+            elif chave in faltantes:
+                self.acertos += 1
+                faltantes[chave].append(pos)
+            else:
+                self.falhas += 1
+                faltantes[chave] = [pos]
+
+        if faltantes:
+            posicoes = list(faltantes.values())
+            novos = funcao_lote([individuos[p[0]] for p in posicoes])
+            for chave, grupo, valor in zip(faltantes, posicoes, novos):
+                self._guardar(chave, valor)
+                for pos in grupo:
+                    valores[pos] = valor
+
+        return valores
+
+    def estatisticas(self):
+        """Resumo de acertos e falhas do cache."""
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "descartes": self.descartes,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            "tamanho": len(self.entradas),
+        }
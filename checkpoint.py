@@ -0,0 +1,130 @@
+import os
+import random
+
+import numpy as np
+
+from execucao_paralela import execucao_atual
+
+# ==============================================================================
+# CHECKPOINTS RETOMÁVEIS DAS EXECUÇÕES
+# ==============================================================================
+# Cada execução (um processo do pool) grava de tempos em tempos o estado
+# completo do seu laço em '<diretorio>/<rotulo>_<execucao>.npz': população,
+# fitness, melhor até agora, contador de gerações/iterações e o estado dos
+# geradores 'random' e 'np.random'. Ao terminar, o arquivo é marcado como
+# concluído e guarda o melhor resultado. Com 'retomar=True':
+#   - execuções concluídas devolvem o resultado gravado sem rodar de novo;
+#   - execuções interrompidas continuam da última geração gravada, com os
+#     geradores restaurados, chegando ao mesmo resultado da execução direta;
+#   - execuções que nem começaram rodam com a mesma semente de antes (a
+#     semente base da sessão fica em '<diretorio>/sessao.npz').
+# Os arquivos são np.savez de arrays (sem pickle) e a escrita é atômica:
+# grava em '.tmp' e troca com os.replace, então uma queda no meio da escrita
+# nunca deixa um checkpoint corrompido no lugar do anterior.
+# Limitações: critérios de parada recomeçam a contagem ao retomar (a
+# estagnação, por exemplo) e a telemetria repete as gerações entre o último
+# checkpoint e a queda.
+
+INTERVALO_CHECKPOINT = 50  # gerações/iterações entre dois checkpoints
+ARQUIVO_SESSAO = "sessao.npz"
+
+
+def salvar_atomico(caminho, **arrays):
+    """Grava os arrays com np.savez em um temporário e o move para 'caminho'."""
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        np.savez(arquivo, **arrays)
+    os.replace(temporario, caminho)
+
+
+def carregar_arrays(caminho):
+    """Lê um arquivo de np.savez (sem pickle) como dicionário de arrays."""
+    with np.load(caminho, allow_pickle=False) as dados:
+        return {nome: dados[nome] for nome in dados.files}
+
+
+def estado_rng():
+    """Estado de 'random' e 'np.random' como arrays."""
+    versao, estado_python, gauss_python = random.getstate()
+    _, chaves, posicao, tem_gauss, gauss_numpy = np.random.get_state()
+    return {
+        "rng_python": np.array(estado_python, dtype=np.uint64),
+        "rng_python_gauss": np.array(np.nan if gauss_python is None else gauss_python),
+        "rng_python_versao": np.array(versao),
+        "rng_numpy": np.asarray(chaves, dtype=np.uint32),
+        "rng_numpy_extra": np.array([posicao, tem_gauss], dtype=np.int64),
+        "rng_numpy_gauss": np.array(gauss_numpy),
+    }
+
+
+def restaurar_rng(dados):
+    """Restaura 'random' e 'np.random' a partir de 'estado_rng'."""
+    gauss = float(dados["rng_python_gauss"])
+    random.setstate((
+        int(dados["rng_python_versao"]),
+        tuple(int(valor) for valor in dados["rng_python"]),
+        None if np.isnan(gauss) else gauss,
+    ))
+    posicao, tem_gauss = (int(valor) for valor in dados["rng_numpy_extra"])
+    np.random.set_state(
+        ("MT19937", dados["rng_numpy"], posicao, tem_gauss, float(dados["rng_numpy_gauss"]))
+    )
+
+
+class Checkpoint:
+    def __init__(self, diretorio, intervalo=INTERVALO_CHECKPOINT, retomar=False, rotulo="execucao"):
+        """
+        Inicializa os checkpoints de um conjunto de execuções
+
+        Args:
+            diretorio: pasta dos arquivos (criada se não existir)
+            intervalo: grava a cada 'intervalo' gerações/iterações
+            retomar: continua dos arquivos existentes em vez de ignorá-los
+            rotulo: prefixo dos arquivos (ex.: a variante do AG)
+        """
+        self.diretorio = diretorio
+        self.intervalo = max(1, intervalo)
+        self.retomar = retomar
+        self.rotulo = rotulo
+        os.makedirs(diretorio, exist_ok=True)
+
+    def com_rotulo(self, rotulo):
+        """Mesmos parâmetros, arquivos com outro prefixo (uma série por variante)."""
+        return Checkpoint(self.diretorio, self.intervalo, self.retomar, rotulo)
+
+    def semente_sessao(self, semente=None):
+        """
+        Semente base das execuções. Ao retomar, vale a semente gravada na
+        sessão interrompida; caso contrário, 'semente' (ou uma nova, se None)
+        é gravada para uma retomada futura.
+        """
+        caminho = os.path.join(self.diretorio, ARQUIVO_SESSAO)
+        if self.retomar and os.path.exists(caminho):
+            return int(str(carregar_arrays(caminho)["semente"]))
+        if semente is None:
+            semente = np.random.SeedSequence().entropy
+        salvar_atomico(caminho, semente=np.array(str(semente)))
+        return semente
+
+    def caminho(self):
+        """Arquivo da execução em andamento neste processo."""
+        execucao = execucao_atual() or 0
+        return os.path.join(self.diretorio, f"{self.rotulo}_{execucao:03d}.npz")
+
+    def carregar(self):
+        """Estado gravado da execução atual, ou None (novo início)."""
+        caminho = self.caminho()
+        if not self.retomar or not os.path.exists(caminho):
+            return None
+        return carregar_arrays(caminho)
+
+    def deve_salvar(self, geracao):
+        return geracao % self.intervalo == 0
+
+    def salvar(self, **arrays):
+        """Grava o estado do laço junto com o dos geradores aleatórios."""
+        salvar_atomico(self.caminho(), concluida=np.array(False), **arrays, **estado_rng())
+
+    def concluir(self, **arrays):
+        """Marca a execução como concluída, guardando o seu resultado."""
+        salvar_atomico(self.caminho(), concluida=np.array(True), **arrays)
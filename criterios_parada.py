@@ -0,0 +1,164 @@
+from time import perf_counter
+
+# ==============================================================================
+# CRITÉRIOS DE PARADA
+# ==============================================================================
+# Os laços do AG da mochila, do AG do TSP e do Hill Climbing consultam um
+# critério a cada geração/iteração com o melhor fitness até o momento e o
+# número de avaliações da função objetivo. Os critérios são combináveis:
+#   Estagnacao(50) | TempoLimite(10)   -> para no primeiro que disparar
+#   AlvoFitness(1042) & Estagnacao(20) -> para quando os dois valerem
+# Depois da execução, 'criterio.relatorio()' informa por que ela parou.
+# Um mesmo objeto pode ser reutilizado: o laço chama 'iniciar' no começo.
+
+
+class CriterioParada:
+    """Base dos critérios: subclasses implementam '_verificar'."""
+
+    def iniciar(self, maximizar=True):
+        """Prepara o critério para uma nova execução."""
+        self.maximizar = maximizar
+        self.inicio = perf_counter()
+        self.motivo = None
+        self.iteracao = 0
+        self.avaliacoes = 0
+        self.tempo = 0.0
+
+    def _verificar(self, iteracao, melhor, avaliacoes):
+        """Motivo da parada (texto) ou None para continuar."""
+        raise NotImplementedError
+
+    def parar(self, iteracao, melhor, avaliacoes=0):
+        """
+        Consulta o critério ao fim de uma geração/iteração.
+
+        Args:
+            iteracao: gerações/iterações concluídas
+            melhor: melhor fitness encontrado até agora
+            avaliacoes: avaliações da função objetivo até agora
+
+        Returns:
+            str ou None: motivo da parada, se o laço deve parar
+        """
+        motivo = self._verificar(iteracao, melhor, avaliacoes)
+        self.registrar(motivo, iteracao, avaliacoes)
+        return motivo
+
+    def registrar(self, motivo, iteracao, avaliacoes=0):
+        """Guarda o estado da última consulta (usado também pelos laços)."""
+        self.motivo = motivo
+        self.iteracao = iteracao
+        self.avaliacoes = avaliacoes
+        self.tempo = perf_counter() - self.inicio
+
+    def relatorio(self):
+        """Resumo da parada: motivo, iterações, avaliações e tempo (s)."""
+        return {
+            "motivo": self.motivo,
+            "iteracoes": self.iteracao,
+            "avaliacoes": self.avaliacoes,
+            "tempo": self.tempo,
+        }
+
+    def _melhorou(self, novo, referencia, tolerancia=0):
+        if referencia is None:
+            return True
+        if self.maximizar:
+            return novo > referencia + tolerancia
+        return novo < referencia - tolerancia
+
+    def __or__(self, outro):
+        return QualquerCriterio(self, outro)
+
+    def __and__(self, outro):
+        return TodosCriterios(self, outro)
+
+
+class MaximoIteracoes(CriterioParada):
+    def __init__(self, maximo):
+        self.maximo = maximo
+
+    def _verificar(self, iteracao, melhor, avaliacoes):
+        if iteracao >= self.maximo:
+            return f"máximo de iterações ({self.maximo})"
+        return None
+
+
+class Estagnacao(CriterioParada):
+    def __init__(self, iteracoes, tolerancia=0):
+        """
+        Para após 'iteracoes' gerações/iterações seguidas sem que o melhor
+        fitness melhore mais que 'tolerancia'.
+        """
+        self.iteracoes = iteracoes
+        self.tolerancia = tolerancia
+
+    def iniciar(self, maximizar=True):
+        super().iniciar(maximizar)
+        self.referencia = None
+        self.ultima_melhora = 0
+
+    def _verificar(self, iteracao, melhor, avaliacoes):
+        if self._melhorou(melhor, self.referencia, self.tolerancia):
+            self.referencia = melhor
+            self.ultima_melhora = iteracao
+        elif iteracao - self.ultima_melhora >= self.iteracoes:
+            return f"estagnação ({self.iteracoes} iterações sem melhora)"
+        return None
+
+
+class AlvoFitness(CriterioParada):
+    def __init__(self, alvo):
+        """Para quando o melhor fitness atinge o alvo (ex.: o ótimo conhecido)."""
+        self.alvo = alvo
+
+    def _verificar(self, iteracao, melhor, avaliacoes):
+        atingiu = melhor >= self.alvo if self.maximizar else melhor <= self.alvo
+        if atingiu:
+            return f"alvo atingido ({self.alvo})"
+        return None
+
+
+class MaximoAvaliacoes(CriterioParada):
+    def __init__(self, maximo):
+        self.maximo = maximo
+
+    def _verificar(self, iteracao, melhor, avaliacoes):
+        if avaliacoes >= self.maximo:
+            return f"máximo de avaliações ({self.maximo})"
+        return None
+
+
+class TempoLimite(CriterioParada):
+    def __init__(self, segundos):
+        self.segundos = segundos
+
+    def _verificar(self, iteracao, melhor, avaliacoes):
+        if perf_counter() - self.inicio >= self.segundos:
+            return f"tempo limite ({self.segundos} s)"
+        return None
+
+
+class QualquerCriterio(CriterioParada):
+    def __init__(self, *criterios):
+        """Para assim que qualquer um dos critérios disparar."""
+        self.criterios = criterios
+
+    def iniciar(self, maximizar=True):
+        super().iniciar(maximizar)
+        for criterio in self.criterios:
+            criterio.iniciar(maximizar)
+
+    def _verificar(self, iteracao, melhor, avaliacoes):
+        # Todos são consultados (a estagnação precisa acompanhar cada iteração)
+        motivos = [criterio.parar(iteracao, melhor, avaliacoes) for criterio in self.criterios]
+        motivos = [motivo for motivo in motivos if motivo]
+        return " | ".join(motivos) if motivos else None
+
+
+class TodosCriterios(QualquerCriterio):
+    """Para apenas quando todos os critérios valem ao mesmo tempo."""
+
+    def _verificar(self, iteracao, melhor, avaliacoes):
+        motivos = [criterio.parar(iteracao, melhor, avaliacoes) for criterio in self.criterios]
+        return " & ".join(motivos) if all(motivos) else None
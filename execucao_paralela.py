@@ -0,0 +1,134 @@
+import contextlib
+import io
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# ==============================================================================
+# EXECUÇÃO PARALELA DAS REPETIÇÕES INDEPENDENTES
+# ==============================================================================
+# As 30 execuções de cada experimento são independentes e limitadas por CPU.
+# 'executar_repeticoes' distribui essas execuções em um ProcessPoolExecutor:
+#   - cada execução recebe sua própria semente, derivada de uma SeedSequence,
+#     e reinicia 'random' e 'np.random' com ela antes de rodar;
+#   - os resultados (e o que a execução imprimiu) voltam na ordem das execuções.
+# Como a semente depende apenas do número da execução, o resultado com
+# 1 worker (execução serial, no próprio processo) é idêntico ao paralelo.
+
+NUMERO_WORKERS = None  # None = os.cpu_count()
+
+_execucao_atual = None
+
+
+def execucao_atual():
+    """Número (a partir de 1) da execução em andamento neste processo, ou None."""
+    return _execucao_atual
+
+
+def gerar_sementes(numero_execucoes, semente=None):
+    """
+    Gera uma semente independente para cada execução.
+
+    Args:
+        numero_execucoes: quantidade de execuções
+        semente: semente base (None = entropia do sistema)
+
+    Returns:
+        list: uma semente inteira (32 bits) por execução
+    """
+    filhas = np.random.SeedSequence(semente).spawn(numero_execucoes)
+    return [int(s.generate_state(1)[0]) for s in filhas]
+
+
+def _executar_com_semente(funcao, semente, args, capturar_saida, execucao=None):
+    """Reinicia os geradores com a semente da execução e roda a função."""
+    global _execucao_atual
+    _execucao_atual = execucao
+    random.seed(semente)
+    np.random.seed(semente)
+
+    try:
+        if not capturar_saida:
+            return funcao(*args), ""
+
+        saida = io.StringIO()
+        with contextlib.redirect_stdout(saida):
+            resultado = funcao(*args)
+        return resultado, saida.getvalue()
+    finally:
+        _execucao_atual = None
+
+
+def executar_repeticoes(funcao, numero_execucoes, args=(), num_workers=None,
+                        semente=None, capturar_saida=True):
+    """
+    Executa 'funcao(*args)' 'numero_execucoes' vezes, em paralelo.
+
+    Args:
+        funcao: função de uma execução (deve ser definida no nível do módulo
+            para poder ser enviada aos processos)
+        numero_execucoes: quantidade de execuções
+        args: argumentos passados a cada execução
+        num_workers: quantidade de processos (None = NUMERO_WORKERS;
+            1 = serial no próprio processo)
+        semente: semente base das execuções
+        capturar_saida: reimprime, na ordem das execuções, o que cada uma
+            imprimiu (assim a saída é a mesma da versão serial)
+
+    Returns:
+        list: resultados na ordem das execuções
+    """
+    if num_workers is None:
+        num_workers = NUMERO_WORKERS or os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, numero_execucoes))
+
+    sementes = gerar_sementes(numero_execucoes, semente)
+    resultados = []
+
+    if num_workers == 1:
+        for execucao, semente_execucao in enumerate(sementes, start=1):
+            resultado, saida = _executar_com_semente(
+                funcao, semente_execucao, args, capturar_saida, execucao
+            )
+            print(saida, end="")
+            resultados.append(resultado)
+        return resultados
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futuros = [
+            executor.submit(_executar_com_semente, funcao, s, args, capturar_saida, execucao)
+            for execucao, s in enumerate(sementes, start=1)
+        ]
+        # Consome na ordem de submissão: a saída sai na ordem das execuções
+        for futuro in futuros:
+            resultado, saida = futuro.result()
+            print(saida, end="")
+            resultados.append(resultado)
+
+    return resultados
+
+
+def executar_tarefas(tarefas, executor=None):
+    """
+    Executa uma lista de tarefas heterogêneas (ex.: várias configurações de
+    um AG, cada uma com várias sementes), reaproveitando um pool já aberto.
+
+    Args:
+        tarefas: lista de (funcao, args, semente, execucao)
+        executor: ProcessPoolExecutor em uso (None = serial no próprio processo)
+
+    Returns:
+        list: resultados na ordem das tarefas (o que elas imprimem é descartado)
+    """
+    if executor is None:
+        return [
+            _executar_com_semente(funcao, semente, args, True, execucao)[0]
+            for funcao, args, semente, execucao in tarefas
+        ]
+    futuros = [
+        executor.submit(_executar_com_semente, funcao, semente, args, True, execucao)
+        for funcao, args, semente, execucao in tarefas
+    ]
+    return [futuro.result()[0] for futuro in futuros]
@@ -1,13 +1,42 @@
 import statistics
 from time import time
-from a_genetico_tsp_atv_06 import criar_populacao_inicial, nova_geracao, GERACOES, NUMERO_EXECUCOES
+from a_genetico_tsp_atv_06 import AlgoritmoGeneticoTSP, ConfiguracaoAG, distancias_da_populacao
+from execucao_paralela import executar_repeticoes
+from selecao import MelhorAteAgora
+from tsp_exato import resolver_tsp
+from tsp_problem_atv_05 import USA13
+
+# Uma execução independente do AG (roda em um processo do pool).
+# O tamanho da população vem da configuração do motor, não de uma global.
+# Com 'telemetria' o progresso vai para o arquivo e não é devolvido em memória.
+# O melhor até agora é atualizado a cada geração, sem reordenar a população.
+def _executar_execucao(motor, telemetria=None):
+    populacao = motor.criar_populacao_inicial()
+    melhor = MelhorAteAgora(maximizar=False)
+    melhor.atualizar(distancias_da_populacao(populacao), populacao)
+    melhores_distancias_execucao = [] if telemetria is None else None
+    if telemetria is not None:
+        telemetria.iniciar_execucao()
+    
+    for geracao in range(motor.configuracao.geracoes):
+        populacao = motor.nova_geracao(populacao)
+        melhor.atualizar(distancias_da_populacao(populacao), populacao)
+        if telemetria is not None:
+            telemetria.registrar(geracao + 1, melhor.individuo["fitness"])
+        else:
+            melhores_distancias_execucao.append(melhor.individuo["fitness"])  # Armazena a melhor distância até essa geração
+    if telemetria is not None:
+        telemetria.descarregar()
+    
+    # Registra o melhor resultado final
+    return melhor.individuo["fitness"], melhores_distancias_execucao
 
-POPULACAO_TAMANHO = 50  
 
 # Função para executar o algoritmo com um número específico de indivíduos
-def experimento_com_populacao(populacao_tamanho):
-    global POPULACAO_TAMANHO  # Alterar o tamanho da população globalmente
-    POPULACAO_TAMANHO = populacao_tamanho  # Atualiza o tamanho da população
+def experimento_com_populacao(populacao_tamanho, num_workers=None, semente=None,
+                              telemetria=None):
+    # Motor próprio do experimento: as constantes do AG não são alteradas
+    motor = AlgoritmoGeneticoTSP(ConfiguracaoAG(populacao_tamanho=populacao_tamanho))
     
     melhores_resultados = []
     melhores_distancias_por_geracao = []  # Lista para armazenar as melhores distâncias por geração
@@ -15,20 +44,18 @@ def experimento_com_populacao(populacao_tamanho):
     # Inicia o experimento
     start_time = time()  # Marca o tempo de início
     
-    for execucao in range(1, NUMERO_EXECUCOES + 1):
-        populacao = criar_populacao_inicial()
-        melhores_distancias_execucao = []
-        
-        for geracao in range(GERACOES):
-            populacao = nova_geracao(populacao)
-            melhor = populacao[0]
-            melhores_distancias_execucao.append(melhor["fitness"])  # Armazena a melhor distância dessa geração
-        
-        # Registra o melhor resultado final
-        populacao.sort(key=lambda ind: ind["fitness"])
-        melhor = populacao[0]
-        melhores_resultados.append(melhor["fitness"])
-        melhores_distancias_por_geracao.append(melhores_distancias_execucao)  # Armazena o progresso
+    # As execuções são independentes: distribui entre processos
+    if telemetria is not None:
+        telemetria = telemetria.com_rotulo(f"pop{populacao_tamanho}")
+    execucoes = executar_repeticoes(
+        _executar_execucao, motor.configuracao.numero_execucoes, (motor, telemetria),
+        num_workers=num_workers, semente=semente,
+    )
+    
+    for melhor_fitness, melhores_distancias_execucao in execucoes:
+        melhores_resultados.append(melhor_fitness)
+        if melhores_distancias_execucao is not None:
+            melhores_distancias_por_geracao.append(melhores_distancias_execucao)  # Armazena o progresso
     
     tempo_execucao = time() - start_time  # Tempo total de execução
     
@@ -47,34 +74,44 @@ def experimento_com_populacao(populacao_tamanho):
 
 # Função para exibir os resultados do experimento
 def exibir_resultados(resultados):
+    # Distância ótima da instância (Held-Karp), usada como referência do gap
+    otimo = resolver_tsp(USA13)["distancia"]
+    print(f"Distância ótima (USA13): {otimo} milhas")
+
     for resultado in resultados:
         print(f"\n=== Resultados para {resultado['populacao_tamanho']} indivíduos ===")
         print(f"Tempo de execução: {resultado['tempo_execucao']:.2f} segundos")
         print(f"Média das melhores distâncias: {resultado['media_distancia']:.2f} milhas")
         print(f"Desvio padrão: {resultado['desvio_distancia']:.2f} milhas")
+        print(f"Gap médio até o ótimo: {(resultado['media_distancia'] - otimo) / otimo:.2%}")
         
         # Análise da velocidade de convergência
         distancias_por_geracao = resultado['melhores_distancias_por_geracao']
+        if not distancias_por_geracao:
+            continue  # progresso gravado pela telemetria
         melhor_geracao = [min(distancias) for distancias in distancias_por_geracao]  # Melhor em cada geração
         print("Melhor distância final por geração (velocidade de convergência):")
         for i, dist in enumerate(melhor_geracao):
             print(f"  Geração {i + 1}: {dist:.2f} milhas")
             
 # Função principal do experimento
-def realizar_experimento():
+def realizar_experimento(telemetria=None):
     # Tamanhos de população a serem testados
     tamanhos_populacao = [20, 50, 100]
     
     resultados = []
+    if telemetria is not None:
+        telemetria.criar_arquivo()
     
     # Executa os experimentos para cada tamanho de população
     for tamanho in tamanhos_populacao:
-        resultado = experimento_com_populacao(tamanho)
+        resultado = experimento_com_populacao(tamanho, telemetria=telemetria)
         resultados.append(resultado)
     
     # Exibe os resultados finais do experimento
     exibir_resultados(resultados)
 
 
-# Executa o experimento
-realizar_experimento()
+
+if __name__ == "__main__":
+    realizar_experimento()
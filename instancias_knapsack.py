@@ -0,0 +1,228 @@
+import csv
+
+import numpy as np
+
+# ==============================================================================
+# INSTÂNCIAS DA MOCHILA 0/1
+# ==============================================================================
+# Uma InstanciaKnapsack guarda ganhos e pesos em arrays NumPy contíguos
+# (int64), montados uma única vez e compartilhados pelo Hill Climbing, pelo
+# AG e pelo solver exato. As instâncias podem vir:
+#   - das instâncias clássicas do projeto (10 e 20 itens);
+#   - de arquivos CSV (colunas ganho,peso) ou no formato de Pisinger;
+#   - do gerador com semente (não correlacionada, fracamente correlacionada
+#     ou fortemente correlacionada), para benchmarks em tamanhos reais.
+
+LIMITE_LISTAS = 64  # até aqui a avaliação escalar usa listas Python (mais rápido que NumPy)
+AMPLITUDE_PADRAO = 1000  # R: ganhos/pesos sorteados em [1, R]
+FRACAO_CAPACIDADE = 0.5  # capacidade = fração da soma dos pesos
+
+TIPOS_GERADOR = ("nao_correlacionada", "fracamente_correlacionada", "fortemente_correlacionada")
+
+_CLASSICAS = {
+    10: (
+        [55, 10, 47, 5, 4, 50, 8, 61, 85, 87],
+        [95, 4, 60, 32, 23, 72, 80, 62, 65, 46],
+        269,
+    ),
+    20: (
+        [92, 4, 43, 83, 84, 68, 92, 82, 6, 44, 32, 18, 56, 83, 25, 96, 70, 48, 14, 58],
+        [44, 46, 90, 72, 91, 40, 75, 35, 8, 54, 78, 40, 77, 15, 61, 17, 75, 29, 75, 63],
+        878,
+    ),
+}
+_instancias_classicas = {}
+
+
+class InstanciaKnapsack:
+    def __init__(self, ganhos, pesos, capacidade, nome="knapsack", otimo=None):
+        """
+        Inicializa a instância
+
+        Args:
+            ganhos: ganhos dos itens
+            pesos: pesos dos itens
+            capacidade: capacidade máxima da mochila
+            nome: nome da instância
+            otimo: valor ótimo conhecido (ex.: arquivos de Pisinger), se houver
+        """
+        self.ganhos = np.ascontiguousarray(ganhos, dtype=np.int64)
+        self.pesos = np.ascontiguousarray(pesos, dtype=np.int64)
+        if self.ganhos.shape != self.pesos.shape or self.ganhos.ndim != 1:
+            raise ValueError("Ganhos e pesos devem ser vetores do mesmo tamanho.")
+        self.capacidade = int(capacidade)
+        self.nome = nome
+        self.otimo = otimo
+        self.dimensao = len(self.ganhos)
+
+        # Listas para os laços escalares em instâncias pequenas
+        self.ganhos_lista = self.ganhos.tolist() if self.dimensao <= LIMITE_LISTAS else None
+        self.pesos_lista = self.pesos.tolist() if self.dimensao <= LIMITE_LISTAS else None
+
+    def __len__(self):
+        return self.dimensao
+
+    def __repr__(self):
+        return (
+            f"InstanciaKnapsack({self.nome!r}, dimensao={self.dimensao}, "
+            f"capacidade={self.capacidade})"
+        )
+
+    def totais(self, solucao):
+        """
+        Ganho e peso totais de uma solução binária (lista ou array 0/1).
+
+        Returns:
+            tuple: (ganho_total, peso_total)
+        """
+        if self.ganhos_lista is not None and not isinstance(solucao, np.ndarray):
+            ganho_total = 0
+            peso_total = 0
+            for i in range(self.dimensao):
+                if solucao[i] == 1:
+                    ganho_total += self.ganhos_lista[i]
+                    peso_total += self.pesos_lista[i]
+            return ganho_total, peso_total
+
+        selecionados = np.asarray(solucao, dtype=bool)
+        return int(self.ganhos[selecionados].sum()), int(self.pesos[selecionados].sum())
+
+    def avaliar(self, solucao):
+        """
+        Avalia uma solução (ganho 0 se exceder a capacidade).
+
+        Returns:
+            tuple: (valor_total, peso_total, é_válido)
+        """
+        ganho_total, peso_total = self.totais(solucao)
+        eh_valido = peso_total <= self.capacidade
+        return (ganho_total if eh_valido else 0), peso_total, eh_valido
+
+    def avaliar_populacao(self, populacao):
+        """
+        Avalia uma matriz (indivíduos x itens) de 0/1 com dois produtos
+        matriz-vetor. Indivíduos que excedem a capacidade recebem ganho 0.
+
+        Returns:
+            tuple de arrays: (ganhos, pesos)
+        """
+        matriz = np.asarray(populacao, dtype=np.uint8)
+        ganhos = matriz @ self.ganhos
+        pesos = matriz @ self.pesos
+        ganhos[pesos > self.capacidade] = 0
+        return ganhos, pesos
+
+
+def instancia_classica(dim):
+    """Instância clássica do projeto com 'dim' itens (10 ou 20), criada uma vez."""
+    if dim not in _CLASSICAS:
+        raise ValueError(f"Não há instância clássica com {dim} itens. Use uma de {sorted(_CLASSICAS)}.")
+    if dim not in _instancias_classicas:
+        ganhos, pesos, capacidade = _CLASSICAS[dim]
+        _instancias_classicas[dim] = InstanciaKnapsack(ganhos, pesos, capacidade, nome=f"classica_{dim}")
+    return _instancias_classicas[dim]
+
+
+def gerar_instancia(num_itens, tipo="nao_correlacionada", amplitude=AMPLITUDE_PADRAO,
+                    fracao_capacidade=FRACAO_CAPACIDADE, semente=None):
+    """
+    Gera uma instância aleatória no estilo de Pisinger.
+
+    Args:
+        num_itens: quantidade de itens (até 10^6 sem problema de memória)
+        tipo: "nao_correlacionada" (ganho e peso independentes em [1, R]),
+            "fracamente_correlacionada" (ganho em peso ± R/10) ou
+            "fortemente_correlacionada" (ganho = peso + R/10)
+        amplitude: R
+        fracao_capacidade: capacidade como fração da soma dos pesos
+        semente: semente do gerador (mesma semente, mesma instância)
+
+    Returns:
+        InstanciaKnapsack
+    """
+    if tipo not in TIPOS_GERADOR:
+        raise ValueError(f"Tipo desconhecido: {tipo}. Use um de {TIPOS_GERADOR}.")
+    rng = np.random.default_rng(semente)
+    pesos = rng.integers(1, amplitude + 1, size=num_itens, dtype=np.int64)
+
+    if tipo == "nao_correlacionada":
+        ganhos = rng.integers(1, amplitude + 1, size=num_itens, dtype=np.int64)
+    elif tipo == "fracamente_correlacionada":
+        desvio = amplitude // 10
+        ganhos = np.maximum(1, pesos + rng.integers(-desvio, desvio + 1, size=num_itens, dtype=np.int64))
+    else:
+        ganhos = pesos + amplitude // 10
+
+    capacidade = max(1, int(fracao_capacidade * int(pesos.sum())))
+    nome = f"{tipo}_{num_itens}_{amplitude}" + (f"_{semente}" if semente is not None else "")
+    return InstanciaKnapsack(ganhos, pesos, capacidade, nome=nome)
+
+
+def carregar_csv(caminho, capacidade=None):
+    """
+    Lê uma instância de um CSV com uma linha 'ganho,peso' por item.
+    Uma linha de cabeçalho é ignorada, e uma linha 'capacidade,<valor>'
+    define a capacidade quando ela não é passada como argumento.
+    """
+    ganhos, pesos = [], []
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        for linha in csv.reader(arquivo):
+            if not linha or not linha[0].strip():
+                continue
+            primeiro = linha[0].strip().lower()
+            if primeiro == "capacidade":
+                if capacidade is None:
+                    capacidade = int(linha[1])
+                continue
+            try:
+                ganho, peso = int(linha[0]), int(linha[1])
+            except ValueError:
+                continue  # cabeçalho
+            ganhos.append(ganho)
+            pesos.append(peso)
+
+    if capacidade is None:
+        raise ValueError(f"Capacidade não informada para {caminho}.")
+    return InstanciaKnapsack(ganhos, pesos, capacidade, nome=caminho)
+
+
+def carregar_pisinger(caminho, indice=0):
+    """
+    Lê uma instância no formato de Pisinger. Aceita os dois formatos usuais:
+      - blocos 'knapPI_*' (nome, 'n', 'c', 'z', 'time' e linhas
+        'id,ganho,peso,x' separados por '-----'), escolhendo o bloco 'indice';
+      - arquivo simples com 'n capacidade' na primeira linha e depois uma
+        linha 'ganho peso' por item.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        linhas = [linha.strip() for linha in arquivo if linha.strip()]
+
+    primeira = linhas[0].split()
+    if len(primeira) == 2 and all(campo.isdigit() for campo in primeira):
+        n, capacidade = int(primeira[0]), int(primeira[1])
+        valores = np.array([linha.split()[:2] for linha in linhas[1:n + 1]], dtype=np.int64)
+        return InstanciaKnapsack(valores[:, 0], valores[:, 1], capacidade, nome=caminho)
+
+    blocos, atual = [], []
+    for linha in linhas:
+        if linha.startswith("-----"):
+            if atual:
+                blocos.append(atual)
+            atual = []
+        else:
+            atual.append(linha)
+    if atual:
+        blocos.append(atual)
+
+    bloco = blocos[indice]
+    nome, cabecalho, itens = bloco[0], {}, []
+    for linha in bloco[1:]:
+        if "," in linha:
+            itens.append(linha.split(",")[1:3])
+        else:
+            chave, valor = linha.split(None, 1)
+            cabecalho[chave] = valor
+
+    valores = np.array(itens, dtype=np.int64)
+    otimo = int(cabecalho["z"]) if "z" in cabecalho else None
+    return InstanciaKnapsack(valores[:, 0], valores[:, 1], int(cabecalho["c"]), nome=nome, otimo=otimo)
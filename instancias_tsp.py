@@ -0,0 +1,384 @@
+import hashlib
+import math
+import os
+
+import numpy as np
+
+from busca_local_tsp import listas_vizinhos
+
+# ==============================================================================
+# INSTÂNCIAS DO TSP (TSPLIB) COM MATRIZ DENSA, MEMMAP OU DISTÂNCIAS SOB DEMANDA
+# ==============================================================================
+# Uma InstanciaTSP guarda as distâncias de um de três modos:
+#   - "densa": matriz NumPy em memória (instâncias pequenas e matrizes explícitas);
+#   - "memmap": matriz gravada em disco (np.memmap) e reaproveitada nas
+#     próximas execuções, sem recalcular as distâncias;
+#   - "preguicosa": apenas as coordenadas; cada distância é calculada quando
+#     pedida (uma matriz float64 com 20 mil cidades teria 3,2 GB).
+# A instância pode ser usada no lugar da matriz em todo o projeto:
+# 'instancia[i][j]' e 'len(instancia)' funcionam nos três modos.
+# Tipos de distância suportados: EUC_2D, CEIL_2D, ATT, GEO e EXPLICIT
+# (FULL_MATRIX e formatos triangulares por linha ou por coluna).
+
+LIMITE_DENSA = 5_000          # acima disso: memmap (com diretório de cache) ou preguiçosa
+LIMITE_LISTAS = 1_000         # até aqui também guarda listas aninhadas (acesso escalar rápido)
+TAMANHO_BLOCO = 512           # linhas calculadas por vez ao preencher a matriz
+DIRETORIO_CACHE = "cache_instancias"
+
+MODOS = ("densa", "memmap", "preguicosa")
+TIPOS_COORDENADAS = ("EUC_2D", "CEIL_2D", "ATT", "GEO")
+
+_PI_TSPLIB = 3.141592  # valor usado pela definição de GEO na TSPLIB
+_RAIO_TERRA = 6378.388
+
+# Formatos explícitos equivalentes para matrizes simétricas
+_FORMATOS_EQUIVALENTES = {
+    "UPPER_COL": "LOWER_ROW",
+    "LOWER_COL": "UPPER_ROW",
+    "UPPER_DIAG_COL": "LOWER_DIAG_ROW",
+    "LOWER_DIAG_COL": "UPPER_DIAG_ROW",
+}
+
+
+def _radianos_geo(coordenadas):
+    """Converte coordenadas GEO (graus.minutos) em radianos, como na TSPLIB."""
+    graus = np.trunc(coordenadas)
+    minutos = coordenadas - graus
+    return _PI_TSPLIB * (graus + 5.0 * minutos / 3.0) / 180.0
+
+
+def _distancias(tipo, a, b):
+    """
+    Distâncias TSPLIB (inteiras) entre os pontos de 'a' e 'b', com broadcasting.
+    Para GEO, 'a' e 'b' já devem estar em radianos (_radianos_geo).
+    """
+    if tipo == "GEO":
+        q1 = np.cos(a[..., 1] - b[..., 1])
+        q2 = np.cos(a[..., 0] - b[..., 0])
+        q3 = np.cos(a[..., 0] + b[..., 0])
+        angulo = np.arccos(np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0))
+        return np.floor(_RAIO_TERRA * angulo + 1.0).astype(np.int64)
+
+    dx = a[..., 0] - b[..., 0]
+    dy = a[..., 1] - b[..., 1]
+    if tipo == "ATT":
+        r = np.sqrt((dx * dx + dy * dy) / 10.0)
+        t = np.floor(r + 0.5)
+        return np.where(t < r, t + 1, t).astype(np.int64)
+
+    r = np.sqrt(dx * dx + dy * dy)
+    if tipo == "CEIL_2D":
+        return np.ceil(r).astype(np.int64)
+    return np.floor(r + 0.5).astype(np.int64)  # EUC_2D: nint da TSPLIB
+
+
+def _distancia_escalar(tipo, a, b):
+    """Versão escalar de '_distancias' (com math, sem o custo do NumPy)."""
+    if tipo == "GEO":
+        q1 = math.cos(a[1] - b[1])
+        q2 = math.cos(a[0] - b[0])
+        q3 = math.cos(a[0] + b[0])
+        cosseno = min(1.0, max(-1.0, 0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)))
+        return int(_RAIO_TERRA * math.acos(cosseno) + 1.0)
+
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    if tipo == "ATT":
+        r = math.sqrt((dx * dx + dy * dy) / 10.0)
+        t = int(r + 0.5)
+        return t + 1 if t < r else t
+
+    r = math.sqrt(dx * dx + dy * dy)
+    if tipo == "CEIL_2D":
+        return math.ceil(r)
+    return int(r + 0.5)
+
+
+class _LinhaPreguicosa:
+    """Linha 'instancia[i]' de uma instância preguiçosa: calcula instancia[i][j]."""
+
+    __slots__ = ("instancia", "i")
+
+    def __init__(self, instancia, i):
+        self.instancia = instancia
+        self.i = i
+
+    def __getitem__(self, j):
+        return self.instancia.distancia(self.i, j)
+
+    def __len__(self):
+        return self.instancia.dimensao
+
+
+class InstanciaTSP:
+    def __init__(self, nome, dimensao, modo, matriz=None, coordenadas=None,
+                 tipo_distancia="EXPLICIT", nomes=None, caminho_cache=None):
+        """
+        Inicializa a instância (use as funções 'carregar_tsplib',
+        'instancia_de_matriz' ou 'instancia_de_coordenadas')
+
+        Args:
+            nome: nome da instância
+            dimensao: número de cidades
+            modo: "densa", "memmap" ou "preguicosa"
+            matriz: matriz de distâncias (modos "densa" e "memmap")
+            coordenadas: array (dimensao x 2) (tipos com coordenadas)
+            tipo_distancia: EUC_2D, CEIL_2D, ATT, GEO ou EXPLICIT
+            nomes: nomes das cidades, se conhecidos
+            caminho_cache: arquivo .npy da matriz (modo "memmap")
+        """
+        if modo not in MODOS:
+            raise ValueError(f"Modo desconhecido: {modo}. Use um de {MODOS}.")
+        self.nome = nome
+        self.dimensao = dimensao
+        self.modo = modo
+        self.matriz = matriz
+        self.coordenadas = coordenadas
+        self.tipo_distancia = tipo_distancia
+        self.nomes = nomes
+        self.caminho_cache = caminho_cache
+        self._preparar()
+
+    def _preparar(self):
+        """Estruturas derivadas (não são enviadas aos processos do pool)."""
+        self._pontos = None
+        if self.coordenadas is not None:
+            pontos = np.asarray(self.coordenadas, dtype=np.float64)
+            self._pontos = _radianos_geo(pontos) if self.tipo_distancia == "GEO" else pontos
+            self._pontos_lista = self._pontos.tolist()
+
+        # Listas aninhadas: d[i][j] em Python puro é bem mais rápido que em um array
+        self._listas = None
+        if self.matriz is not None and self.dimensao <= LIMITE_LISTAS:
+            self._listas = np.asarray(self.matriz).tolist()
+        self._vizinhos = {}
+
+    def __getstate__(self):
+        estado = {
+            chave: valor for chave, valor in self.__dict__.items() if not chave.startswith("_")
+        }
+        if self.modo == "memmap":
+            estado["matriz"] = None  # cada processo reabre o arquivo
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        if self.modo == "memmap":
+            self.matriz = np.load(self.caminho_cache, mmap_mode="r")
+        self._preparar()
+
+    def __len__(self):
+        return self.dimensao
+
+    def __getitem__(self, i):
+        if self._listas is not None:
+            return self._listas[i]
+        if self.matriz is not None:
+            return self.matriz[i]
+        return _LinhaPreguicosa(self, i)
+
+    def __repr__(self):
+        return f"InstanciaTSP({self.nome!r}, dimensao={self.dimensao}, modo={self.modo!r})"
+
+    @property
+    def linhas(self):
+        """Objeto indexável como linhas[i][j] mais rápido para laços escalares."""
+        if self._listas is not None:
+            return self._listas
+        if self.matriz is not None:
+            return self.matriz
+        return self
+
+    def distancia(self, i, j):
+        """Distância entre as cidades i e j."""
+        if self.matriz is not None:
+            return self[i][j]
+        if i == j:
+            return 0
+        return _distancia_escalar(self.tipo_distancia, self._pontos_lista[i], self._pontos_lista[j])
+
+    def bloco(self, inicio, fim):
+        """Linhas inicio..fim-1 da matriz de distâncias como array NumPy."""
+        if self.matriz is not None:
+            return np.asarray(self.matriz[inicio:fim])
+        linhas = _distancias(self.tipo_distancia, self._pontos[inicio:fim, None, :], self._pontos[None, :, :])
+        linhas[np.arange(fim - inicio), np.arange(inicio, fim)] = 0
+        return linhas
+
+    def avaliar_rotas(self, rotas):
+        """
+        Distância total de várias rotas de uma só vez.
+        'rotas' é uma matriz (rotas x dimensao+1) de inteiros; todas as arestas
+        são buscadas (ou calculadas, no modo preguiçoso) em uma única operação.
+        """
+        rotas = np.asarray(rotas, dtype=np.intp)
+        origem, destino = rotas[:, :-1], rotas[:, 1:]
+        if self.matriz is not None:
+            return np.asarray(self.matriz)[origem, destino].sum(axis=1)
+        return _distancias(self.tipo_distancia, self._pontos[origem], self._pontos[destino]).sum(axis=1)
+
+    def comprimento(self, rota):
+        """Distância total de uma rota."""
+        return int(self.avaliar_rotas([rota])[0])
+
+    def vizinhos(self, k):
+        """Listas dos k vizinhos mais próximos (calculadas uma vez por k)."""
+        if k not in self._vizinhos:
+            self._vizinhos[k] = listas_vizinhos(self, k)
+        return self._vizinhos[k]
+
+
+# ==============================================================================
+# CONSTRUÇÃO DAS INSTÂNCIAS
+# ==============================================================================
+
+def _preencher_matriz(matriz, pontos, tipo):
+    """Calcula a matriz de distâncias em blocos de linhas (memória limitada)."""
+    n = len(pontos)
+    for inicio in range(0, n, TAMANHO_BLOCO):
+        fim = min(inicio + TAMANHO_BLOCO, n)
+        linhas = _distancias(tipo, pontos[inicio:fim, None, :], pontos[None, :, :])
+        linhas[np.arange(fim - inicio), np.arange(inicio, fim)] = 0
+        matriz[inicio:fim] = linhas
+
+
+def _matriz_memmap(nome, pontos, tipo, diretorio_cache):
+    """
+    Abre a matriz em disco da instância, calculando-a na primeira vez.
+    A gravação vai para um arquivo temporário renomeado no fim, então uma
+    execução interrompida nunca deixa um cache incompleto. O nome do arquivo
+    leva um hash das coordenadas e do tipo de distância: instâncias com o
+    mesmo nome e tamanho, mas pontos diferentes, não compartilham o cache.
+    """
+    n = len(pontos)
+    os.makedirs(diretorio_cache, exist_ok=True)
+    pontos = np.ascontiguousarray(pontos, dtype=np.float64)
+    assinatura = hashlib.sha1(pontos.tobytes() + tipo.encode()).hexdigest()[:16]
+    caminho = os.path.join(diretorio_cache, f"{nome}_{n}_{tipo}_{assinatura}.npy")
+
+    if os.path.exists(caminho):
+        matriz = np.load(caminho, mmap_mode="r")
+        if matriz.shape == (n, n):
+            return matriz, caminho
+
+    temporario = caminho + ".tmp"
+    matriz = np.lib.format.open_memmap(temporario, mode="w+", dtype=np.int32, shape=(n, n))
+    _preencher_matriz(matriz, pontos, tipo)
+    matriz.flush()
+    del matriz
+    os.replace(temporario, caminho)
+    return np.load(caminho, mmap_mode="r"), caminho
+
+
+def instancia_de_matriz(matriz_distancias, nome="matriz", nomes=None):
+    """Instância densa a partir de uma matriz explícita (ex.: USA13)."""
+    matriz = np.asarray(matriz_distancias)
+    if np.issubdtype(matriz.dtype, np.floating) and np.all(matriz == np.round(matriz)):
+        matriz = matriz.astype(np.int64)
+    return InstanciaTSP(nome, len(matriz), "densa", matriz=matriz, nomes=nomes)
+
+
+def instancia_de_coordenadas(coordenadas, tipo_distancia="EUC_2D", nome="coordenadas",
+                             modo=None, diretorio_cache=None, nomes=None):
+    """
+    Instância a partir de coordenadas, no modo pedido ou escolhido pelo tamanho:
+    densa até LIMITE_DENSA cidades; acima disso, memmap se houver
+    'diretorio_cache' e preguiçosa caso contrário.
+    """
+    if tipo_distancia not in TIPOS_COORDENADAS:
+        raise ValueError(f"Tipo de distância sem coordenadas: {tipo_distancia}")
+    coordenadas = np.asarray(coordenadas, dtype=np.float64)
+    n = len(coordenadas)
+    if modo is None:
+        if n <= LIMITE_DENSA:
+            modo = "densa"
+        else:
+            modo = "memmap" if diretorio_cache else "preguicosa"
+
+    pontos = _radianos_geo(coordenadas) if tipo_distancia == "GEO" else coordenadas
+    matriz = caminho = None
+    if modo == "densa":
+        matriz = np.empty((n, n), dtype=np.int32)
+        _preencher_matriz(matriz, pontos, tipo_distancia)
+    elif modo == "memmap":
+        matriz, caminho = _matriz_memmap(nome, pontos, tipo_distancia, diretorio_cache or DIRETORIO_CACHE)
+
+    return InstanciaTSP(nome, n, modo, matriz=matriz, coordenadas=coordenadas,
+                        tipo_distancia=tipo_distancia, nomes=nomes, caminho_cache=caminho)
+
+
+# ==============================================================================
+# LEITURA DE ARQUIVOS TSPLIB
+# ==============================================================================
+
+def _matriz_explicita(valores, n, formato):
+    """Monta a matriz completa a partir da EDGE_WEIGHT_SECTION."""
+    formato = _FORMATOS_EQUIVALENTES.get(formato, formato)
+    valores = np.asarray(valores, dtype=np.float64)
+    if formato == "FULL_MATRIX":
+        return valores[:n * n].reshape(n, n)
+
+    matriz = np.zeros((n, n))
+    if formato == "UPPER_ROW":
+        linhas, colunas = np.triu_indices(n, 1)
+    elif formato == "UPPER_DIAG_ROW":
+        linhas, colunas = np.triu_indices(n)
+    elif formato == "LOWER_ROW":
+        linhas, colunas = np.tril_indices(n, -1)
+    elif formato == "LOWER_DIAG_ROW":
+        linhas, colunas = np.tril_indices(n)
+    else:
+        raise ValueError(f"EDGE_WEIGHT_FORMAT não suportado: {formato}")
+
+    matriz[linhas, colunas] = valores[:len(linhas)]
+    matriz[colunas, linhas] = valores[:len(linhas)]
+    return matriz
+
+
+def carregar_tsplib(caminho, modo=None, diretorio_cache=None):
+    """
+    Lê um arquivo TSPLIB (.tsp) simétrico.
+
+    Args:
+        caminho: arquivo da instância
+        modo: "densa", "memmap", "preguicosa" ou None (escolhe pelo tamanho)
+        diretorio_cache: diretório das matrizes em disco (modo "memmap")
+
+    Returns:
+        InstanciaTSP
+    """
+    cabecalho = {}
+    secao = None
+    numeros = []
+
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            linha = linha.strip()
+            if not linha:
+                continue
+            if linha == "EOF":
+                break
+            palavra = linha.split(":", 1)[0].strip().upper()
+            if palavra.endswith("_SECTION"):
+                secao = palavra
+                continue
+            if secao is None and ":" in linha:
+                chave, valor = linha.split(":", 1)
+                cabecalho[chave.strip().upper()] = valor.strip()
+                continue
+            if secao in ("NODE_COORD_SECTION", "EDGE_WEIGHT_SECTION"):
+                numeros.append(linha)
+
+    nome = cabecalho.get("NAME", os.path.splitext(os.path.basename(caminho))[0])
+    n = int(cabecalho["DIMENSION"])
+    tipo = cabecalho.get("EDGE_WEIGHT_TYPE", "EXPLICIT").upper()
+
+    if tipo == "EXPLICIT":
+        valores = " ".join(numeros).split()
+        formato = cabecalho.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper()
+        return instancia_de_matriz(_matriz_explicita(valores, n, formato), nome)
+
+    if tipo not in TIPOS_COORDENADAS:
+        raise ValueError(f"EDGE_WEIGHT_TYPE não suportado: {tipo}")
+    coordenadas = np.array([linha.split()[1:3] for linha in numeros[:n]], dtype=np.float64)
+    return instancia_de_coordenadas(coordenadas, tipo, nome, modo, diretorio_cache)
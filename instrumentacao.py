@@ -0,0 +1,154 @@
+from time import perf_counter_ns
+
+# ==============================================================================
+# INSTRUMENTAÇÃO DAS FASES DOS AGS (TEMPO E CHAMADAS POR GERAÇÃO)
+# ==============================================================================
+# Para descobrir onde vai o tempo de uma execução, os laços dos AGs recebem
+# opcionalmente um 'Instrumentacao' (o parâmetro 'perfil'). Entre duas fases
+# o laço chama
+#     inicio = perfil.acumular("selecao", inicio)
+# que soma o tempo decorrido (perf_counter_ns) e o número de chamadas da fase
+# na geração atual e devolve o novo instante de referência. Sem perfil
+# (None, o padrão) o custo é apenas o teste 'if perfil is not None'.
+# A geração 0 é a criação/avaliação da população inicial. O resumo (totais por
+# fase) volta nas estatísticas da execução e pode ser exportado no formato de
+# pilhas "dobradas" (raiz;execucao;fase valor) lido por flamegraph.pl,
+# speedscope e inferno.
+
+
+class Instrumentacao:
+    def __init__(self):
+        """Inicia a contagem já na geração 0 (população inicial)."""
+        self.geracoes = []
+        self._atual = None
+        self.iniciar_geracao()
+
+    def iniciar_geracao(self):
+        """Abre os acumuladores de uma nova geração."""
+        self._atual = {}
+        self.geracoes.append(self._atual)
+
+    def inicio(self):
+        """Instante de referência para o primeiro 'acumular' de um trecho."""
+        return perf_counter_ns()
+
+    def acumular(self, fase, inicio, chamadas=1):
+        """
+        Soma à fase o tempo decorrido desde 'inicio'.
+
+        Args:
+            fase: nome da fase (ex.: "selecao")
+            inicio: instante devolvido por 'inicio' ou pelo 'acumular' anterior
+            chamadas: quantas chamadas da fase o trecho representa
+
+        Returns:
+            int: instante atual (perf_counter_ns), início da próxima fase
+        """
+        agora = perf_counter_ns()
+        registro = self._atual.get(fase)
+        if registro is None:
+            registro = self._atual[fase] = [0, 0]
+        registro[0] += agora - inicio
+        registro[1] += chamadas
+        return agora
+
+    def por_geracao(self, fase):
+        """Tempo (ns) da fase em cada geração."""
+        return [geracao.get(fase, (0, 0))[0] for geracao in self.geracoes]
+
+    def resumo(self):
+        """
+        Totais da execução.
+
+        Returns:
+            dict: "geracoes" e "fases" ({fase: {"ns", "chamadas"}}, da fase
+            mais cara para a mais barata)
+        """
+        return {
+            "geracoes": len(self.geracoes) - 1,
+            "fases": _somar_fases(
+                (fase, tempo, chamadas)
+                for geracao in self.geracoes
+                for fase, (tempo, chamadas) in geracao.items()
+            ),
+        }
+
+    def pilhas(self, raiz="ag"):
+        """Pilhas dobradas por geração ({"raiz;geracao_0001;fase": ns})."""
+        return {
+            f"{raiz};geracao_{numero:04d};{fase}": tempo
+            for numero, geracao in enumerate(self.geracoes)
+            for fase, (tempo, _) in geracao.items()
+        }
+
+
+def _somar_fases(entradas):
+    """(fase, ns, chamadas) -> {fase: {"ns", "chamadas"}}, da fase mais cara à mais barata."""
+    fases = {}
+    for fase, tempo, chamadas in entradas:
+        total = fases.setdefault(fase, {"ns": 0, "chamadas": 0})
+        total["ns"] += tempo
+        total["chamadas"] += chamadas
+    return dict(sorted(fases.items(), key=lambda item: -item[1]["ns"]))
+
+
+def combinar_resumos(resumos):
+    """Soma os resumos de várias execuções (ignora None)."""
+    resumos = [resumo for resumo in resumos if resumo is not None]
+    return {
+        "geracoes": sum(resumo["geracoes"] for resumo in resumos),
+        "fases": _somar_fases(
+            (fase, dados["ns"], dados["chamadas"])
+            for resumo in resumos
+            for fase, dados in resumo["fases"].items()
+        ),
+    }
+
+
+def pilhas_execucoes(resumos, raiz="ag"):
+    """Pilhas dobradas por execução ({"raiz;execucao_01;fase": ns})."""
+    return {
+        f"{raiz};execucao_{numero:02d};{fase}": dados["ns"]
+        for numero, resumo in enumerate(resumos, start=1) if resumo is not None
+        for fase, dados in resumo["fases"].items()
+    }
+
+
+def exportar_flame(caminho, pilhas, acrescentar=False):
+    """Grava as pilhas no formato dobrado: uma linha 'pilha valor' por entrada."""
+    with open(caminho, "a" if acrescentar else "w", encoding="utf-8") as arquivo:
+        for pilha, valor in pilhas.items():
+            if valor > 0:
+                arquivo.write(f"{pilha} {valor}\n")
+
+
+def tabela_perfil(resumo):
+    """Texto com tempo total, fração, chamadas e custo médio de cada fase."""
+    total = sum(dados["ns"] for dados in resumo["fases"].values()) or 1
+    linhas = [
+        f"{'fase':<12} {'total (ms)':>12} {'%':>7} {'chamadas':>10} {'ns/chamada':>11}",
+    ]
+    linhas.append("-" * len(linhas[0]))
+    for fase, dados in resumo["fases"].items():
+        linhas.append(
+            f"{fase:<12} {dados['ns'] / 1e6:>12.2f} {dados['ns'] / total:>7.1%} "
+            f"{dados['chamadas']:>10} {dados['ns'] / max(1, dados['chamadas']):>11.0f}"
+        )
+    return "\n".join(linhas)
+
+
+def imprimir_perfil(resumos, arquivo=None, raiz="ag", acrescentar=False):
+    """
+    Imprime a tabela do tempo por fase somado nas execuções.
+
+    Args:
+        resumos: resumo de cada execução (Instrumentacao.resumo)
+        arquivo: se informado, grava também as pilhas dobradas (flame graph)
+        raiz: primeiro quadro das pilhas (ex.: o AG ou a variante)
+        acrescentar: acrescenta ao arquivo em vez de sobrescrevê-lo
+    """
+    print(f"\n=== TEMPO POR FASE ({raiz}, soma das execuções) ===")
+    print(tabela_perfil(combinar_resumos(resumos)))
+    if arquivo is not None:
+        exportar_flame(arquivo, pilhas_execucoes(resumos, raiz), acrescentar)
+        print(f"Pilhas do flame graph gravadas em {arquivo}")
@@ -1,55 +1,86 @@
-def _knapsack_constants(dim):
-    GANHOS = []
-    PESOS = []
-    CAPACIDADE_MAXIMA = 0
+from instancias_knapsack import instancia_classica
 
-    if dim == 10:
-        GANHOS = [55, 10, 47, 5, 4, 50, 8, 61, 85, 87]
-        PESOS = [95, 4, 60, 32, 23, 72, 80, 62, 65, 46]
-        CAPACIDADE_MAXIMA = 269
-    else: 
-        dim == 20
-        GANHOS = [92, 4, 43, 83, 84, 68, 92, 82, 6, 44, 32, 18, 56, 83, 25, 96, 70, 48, 14, 58]
-        PESOS = [44, 46, 90, 72, 91, 40, 75, 35, 8, 54, 78, 40, 77, 15, 61, 17, 75, 29, 75, 63]
-        CAPACIDADE_MAXIMA = 878
 
-    return GANHOS, PESOS, CAPACIDADE_MAXIMA
-
-
-def knapsack(solution, dim=20):
+def knapsack(solution, dim=20, instancia=None):
     """
-    Avalia uma seleção de itens para o problema da mochila com 10 dimensões.
+    Avalia uma seleção de itens para o problema da mochila.
     https://en.wikipedia.org/wiki/Knapsack_problem
 
     Args:
         solution: lista binária [0,1,0,1,...] indicando quais itens foram selecionados
+        dim: número de itens da instância clássica (10 ou 20)
+        instancia: InstanciaKnapsack a usar no lugar da instância clássica
 
     Returns:
         tuple: (valor_total, peso_total, é_válido)
     """
+    if instancia is None:
+        instancia = instancia_classica(dim)
 
-    # A instância implementada considera 10 dimensões
-    assert len(solution) == dim, "A solução deve ter exatamente 10 dimensões."
-
-    # Valores dos itens (benefícios)
-    GANHOS, PESOS, CAPACIDADE_MAXIMA = _knapsack_constants(dim)
-
-    # Calcula valor total e peso total dos itens selecionados
-    ganho_total = 0
-    peso_total = 0
+    assert len(solution) == instancia.dimensao, (
+        f"A solução deve ter exatamente {instancia.dimensao} dimensões."
+    )
 
-    for i in range(len(solution)):
-        if solution[i] == 1:  # Item foi selecionado
-            ganho_total += GANHOS[i]
-            peso_total += PESOS[i]
+    # Ganho e peso totais; a solução é inválida se exceder a capacidade
+    return instancia.avaliar(solution)
 
-    # Verifica se a solução é válida (não excede a capacidade)
-    eh_valido = peso_total <= CAPACIDADE_MAXIMA
 
-    if not eh_valido:
-        ganho_total = 0
+class AvaliacaoDeltaKnapsack:
+    """
+    Avaliação incremental para vizinhos que diferem da solução atual por
+    exatamente um bit (flip). Mantém em cache o ganho e o peso da solução
+    atual, de modo que cada vizinho custa O(1) em vez de O(dim).
+    """
 
-    return ganho_total, peso_total, eh_valido
+    def __init__(self, dim=20, instancia=None):
+        if instancia is None:
+            instancia = instancia_classica(dim)
+        self.instancia = instancia
+        self.ganhos = instancia.ganhos_lista or instancia.ganhos
+        self.pesos = instancia.pesos_lista or instancia.pesos
+        self.capacidade_maxima = instancia.capacidade
+        self.dim = instancia.dimensao
+        self.ganho_atual = 0
+        self.peso_atual = 0
+
+    def _fitness(self, ganho, peso):
+        return ganho if peso <= self.capacidade_maxima else 0
+
+    def iniciar(self, solucao):
+        """
+        Calcula (uma única vez) o ganho e o peso da solução inicial.
+
+        Returns:
+            fitness da solução (mesmo valor de knapsack(solucao, dim)[0])
+        """
+        assert len(solucao) == self.dim, "A solução deve ter exatamente dim dimensões."
+
+        # O cache guarda o ganho real, mesmo quando a solução é inválida
+        ganho_total, peso_total = self.instancia.totais(solucao)
+
+        self.ganho_atual = ganho_total
+        self.peso_atual = peso_total
+        return self._fitness(ganho_total, peso_total)
+
+    def avaliar(self, solucao, pos):
+        """
+        Fitness do vizinho obtido ao inverter o bit 'pos', sem construí-lo.
+        """
+        sinal = -1 if solucao[pos] == 1 else 1
+        return self._fitness(
+            self.ganho_atual + sinal * self.ganhos[pos],
+            self.peso_atual + sinal * self.pesos[pos],
+        )
+
+    def aplicar(self, solucao, pos):
+        """
+        Inverte o bit 'pos' da solução (in-place) e atualiza o cache.
+        """
+        sinal = -1 if solucao[pos] == 1 else 1
+        self.ganho_atual += sinal * self.ganhos[pos]
+        self.peso_atual += sinal * self.pesos[pos]
+        solucao[pos] = 1 - solucao[pos]
+        return solucao
 
 
 # Exemplos de uso:
@@ -76,30 +107,29 @@ def test_knapsack():
 
     # Mostra informações dos itens
     print("=== INFORMAÇÕES DOS ITENS ===")
-    ganhos = [92, 4, 43, 83, 84, 68, 92, 82, 6, 44, 32, 18, 56, 83, 25, 96, 70, 48, 14, 58]
-    pesos = [44, 46, 90, 72, 91, 40, 75, 35, 8, 54, 78, 40, 77, 15, 61, 17, 75, 29, 75, 63]
+    instancia = instancia_classica(20)
+    ganhos = instancia.ganhos_lista
+    pesos = instancia.pesos_lista
 
     print("Item | Valor | Peso | Razão Valor/Peso")
     print("-" * 35)
-    for i in range(20):
+    for i in range(instancia.dimensao):
         razao = ganhos[i] / pesos[i]
         print(f"{i:4d} | {ganhos[i]:5d} | {pesos[i]:4d} | {razao:.3f}")
 
-    print("\nCapacidade máxima da mochila: 878")
+    print(f"\nCapacidade máxima da mochila: {instancia.capacidade}")
 
 
 # Executar exemplos
 if __name__ == "__main__":
     test_knapsack()
 
-    # RESPOSTA: A SOLUÇÃO ÓTIMA
-    # Valor máximo ótimo: 295
-    # Seleção ótima: [0, 1, 1, 1, 0, 0, 0, 1, 1, 1]
-
-    # optimal_value, optimal_weight, is_valid = knapsack(
-    #     [0, 1, 1, 1, 0, 0, 0, 1, 1, 1]
-    # )  # Exemplo de uso da função
+    # RESPOSTA: A SOLUÇÃO ÓTIMA (calculada pelo solver exato)
+    from knapsack_exato import resolver_knapsack
 
-    # print(
-    #     f"Valor ótimo: {optimal_value}, Peso ótimo: {optimal_weight}, Válido: {is_valid}"
-    # )
\ No newline at end of file
+    for dim in (10, 20):
+        instancia = instancia_classica(dim)
+        otimo = resolver_knapsack(instancia.ganhos, instancia.pesos, instancia.capacidade)
+        print(f"\n=== SOLUÇÃO ÓTIMA ({dim} itens) ===")
+        print(f"Valor ótimo: {otimo['valor']}, Peso ótimo: {otimo['peso']}")
+        print(f"Seleção ótima: {otimo['solucao']}")
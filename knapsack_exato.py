@@ -0,0 +1,441 @@
+import bisect
+
+import numpy as np
+
+# ==============================================================================
+# SOLUÇÃO EXATA DO PROBLEMA DA MOCHILA 0/1
+# ==============================================================================
+# Referência para medir a distância (gap) entre os resultados do AG / Hill
+# Climbing e o ótimo. Estratégia de 'resolver_knapsack':
+#   1. Redução: com um limite inferior guloso e o limite da relaxação linear
+#      (LP), fixa os itens cuja troca não pode superar o limite inferior.
+#      Em instâncias grandes isso costuma deixar apenas um "núcleo" pequeno.
+#   2. Núcleo pequeno: programação dinâmica sobre a capacidade, com uma
+#      única linha NumPy reaproveitada (memória O(capacidade)). As decisões
+#      ficam em um bitset (np.packbits) quando cabem em LIMITE_MEMORIA_DECISOES.
+#   3. Núcleo grande (itens x capacidade acima de LIMITE_OPERACOES_DP):
+#      núcleo expandido ao redor do item crítico, no estilo do minknap de
+#      Pisinger. Parte da solução gulosa "até o item crítico" e considera um
+#      item por vez, alternando entre incluir o próximo item depois do
+#      núcleo e retirar o próximo antes dele. Os estados (peso, ganho) ficam
+#      em arrays ordenados por peso; estados dominados (mais pesados e sem
+#      ganho maior) e os que nem pelo limite LP superam o melhor valor são
+#      descartados. Como o núcleo quase nunca passa de alguns milhares de
+#      itens, 10^4 itens com capacidade 10^6 resolvem em segundos, inclusive
+#      nas instâncias fortemente correlacionadas.
+#   4. Estados demais (LIMITE_ESTADOS_NUCLEO): branch-and-bound guiado pelo
+#      limite LP a partir do melhor valor já encontrado.
+
+LIMITE_CAPACIDADE_DP = 20_000_000      # maior capacidade residual para a DP
+LIMITE_OPERACOES_DP = 50_000_000       # itens x capacidade aceitos pela DP
+LIMITE_MEMORIA_DECISOES = 256 * 2**20  # bytes do bitset de decisões
+LIMITE_ESTADOS_NUCLEO = 50_000_000     # estados guardados pelo núcleo expandido (~4 bytes cada)
+LIMITE_NOS_BB = 50_000_000             # nós explorados pelo branch-and-bound
+
+
+def _ordenar_por_razao(ganhos, pesos):
+    """Índices dos itens em ordem decrescente de ganho/peso."""
+    return np.lexsort((-ganhos, -(ganhos / np.maximum(pesos, 1e-12))))
+
+
+def limite_superior_lp(ganhos, pesos, capacidade):
+    """
+    Limite de Dantzig: valor ótimo da relaxação linear (itens fracionários).
+
+    Returns:
+        tuple: (limite, indice_item_critico_na_ordem, ordem)
+    """
+    ganhos = np.asarray(ganhos, dtype=np.int64)
+    pesos = np.asarray(pesos, dtype=np.int64)
+    ordem = _ordenar_por_razao(ganhos, pesos)
+
+    pesos_acumulados = np.cumsum(pesos[ordem])
+    ganhos_acumulados = np.cumsum(ganhos[ordem])
+
+    critico = int(np.searchsorted(pesos_acumulados, capacidade, side="right"))
+    if critico == len(ordem):
+        return float(ganhos_acumulados[-1]) if len(ordem) else 0.0, critico, ordem
+
+    peso_antes = pesos_acumulados[critico - 1] if critico else 0
+    ganho_antes = ganhos_acumulados[critico - 1] if critico else 0
+    item = ordem[critico]
+    fracao = (capacidade - peso_antes) / pesos[item]
+    return float(ganho_antes + fracao * ganhos[item]), critico, ordem
+
+
+def _solucao_gulosa(ganhos, pesos, capacidade, ordem):
+    """Limite inferior: percorre os itens por razão e coloca todos que couberem."""
+    solucao = np.zeros(len(ganhos), dtype=np.uint8)
+    restante = capacidade
+    for item in ordem.tolist():
+        if pesos[item] <= restante:
+            solucao[item] = 1
+            restante -= pesos[item]
+    return solucao
+
+
+def _reduzir(ganhos, pesos, capacidade, limite_inferior):
+    """
+    Fixa variáveis pelo limite de Dembo-Hammer: com a razão crítica r, mudar
+    o item j de lado custa pelo menos |g_j - r * p_j| no limite LP. Se mesmo
+    assim o limite não supera 'limite_inferior', o item fica fixo.
+
+    Returns:
+        tuple: (fixos_em_1, fixos_em_0) como máscaras booleanas
+    """
+    lp, critico, ordem = limite_superior_lp(ganhos, pesos, capacidade)
+    n = len(ganhos)
+    if critico == n:
+        return np.ones(n, dtype=bool), np.zeros(n, dtype=bool)
+
+    item_critico = ordem[critico]
+    razao = ganhos[item_critico] / pesos[item_critico]
+    folga = np.abs(ganhos - razao * pesos)
+    # Pequena tolerância para erros de ponto flutuante
+    nao_melhora = np.floor(lp - folga + 1e-9) < limite_inferior + 1
+
+    dentro = np.zeros(n, dtype=bool)
+    dentro[ordem[:critico]] = True
+    fora = np.zeros(n, dtype=bool)
+    fora[ordem[critico + 1:]] = True
+
+    return dentro & nao_melhora, fora & nao_melhora
+
+
+def resolver_dp(ganhos, pesos, capacidade, reconstruir=True):
+    """
+    Programação dinâmica sobre a capacidade com uma única linha NumPy.
+
+    Args:
+        ganhos, pesos: valores inteiros dos itens
+        capacidade: capacidade da mochila
+        reconstruir: guarda as decisões em um bitset para devolver a solução
+
+    Returns:
+        tuple: (valor_otimo, solucao ou None)
+    """
+    ganhos = np.asarray(ganhos, dtype=np.int64)
+    pesos = np.asarray(pesos, dtype=np.int64)
+    capacidade = int(capacidade)
+    n = len(ganhos)
+
+    linha = np.zeros(capacidade + 1, dtype=np.int64)
+    decisoes = None
+    if reconstruir:
+        decisoes = np.zeros((n, (capacidade + 8) // 8), dtype=np.uint8)
+
+    for i in range(n):
+        peso = int(pesos[i])
+        if peso > capacidade:
+            continue
+        # 'candidato' é uma cópia da linha anterior: cada item entra no máximo uma vez
+        candidato = linha[:capacidade + 1 - peso] + ganhos[i]
+        if decisoes is None:
+            np.maximum(linha[peso:], candidato, out=linha[peso:])
+            continue
+        melhora = candidato > linha[peso:]
+        linha[peso:][melhora] = candidato[melhora]
+        tomou = np.zeros(capacidade + 1, dtype=bool)
+        tomou[peso:] = melhora
+        decisoes[i] = np.packbits(tomou)
+
+    valor = int(linha[capacidade])
+    if decisoes is None:
+        return valor, None
+
+    solucao = [0] * n
+    restante = capacidade
+    for i in range(n - 1, -1, -1):
+        if (decisoes[i, restante >> 3] >> (7 - (restante & 7))) & 1:
+            solucao[i] = 1
+            restante -= int(pesos[i])
+    return valor, solucao
+
+
+def resolver_nucleo_expandido(ganhos, pesos, capacidade, limite_inferior=0,
+                              limite_estados=LIMITE_ESTADOS_NUCLEO):
+    """
+    Núcleo expandido ao redor do item crítico (estilo minknap).
+
+    Cada estado é um par (peso, ganho) de uma solução que difere da solução
+    crítica (todos os itens antes do item crítico, na ordem de razão) apenas
+    nos itens já considerados. A cada etapa, um item entra no núcleo e cada
+    estado gera um novo (com o item incluído ou retirado); os dois arrays
+    ordenados por peso são intercalados e os estados dominados, descartados.
+    Um estado viável só pode melhorar incluindo itens de razão no máximo a
+    do próximo item depois do núcleo; um inviável, retirando itens de razão
+    no mínimo a do próximo antes dele. Os que nem assim superam o melhor
+    valor saem (comparação em inteiros, sem erro de arredondamento).
+
+    Args:
+        limite_inferior: valor já conhecido (só soluções melhores interessam)
+        limite_estados: total de estados guardados para a reconstrução
+
+    Returns:
+        tuple: (valor, solucao, provado_otimo); 'solucao' é None quando
+        nenhuma solução melhor que 'limite_inferior' foi encontrada
+    """
+    ganhos = np.asarray(ganhos, dtype=np.int64)
+    pesos = np.asarray(pesos, dtype=np.int64)
+    ordem = _ordenar_por_razao(ganhos, pesos)
+    g, p = ganhos[ordem], pesos[ordem]
+    n = len(g)
+    critico = int(np.searchsorted(np.cumsum(p), capacidade, side="right"))
+    if critico == n:
+        valor = int(g.sum())
+        if valor <= limite_inferior:
+            return max(limite_inferior, 0), None, True
+        return valor, [1] * n, True
+
+    pesos_estados = np.array([p[:critico].sum()], dtype=np.int64)
+    ganhos_estados = np.array([g[:critico].sum()], dtype=np.int64)
+    melhor_valor = max(limite_inferior, 0)
+    melhor_estado = None  # (etapa, posição do estado antes da poda); etapa -1 = solução crítica
+    if ganhos_estados[0] > melhor_valor:
+        melhor_valor, melhor_estado = int(ganhos_estados[0]), (-1, 0)
+
+    # Por etapa: (item, estados anteriores, origem de cada estado, bits dos mantidos)
+    etapas = []
+    antes, depois = critico, critico  # núcleo = itens [antes, depois) na ordem de razão
+    incluir = True
+    estados_guardados = 0
+    provado = True
+
+    while len(pesos_estados) and (antes > 0 or depois < n):
+        if (incluir and depois < n) or antes == 0:
+            item, sinal = depois, 1
+            depois += 1
+        else:
+            antes -= 1
+            item, sinal = antes, -1
+        incluir = not incluir
+
+        anteriores = len(pesos_estados)
+        novos_pesos = np.concatenate((pesos_estados, pesos_estados + sinal * p[item]))
+        novos_ganhos = np.concatenate((ganhos_estados, ganhos_estados + sinal * g[item]))
+        origem = np.lexsort((-novos_ganhos, novos_pesos))
+        novos_pesos, novos_ganhos = novos_pesos[origem], novos_ganhos[origem]
+
+        # Dominância: mantém só quem ganha mais que todos os estados mais leves
+        nao_dominados = np.empty(len(origem), dtype=bool)
+        nao_dominados[0] = True
+        np.greater(novos_ganhos[1:], np.maximum.accumulate(novos_ganhos)[:-1], out=nao_dominados[1:])
+        origem = origem[nao_dominados].astype(np.int32)
+        novos_pesos, novos_ganhos = novos_pesos[nao_dominados], novos_ganhos[nao_dominados]
+
+        # Os primeiros 'viaveis' cabem na mochila; o último deles é o de maior ganho
+        viaveis = int(np.searchsorted(novos_pesos, capacidade, side="right"))
+        if viaveis and novos_ganhos[viaveis - 1] > melhor_valor:
+            melhor_valor, melhor_estado = int(novos_ganhos[viaveis - 1]), (len(etapas), viaveis - 1)
+
+        # Limite LP de cada estado: ganho + folga * razão do próximo item do lado certo
+        excesso = novos_ganhos - (melhor_valor + 1)
+        folga = capacidade - novos_pesos
+        mantidos = np.zeros(len(origem), dtype=bool)
+        if depois < n:
+            mantidos[:viaveis] = excesso[:viaveis] * p[depois] + folga[:viaveis] * g[depois] >= 0
+        if antes > 0:
+            mantidos[viaveis:] = excesso[viaveis:] * p[antes - 1] + folga[viaveis:] * g[antes - 1] >= 0
+
+        etapas.append((item, anteriores, origem, np.packbits(mantidos)))
+        pesos_estados, ganhos_estados = novos_pesos[mantidos], novos_ganhos[mantidos]
+        estados_guardados += len(origem)
+        if estados_guardados > limite_estados:
+            provado = False
+            break
+
+    if melhor_estado is None:
+        return melhor_valor, None, provado
+
+    # Reconstrução: volta pelas etapas trocando os itens em que o estado mudou
+    solucao = np.zeros(n, dtype=np.uint8)
+    solucao[:critico] = 1
+    etapa, posicao = melhor_estado
+    while etapa >= 0:
+        item, anteriores, origem, _ = etapas[etapa]
+        if origem[posicao] >= anteriores:
+            solucao[item] ^= 1
+        posicao = int(origem[posicao]) % anteriores
+        etapa -= 1
+        if etapa >= 0:
+            # 'posicao' conta só os estados mantidos na etapa anterior
+            mantidos = np.unpackbits(etapas[etapa][3], count=len(etapas[etapa][2])).astype(bool)
+            posicao = int(np.flatnonzero(mantidos)[posicao])
+
+    resultado = np.zeros(n, dtype=np.uint8)
+    resultado[ordem] = solucao
+    return melhor_valor, resultado.tolist(), provado
+
+
+def resolver_branch_and_bound(ganhos, pesos, capacidade, limite_inferior=0,
+                              alvo=None, limite_nos=LIMITE_NOS_BB):
+    """
+    Branch-and-bound em profundidade com o limite da relaxação linear.
+    Os itens são percorridos em ordem de razão ganho/peso, e o limite de cada
+    nó sai das somas acumuladas com uma busca binária (O(log n)).
+
+    Args:
+        limite_inferior: valor já conhecido (ramos que não o superam são podados)
+        alvo: se informado, para assim que encontrar uma solução com esse valor
+        limite_nos: número máximo de nós explorados
+
+    Returns:
+        tuple: (valor, solucao, provado_otimo); 'solucao' é None quando
+        nenhuma solução melhor que 'limite_inferior' foi encontrada
+    """
+    ganhos_np = np.asarray(ganhos, dtype=np.int64)
+    pesos_np = np.asarray(pesos, dtype=np.int64)
+    ordem = _ordenar_por_razao(ganhos_np, pesos_np)
+    g = ganhos_np[ordem].tolist()
+    p = pesos_np[ordem].tolist()
+    n = len(g)
+
+    pesos_acumulados = [0]
+    ganhos_acumulados = [0]
+    for gi, pi in zip(g, p):
+        pesos_acumulados.append(pesos_acumulados[-1] + pi)
+        ganhos_acumulados.append(ganhos_acumulados[-1] + gi)
+
+    def limite(k, peso_atual, ganho_atual):
+        # Maior m tal que os itens k..m-1 cabem inteiros
+        m = bisect.bisect_right(pesos_acumulados, capacidade - peso_atual + pesos_acumulados[k]) - 1
+        ub = ganho_atual + ganhos_acumulados[m] - ganhos_acumulados[k]
+        if m < n:
+            sobra = capacidade - peso_atual - (pesos_acumulados[m] - pesos_acumulados[k])
+            ub += sobra * g[m] / p[m]
+        return ub
+
+    melhor_valor = max(limite_inferior, 0)
+    melhor_escolha = None
+    encontrou = limite_inferior <= 0  # a mochila vazia (valor 0) já serve
+    nos = 0
+    # Pilha de (k, peso, ganho, escolhidos); 'escolhidos' é uma lista ligada
+    # imutável (item, anterior) para não copiar a solução a cada nó.
+    pilha = [(0, 0, 0, None)]
+
+    while pilha:
+        nos += 1
+        if nos > limite_nos:
+            break
+        k, peso_atual, ganho_atual, escolhidos = pilha.pop()
+
+        if ganho_atual > melhor_valor:
+            melhor_valor = ganho_atual
+            melhor_escolha = escolhidos
+            encontrou = True
+            if alvo is not None and melhor_valor >= alvo:
+                pilha.clear()
+                break
+
+        if k == n or limite(k, peso_atual, ganho_atual) < melhor_valor + 1:
+            continue
+
+        pilha.append((k + 1, peso_atual, ganho_atual, escolhidos))
+        if p[k] <= capacidade - peso_atual:
+            pilha.append((k + 1, peso_atual + p[k], ganho_atual + g[k], (k, escolhidos)))
+
+    provado = not pilha and nos <= limite_nos
+    if not encontrou:
+        return melhor_valor, None, provado
+
+    solucao = [0] * n
+    no = melhor_escolha
+    while no is not None:
+        solucao[int(ordem[no[0]])] = 1
+        no = no[1]
+    return melhor_valor, solucao, provado
+
+
+def resolver_knapsack(ganhos, pesos, capacidade):
+    """
+    Resolve a mochila 0/1 de forma exata.
+
+    Args:
+        ganhos: ganhos dos itens
+        pesos: pesos dos itens
+        capacidade: capacidade máxima
+
+    Returns:
+        dict: valor ótimo, solução binária, peso da solução, método usado
+        e o limite LP (para instâncias em que o ótimo não pôde ser provado,
+        'otimo_provado' é False e 'valor' é o melhor encontrado)
+    """
+    ganhos = np.asarray(ganhos, dtype=np.int64)
+    pesos = np.asarray(pesos, dtype=np.int64)
+    capacidade = int(capacidade)
+
+    limite_lp, _, ordem = limite_superior_lp(ganhos, pesos, capacidade)
+    solucao_gulosa = _solucao_gulosa(ganhos, pesos, capacidade, ordem)
+    limite_inferior = int(ganhos @ solucao_gulosa)
+
+    fixos_1, fixos_0 = _reduzir(ganhos, pesos, capacidade, limite_inferior)
+    nucleo = np.flatnonzero(~(fixos_1 | fixos_0))
+    capacidade_nucleo = capacidade - int(pesos[fixos_1].sum())
+    ganho_fixo = int(ganhos[fixos_1].sum())
+
+    # Candidatas: a solução gulosa e, se o núcleo for viável, fixos + núcleo
+    candidatas = [solucao_gulosa]
+    metodo = "reducao"
+    provado = True
+
+    if capacidade_nucleo >= 0 and not len(nucleo):
+        candidatas.append(fixos_1.astype(np.uint8))
+    elif capacidade_nucleo >= 0:
+        g_nucleo, p_nucleo = ganhos[nucleo], pesos[nucleo]
+        limite_nucleo = limite_inferior - ganho_fixo
+        operacoes = len(nucleo) * (capacidade_nucleo + 1)
+
+        if capacidade_nucleo <= LIMITE_CAPACIDADE_DP and operacoes <= LIMITE_OPERACOES_DP:
+            memoria = len(nucleo) * ((capacidade_nucleo + 8) // 8)
+            valor_nucleo, escolha_nucleo = resolver_dp(
+                g_nucleo, p_nucleo, capacidade_nucleo,
+                reconstruir=memoria <= LIMITE_MEMORIA_DECISOES,
+            )
+            metodo = "dp"
+            if escolha_nucleo is None and valor_nucleo > limite_nucleo:
+                # Valor já conhecido: o branch-and-bound só precisa reencontrá-lo
+                _, escolha_nucleo, _ = resolver_branch_and_bound(
+                    g_nucleo, p_nucleo, capacidade_nucleo,
+                    limite_inferior=limite_nucleo, alvo=valor_nucleo,
+                )
+        else:
+            valor_nucleo, escolha_nucleo, provado = resolver_nucleo_expandido(
+                g_nucleo, p_nucleo, capacidade_nucleo, limite_inferior=limite_nucleo,
+            )
+            metodo = "nucleo_expandido"
+            if not provado:
+                # Estados demais: o branch-and-bound parte do melhor valor já encontrado
+                _, escolha_bb, provado = resolver_branch_and_bound(
+                    g_nucleo, p_nucleo, capacidade_nucleo,
+                    limite_inferior=max(limite_nucleo, valor_nucleo),
+                )
+                if escolha_bb is not None:
+                    escolha_nucleo = escolha_bb
+                metodo = "branch_and_bound"
+
+        if escolha_nucleo is not None:
+            combinada = fixos_1.astype(np.uint8)
+            combinada[nucleo[np.flatnonzero(escolha_nucleo)]] = 1
+            candidatas.append(combinada)
+
+    solucao = max(candidatas, key=lambda sol: int(ganhos @ sol.astype(np.int64)))
+    solucao = solucao.tolist()
+    valor = int(ganhos @ np.asarray(solucao, dtype=np.int64))
+    peso = int(pesos @ np.asarray(solucao, dtype=np.int64))
+
+    return {
+        "valor": valor,
+        "peso": peso,
+        "solucao": solucao,
+        "metodo": metodo,
+        "limite_lp": limite_lp,
+        "otimo_provado": provado,
+        "itens_nucleo": int(len(nucleo)),
+    }
+
+
+def gap_otimalidade(valor, otimo):
+    """Distância relativa ao ótimo: (ótimo - valor) / ótimo."""
+    if not otimo:
+        return 0.0
+    return (otimo - valor) / otimo
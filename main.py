@@ -1,7 +1,341 @@
-from experimentos_tsp_atv_07.experimento_01 import realizar_experimento
+import argparse
+import sys
 
+# ==============================================================================
+# LINHA DE COMANDO
+# ==============================================================================
+# Um subcomando por algoritmo/experimento. Os módulos dos algoritmos são
+# importados só dentro do subcomando escolhido (e nenhum deles executa nada
+# ao ser importado), então 'python main.py --help' é imediato e nenhum
+# processo do pool carrega matplotlib. Gráficos só com '--grafico'; sem tela
+# eles são gravados em arquivo (backend Agg).
+#
+# Uso:
+#   python main.py tsp --workers 4 --semente 42 --estagnacao 100
+#   python main.py tsp --instancia berlin52.tsp --grafico --arquivo-grafico tsp.png
+#   python main.py knapsack --telemetria knapsack.csv --intervalo 10
+#   python main.py tsp --semente 42 --checkpoint sessao/   # e, após uma queda:
+#   python main.py tsp --checkpoint sessao/ --retomar
+#   python main.py knapsack --populacao 1000 --perfil knapsack.folded
+#   python main.py hill-climbing --estocastico --iteracoes 500
+#   python main.py ilhas --semente 7
+#   python main.py experimento-populacao --telemetria populacao.jsonl
+#   python main.py sintonia knapsack --candidatos 32 --geracoes 200
+#   python main.py benchmark --comparar        # demais opções: benchmark.py --help
 
-if __name__ == "__main__":
 
-    # Executa os experimentos da população: 10, 50 e 100 indivíduos
-    realizar_experimento()
\ No newline at end of file
+def _opcoes_execucao():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processos do pool (padrão: todos os núcleos)")
+    parser.add_argument("--semente", type=int, default=None,
+                        help="semente base: execuções reprodutíveis")
+    return parser
+
+
+def _opcoes_parada():
+    parser = argparse.ArgumentParser(add_help=False)
+    grupo = parser.add_argument_group("critérios de parada (combinados: o primeiro que disparar)")
+    grupo.add_argument("--estagnacao", type=int, default=None, metavar="N",
+                       help="para após N gerações/iterações sem melhora")
+    grupo.add_argument("--alvo", type=float, default=None,
+                       help="para ao atingir este fitness")
+    grupo.add_argument("--max-avaliacoes", type=int, default=None, metavar="N",
+                       help="para após N avaliações da função objetivo")
+    grupo.add_argument("--tempo-limite", type=float, default=None, metavar="S",
+                       help="para após S segundos por execução")
+    return parser
+
+
+def _opcoes_telemetria():
+    parser = argparse.ArgumentParser(add_help=False)
+    grupo = parser.add_argument_group("telemetria")
+    grupo.add_argument("--telemetria", default=None, metavar="ARQUIVO",
+                       help="grava o progresso por geração (.jsonl ou .csv)")
+    grupo.add_argument("--intervalo", type=int, default=1,
+                       help="grava uma geração a cada INTERVALO")
+    return parser
+
+
+def _opcoes_checkpoint():
+    parser = argparse.ArgumentParser(add_help=False)
+    grupo = parser.add_argument_group("checkpoints")
+    grupo.add_argument("--checkpoint", default=None, metavar="DIRETORIO",
+                       help="grava o estado de cada execução neste diretório")
+    grupo.add_argument("--intervalo-checkpoint", type=int, default=None, metavar="N",
+                       help="grava a cada N gerações/iterações (padrão: 50)")
+    grupo.add_argument("--retomar", "--resume", action="store_true",
+                       help="continua a sessão gravada em --checkpoint")
+    return parser
+
+
+def _opcoes_perfil():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--perfil", nargs="?", const=True, default=None, metavar="ARQUIVO",
+                        help="mede o tempo de cada fase do AG; com ARQUIVO, grava as "
+                             "pilhas dobradas para um flame graph")
+    return parser
+
+
+def _opcoes_ag():
+    parser = argparse.ArgumentParser(add_help=False)
+    grupo = parser.add_argument_group("parâmetros do AG (padrão: constantes do módulo)")
+    grupo.add_argument("--populacao", type=int, default=None, help="tamanho da população")
+    grupo.add_argument("--geracoes", type=int, default=None, help="máximo de gerações")
+    grupo.add_argument("--execucoes", type=int, default=None, help="execuções independentes")
+    grupo.add_argument("--torneio", type=int, default=None, help="competidores por torneio")
+    grupo.add_argument("--taxa-crossover", type=float, default=None)
+    grupo.add_argument("--taxa-mutacao", type=float, default=None)
+    grupo.add_argument("--elitismo", type=int, default=None, help="indivíduos preservados")
+    grupo.add_argument("--modelo", choices=("geracional", "estacionario"), default=None,
+                       help="troca da população inteira ou substituição no lugar (steady-state)")
+    grupo.add_argument("--filhos-por-passo", type=int, default=None,
+                       help="filhos inseridos a cada passo do modelo estacionário")
+    grupo.add_argument("--substituicao", choices=("pior", "torneio"), default=None,
+                       help="quem sai da população no modelo estacionário")
+    grupo.add_argument("--rejeitar-duplicados", action="store_true", default=None,
+                       help="descarta filhos iguais a um indivíduo da população (estacionário)")
+    return parser
+
+
+# Opção da linha de comando -> parâmetro da ConfiguracaoAG de cada AG
+_PARAMETROS_TSP = {
+    "populacao": "populacao_tamanho", "geracoes": "geracoes", "execucoes": "numero_execucoes",
+    "torneio": "tamanho_torneio", "taxa_crossover": "taxa_crossover",
+    "taxa_mutacao": "taxa_mutacao", "elitismo": "elitismo", "crossover": "crossover",
+    "busca_local": "busca_local", "modelo": "modelo", "filhos_por_passo": "filhos_por_passo",
+    "substituicao": "substituicao", "rejeitar_duplicados": "rejeitar_duplicados",
+}
+_PARAMETROS_KNAPSACK = {
+    "populacao": "tamanho_populacao", "geracoes": "numero_geracoes",
+    "execucoes": "numero_execucoes", "torneio": "tamanho_torneio",
+    "taxa_crossover": "taxa_crossover", "taxa_mutacao": "taxa_mutacao",
+    "elitismo": "qtd_elitismo", "modelo": "modelo", "filhos_por_passo": "filhos_por_passo",
+    "substituicao": "substituicao", "rejeitar_duplicados": "rejeitar_duplicados",
+}
+
+
+def _configuracao(modulo, args, parametros):
+    """ConfiguracaoAG do módulo com as opções informadas na linha de comando."""
+    valores = {
+        parametro: getattr(args, opcao) for opcao, parametro in parametros.items()
+        if getattr(args, opcao, None) is not None
+    }
+    try:
+        return modulo.ConfiguracaoAG(**valores)
+    except ValueError as erro:
+        raise SystemExit(f"Configuração inválida: {erro}")
+
+
+def _criterio(args):
+    """Combina os critérios pedidos com '|' (None se nenhum foi pedido)."""
+    from criterios_parada import AlvoFitness, Estagnacao, MaximoAvaliacoes, TempoLimite
+
+    criterios = []
+    if args.estagnacao is not None:
+        criterios.append(Estagnacao(args.estagnacao))
+    if args.alvo is not None:
+        criterios.append(AlvoFitness(args.alvo))
+    if args.max_avaliacoes is not None:
+        criterios.append(MaximoAvaliacoes(args.max_avaliacoes))
+    if args.tempo_limite is not None:
+        criterios.append(TempoLimite(args.tempo_limite))
+
+    criterio = None
+    for atual in criterios:
+        criterio = atual if criterio is None else criterio | atual
+    return criterio
+
+
+def _telemetria(args):
+    if not args.telemetria:
+        return None
+    from telemetria import Telemetria
+
+    return Telemetria(args.telemetria, intervalo=args.intervalo)
+
+
+def _checkpoint(args):
+    if not args.checkpoint:
+        if args.retomar:
+            raise SystemExit("--retomar exige --checkpoint DIRETORIO")
+        return None
+    from checkpoint import INTERVALO_CHECKPOINT, Checkpoint
+
+    intervalo = args.intervalo_checkpoint or INTERVALO_CHECKPOINT
+    return Checkpoint(args.checkpoint, intervalo=intervalo, retomar=args.retomar)
+
+
+def _instancia_tsp(args):
+    if not args.instancia:
+        from a_genetico_tsp_atv_06 import INSTANCIA
+
+        return INSTANCIA
+    from instancias_tsp import carregar_tsplib
+
+    return carregar_tsplib(args.instancia, modo=args.modo)
+
+
+# ==============================================================================
+# SUBCOMANDOS
+# ==============================================================================
+
+def _tsp(args):
+    import a_genetico_tsp_atv_06 as ag_tsp
+
+    ag_tsp.main(
+        num_workers=args.workers, semente=args.semente, tamanho_cache=args.cache,
+        instancia=_instancia_tsp(args), criterio=_criterio(args),
+        telemetria=_telemetria(args), grafico=args.grafico or bool(args.arquivo_grafico),
+        arquivo_grafico=args.arquivo_grafico,
+        configuracao=_configuracao(ag_tsp, args, _PARAMETROS_TSP),
+        checkpoint=_checkpoint(args), perfil=args.perfil,
+    )
+
+
+def _knapsack(args):
+    import a_genetico_knapsack_ativ04 as ag_knapsack
+
+    ag_knapsack.main(
+        num_workers=args.workers, semente=args.semente, criterio=_criterio(args),
+        telemetria=_telemetria(args),
+        configuracao=_configuracao(ag_knapsack, args, _PARAMETROS_KNAPSACK),
+        checkpoint=_checkpoint(args), perfil=args.perfil,
+    )
+
+
+def _hill_climbing(args):
+    if args.estocastico:
+        import stochastic_hill_climbing as modulo
+    else:
+        import hill_climbing as modulo
+
+    modulo.main(
+        dim=args.dim, max_iteracoes=args.iteracoes, num_workers=args.workers,
+        semente=args.semente, criterio=_criterio(args), telemetria=_telemetria(args),
+        checkpoint=_checkpoint(args),
+    )
+
+
+def _ilhas(args):
+    import modelo_ilhas_tsp
+
+    modelo_ilhas_tsp.main(instancia=_instancia_tsp(args), semente=args.semente)
+
+
+def _experimento_populacao(args):
+    from experimentos_tsp_atv_07.experimento_01 import realizar_experimento
+
+    # Executa os experimentos da população: 20, 50 e 100 indivíduos
+    realizar_experimento(telemetria=_telemetria(args))
+
+
+def _sintonia(args):
+    import sintonia
+
+    fixos = {}
+    if args.geracoes is not None:
+        fixos["geracoes" if args.problema == "tsp" else "numero_geracoes"] = args.geracoes
+    sintonia.sintonizar(
+        args.problema, numero_candidatos=args.candidatos, eta=args.eta,
+        execucoes_iniciais=args.execucoes_iniciais, maximo_execucoes=args.max_execucoes,
+        num_workers=args.workers, semente=args.semente, fixos=fixos,
+        instancia=_instancia_tsp(args) if args.problema == "tsp" else None,
+    )
+
+
+def _benchmark(args):
+    import benchmark
+
+    return benchmark.main(args.resto)
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        description="Algoritmos genéticos e Hill Climbing para o TSP e a mochila 0/1."
+    )
+    subparsers = parser.add_subparsers(dest="comando", metavar="COMANDO")
+    execucao, parada, telemetria = _opcoes_execucao(), _opcoes_parada(), _opcoes_telemetria()
+    ag, checkpoint, perfil = _opcoes_ag(), _opcoes_checkpoint(), _opcoes_perfil()
+
+    instancia = argparse.ArgumentParser(add_help=False)
+    instancia.add_argument("--instancia", default=None, metavar="ARQUIVO",
+                           help="instância TSPLIB (padrão: USA13)")
+    instancia.add_argument("--modo", default=None, choices=("densa", "memmap", "preguicosa"),
+                           help="armazenamento da matriz (padrão: pelo tamanho)")
+
+    tsp = subparsers.add_parser("tsp", parents=[execucao, instancia, ag, parada, telemetria, checkpoint, perfil],
+                                help="AG do TSP (30 execuções)")
+    tsp.add_argument("--crossover", default=None, choices=("ox", "pmx", "cx", "erx"),
+                     help="operador de crossover de permutação")
+    tsp.add_argument("--busca-local", default=None, choices=("filhos", "elite"),
+                     help="passo memético (2-opt) nos filhos ou na elite")
+    tsp.add_argument("--cache", type=int, default=None, metavar="N",
+                     help="cache de fitness com até N rotas por execução")
+    tsp.add_argument("--grafico", action="store_true",
+                     help="gera o gráfico de convergência")
+    tsp.add_argument("--arquivo-grafico", default=None, metavar="ARQUIVO",
+                     help="grava o gráfico neste arquivo (implica --grafico)")
+    tsp.set_defaults(funcao=_tsp)
+
+    knapsack = subparsers.add_parser("knapsack", parents=[execucao, ag, parada, telemetria, checkpoint, perfil],
+                                     help="AG da mochila (três crossovers)")
+    knapsack.set_defaults(funcao=_knapsack)
+
+    hill = subparsers.add_parser("hill-climbing", parents=[execucao, parada, telemetria, checkpoint],
+                                 help="Hill Climbing na mochila")
+    hill.add_argument("--estocastico", action="store_true",
+                      help="escolhe ao acaso entre os vizinhos melhores")
+    hill.add_argument("--dim", type=int, default=20, choices=(10, 20),
+                      help="instância clássica de 10 ou 20 itens")
+    hill.add_argument("--iteracoes", type=int, default=200,
+                      help="máximo de iterações por execução")
+    hill.set_defaults(funcao=_hill_climbing)
+
+    ilhas = subparsers.add_parser("ilhas", parents=[instancia],
+                                  help="AG do TSP em modelo de ilhas")
+    ilhas.add_argument("--semente", type=int, default=None,
+                       help="semente base: execuções reprodutíveis")
+    ilhas.set_defaults(funcao=_ilhas)
+
+    experimento = subparsers.add_parser("experimento-populacao", parents=[telemetria],
+                                        help="AG do TSP com populações de 20, 50 e 100")
+    experimento.set_defaults(funcao=_experimento_populacao)
+
+    sint = subparsers.add_parser("sintonia", parents=[execucao, instancia],
+                                 help="sintonia de parâmetros por successive halving")
+    sint.add_argument("problema", choices=("tsp", "knapsack"))
+    sint.add_argument("--candidatos", type=int, default=16,
+                      help="configurações sorteadas do espaço de busca")
+    sint.add_argument("--eta", type=int, default=2,
+                      help="a cada rodada sobrevive 1/ETA das candidatas")
+    sint.add_argument("--execucoes-iniciais", type=int, default=2,
+                      help="execuções por candidata na primeira rodada")
+    sint.add_argument("--max-execucoes", type=int, default=30,
+                      help="execuções da candidata que chega ao fim")
+    sint.add_argument("--geracoes", type=int, default=None,
+                      help="gerações de cada execução (fixas para todas)")
+    sint.set_defaults(funcao=_sintonia)
+
+    # As opções do benchmark são repassadas sem alteração para benchmark.main
+    bench = subparsers.add_parser("benchmark", add_help=False,
+                                  help="suíte de benchmarks (opções de benchmark.py)")
+    bench.set_defaults(funcao=_benchmark)
+
+    return parser
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args, resto = parser.parse_known_args(argv)
+    if args.comando is None:
+        parser.print_help()
+        return 2
+    if resto and args.comando != "benchmark":
+        parser.error(f"argumentos não reconhecidos: {' '.join(resto)}")
+    args.resto = resto
+    return args.funcao(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+import multiprocessing as mp
+import queue
+import random
+import traceback
+
+import numpy as np
+
+from a_genetico_tsp_atv_06 import (
+    GERACOES, INSTANCIA, AlgoritmoGeneticoTSP, distancias_da_populacao,
+)
+from execucao_paralela import gerar_sementes
+from selecao import melhores_indices
+
+# ==============================================================================
+# AG DO TSP EM MODELO DE ILHAS
+# ==============================================================================
+# K subpopulações (ilhas) evoluem em processos separados usando o mesmo
+# motor do AG panmítico (AlgoritmoGeneticoTSP), cada uma com a sua
+# configuração (ilhas heterogêneas são permitidas). A cada INTERVALO_MIGRACAO gerações, cada ilha
+# envia suas NUM_MIGRANTES melhores rotas para as ilhas vizinhas na topologia
+# e substitui suas piores rotas pelas que recebeu. As rotas viajam como
+# arrays int32 (migrantes x cidades+1) junto com um array de fitness.
+# Nenhuma espera é indefinida: as filas são lidas com timeout (ESPERA_FILAS)
+# em laço. Se uma ilha levanta uma exceção, ela envia um marcador de erro na
+# fila de resultados; se um processo morre sem resultado, o processo
+# principal percebe pelo 'exitcode'. Nos dois casos as outras ilhas são
+# avisadas (evento 'abortar') e encerradas, e a falha é relançada.
+
+NUM_ILHAS = 4
+INTERVALO_MIGRACAO = 20
+NUM_MIGRANTES = 2
+TOPOLOGIA = "anel"  # "anel" ou "completa"
+
+TOPOLOGIAS = ("anel", "completa")
+ESPERA_FILAS = 0.5  # segundos de cada espera nas filas antes de verificar falhas
+
+
+def destinos_migracao(indice, num_ilhas, topologia):
+    """Ilhas para as quais a ilha 'indice' envia seus migrantes."""
+    if num_ilhas == 1:
+        return []
+    if topologia == "anel":
+        return [(indice + 1) % num_ilhas]
+    if topologia == "completa":
+        return [j for j in range(num_ilhas) if j != indice]
+    raise ValueError(f"Topologia desconhecida: {topologia}. Use uma de {TOPOLOGIAS}.")
+
+
+def _pacote_migrantes(populacao, num_migrantes):
+    """Empacota as melhores rotas como (rotas int32, fitness)."""
+    indices = melhores_indices(distancias_da_populacao(populacao), num_migrantes, maximizar=False)
+    melhores = [populacao[indice] for indice in indices.tolist()]
+    rotas = np.array([ind["rota"] for ind in melhores], dtype=np.int32)
+    fitness_migrantes = np.array([ind["fitness"] for ind in melhores])
+    return rotas, fitness_migrantes
+
+
+class IlhaAbortada(Exception):
+    """Outra ilha falhou: esta para de esperar migrantes."""
+
+
+def _receber(caixa, abortar):
+    """Lê a caixa de migrantes sem bloquear para sempre (para se 'abortar' for ligado)."""
+    while True:
+        try:
+            return caixa.get(timeout=ESPERA_FILAS)
+        except queue.Empty:
+            if abortar.is_set():
+                raise IlhaAbortada
+
+
+def _ilha(indice, semente, caixas, destinos, num_origens, geracoes, intervalo,
+          num_migrantes, fila_resultados, instancia, configuracao, abortar):
+    """
+    Processo de uma ilha: executa '_evoluir_ilha' e envia o resultado ou,
+    se ela falhar, um marcador de erro ("erro", indice, traceback).
+    """
+    try:
+        resultado = _evoluir_ilha(
+            indice, semente, caixas, destinos, num_origens, geracoes, intervalo,
+            num_migrantes, instancia, configuracao, abortar,
+        )
+    except IlhaAbortada:
+        return
+    except Exception:
+        fila_resultados.put(("erro", indice, traceback.format_exc()))
+        return
+    fila_resultados.put(resultado)
+
+
+def _evoluir_ilha(indice, semente, caixas, destinos, num_origens, geracoes, intervalo,
+                  num_migrantes, instancia, configuracao, abortar):
+    """Laço evolutivo de uma ilha (executado em um processo próprio)."""
+    random.seed(semente)
+    np.random.seed(semente)
+
+    motor = AlgoritmoGeneticoTSP(configuracao, instancia)
+    populacao = motor.criar_populacao_inicial()
+    convergencia = []
+
+    for geracao in range(1, geracoes + 1):
+        populacao = motor.nova_geracao(populacao)
+        convergencia.append(min(ind["fitness"] for ind in populacao))
+
+        if not destinos or geracao % intervalo != 0 or geracao == geracoes:
+            continue
+
+        # Envia as melhores rotas aos vizinhos ...
+        pacote = _pacote_migrantes(populacao, num_migrantes)
+        for destino in destinos:
+            caixas[destino].put(pacote)
+
+        # ... e espera os migrantes de todas as ilhas de origem
+        migrantes = []
+        for _ in range(num_origens):
+            rotas, fitness_migrantes = _receber(caixas[indice], abortar)
+            migrantes.extend(
+                {"rota": rota, "fitness": fit}
+                for rota, fit in zip(rotas.tolist(), fitness_migrantes.tolist())
+            )
+
+        # Os migrantes substituem os piores indivíduos (a elite é preservada)
+        vagas = max(0, len(populacao) - motor.configuracao.elitismo)
+        migrantes = migrantes[:vagas]
+        piores = melhores_indices(
+            distancias_da_populacao(populacao), len(migrantes), maximizar=True
+        )
+        for posicao, migrante in zip(piores.tolist(), migrantes):
+            populacao[posicao] = migrante
+
+    melhor = min(populacao, key=lambda ind: ind["fitness"])
+    return indice, np.array(melhor["rota"], dtype=np.int32), melhor["fitness"], convergencia
+
+
+def _coletar_resultados(processos, fila_resultados, abortar):
+    """
+    Espera o resultado de todas as ilhas. Se uma delas enviar um marcador de
+    erro ou terminar sem resultado, encerra as demais e levanta RuntimeError.
+    """
+    resultados = {}
+    falha = None
+    while len(resultados) < len(processos) and falha is None:
+        try:
+            resultado = fila_resultados.get(timeout=ESPERA_FILAS)
+        except queue.Empty:
+            for indice, processo in enumerate(processos):
+                if indice not in resultados and processo.exitcode not in (None, 0):
+                    falha = f"Ilha {indice} terminou sem resultado (exitcode {processo.exitcode})."
+                    break
+            continue
+        if resultado[0] == "erro":
+            _, indice, rastro = resultado
+            falha = f"Ilha {indice} falhou:\n{rastro}"
+        else:
+            resultados[resultado[0]] = resultado
+
+    if falha is not None:
+        abortar.set()
+        for processo in processos:
+            processo.terminate()
+        for processo in processos:
+            processo.join()
+        raise RuntimeError(falha)
+    return [resultados[indice] for indice in sorted(resultados)]
+
+
+def executar_ilhas(num_ilhas=NUM_ILHAS, geracoes=GERACOES,
+                   intervalo_migracao=INTERVALO_MIGRACAO,
+                   num_migrantes=NUM_MIGRANTES, topologia=TOPOLOGIA, semente=None,
+                   instancia=INSTANCIA, configuracao=None):
+    """
+    Executa o AG em modelo de ilhas, uma ilha por processo.
+
+    Args:
+        num_ilhas: quantidade de subpopulações (K)
+        geracoes: gerações evoluídas por ilha
+        intervalo_migracao: migração a cada M gerações
+        num_migrantes: rotas enviadas por ilha a cada vizinho
+        topologia: "anel" ou "completa"
+        semente: semente base (cada ilha recebe uma semente independente)
+        instancia: InstanciaTSP resolvida pelas ilhas
+        configuracao: ConfiguracaoAG de todas as ilhas ou uma lista com a
+            de cada ilha (padrão: constantes do AG do TSP)
+
+    Returns:
+        dict: melhor rota global, seu fitness, a ilha de origem e a
+        convergência (melhor fitness por geração) de cada ilha.
+        Se alguma ilha falhar ou terminar sem resultado, as demais são
+        encerradas e a falha vira um RuntimeError.
+    """
+    # Valida a topologia antes de criar os processos
+    destinos = [destinos_migracao(i, num_ilhas, topologia) for i in range(num_ilhas)]
+    num_origens = [sum(i in d for d in destinos) for i in range(num_ilhas)]
+    if not isinstance(configuracao, (list, tuple)):
+        configuracao = [configuracao] * num_ilhas
+    if len(configuracao) != num_ilhas:
+        raise ValueError("Informe uma configuração por ilha.")
+
+    contexto = mp.get_context()
+    caixas = [contexto.Queue() for _ in range(num_ilhas)]
+    fila_resultados = contexto.Queue()
+    abortar = contexto.Event()
+
+    processos = [
+        contexto.Process(
+            target=_ilha,
+            args=(i, semente_ilha, caixas, destinos[i], num_origens[i], geracoes,
+                  intervalo_migracao, num_migrantes, fila_resultados, instancia,
+                  configuracao[i], abortar),
+        )
+        for i, semente_ilha in enumerate(gerar_sementes(num_ilhas, semente))
+    ]
+    for processo in processos:
+        processo.start()
+
+    resultados = _coletar_resultados(processos, fila_resultados, abortar)
+    for processo in processos:
+        processo.join()
+
+    ilha_melhor, melhor_rota, melhor_fitness, _ = min(resultados, key=lambda r: r[2])
+
+    return {
+        "melhor_rota": melhor_rota.tolist(),
+        "melhor_fitness": melhor_fitness,
+        "ilha_melhor": ilha_melhor,
+        "melhor_por_ilha": [r[2] for r in resultados],
+        "convergencia_por_ilha": [r[3] for r in resultados],
+    }
+
+
+def main(instancia=INSTANCIA, semente=None):
+    resultado = executar_ilhas(semente=semente, instancia=instancia)
+
+    print(f"=== MODELO DE ILHAS ({NUM_ILHAS} ilhas, topologia {TOPOLOGIA}) ===")
+    print(f"Melhor rota: {resultado['melhor_rota']}")
+    if instancia.nomes:
+        rota_nomes = " -> ".join(instancia.nomes[i] for i in resultado["melhor_rota"])
+        print(f"Cidades: {rota_nomes}")
+    print(f"Menor distância: {resultado['melhor_fitness']} milhas "
+          f"(ilha {resultado['ilha_melhor']})")
+
+    print("\nConvergência por ilha (melhor distância a cada migração):")
+    for indice, convergencia in enumerate(resultado["convergencia_por_ilha"]):
+        marcos = convergencia[INTERVALO_MIGRACAO - 1::INTERVALO_MIGRACAO]
+        print(f"  Ilha {indice}: {marcos}")
+
+
+if __name__ == "__main__":
+    main()
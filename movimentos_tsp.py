@@ -0,0 +1,200 @@
+import random
+
+# ==============================================================================
+# MOVIMENTOS PARA ROTAS DO TSP COM AVALIAÇÃO DELTA
+# ==============================================================================
+# As rotas seguem o formato do projeto: [0, c1, c2, ..., c(n-1), 0], ou seja,
+# a primeira e a última posição são fixas e os movimentos só alteram as
+# posições internas 1..n-1. Cada movimento informa a variação do comprimento
+# da rota em O(1) a partir da matriz de distâncias, sem somar a rota inteira.
+#
+# Movimentos (tuplas reportadas pelos geradores):
+#   ("swap", i, j)      troca as cidades das posições i e j
+#   ("2opt", i, j)      inverte o trecho rota[i..j]
+#   ("oropt", i, k, p)  move o segmento rota[i..i+k-1] para depois da posição p
+#
+# Observação: o 2-opt supõe matriz simétrica (como USA13), pois inverte o
+# sentido das arestas internas do trecho.
+
+TAMANHO_MAXIMO_OROPT = 3
+
+
+def comprimento_rota(rota, matriz_distancias):
+    """Soma completa das arestas da rota (usada apenas para iniciar o cache)."""
+    total = 0
+    for i in range(len(rota) - 1):
+        total += matriz_distancias[rota[i]][rota[i + 1]]
+    return total
+
+
+# --------------------------------------------------------
+# SWAP
+# --------------------------------------------------------
+def delta_swap(rota, matriz_distancias, i, j):
+    """Variação do comprimento ao trocar as cidades das posições i e j."""
+    if i > j:
+        i, j = j, i
+    d = matriz_distancias
+    a, ci, b = rota[i - 1], rota[i], rota[i + 1]
+    c, cj, e = rota[j - 1], rota[j], rota[j + 1]
+
+    if j == i + 1:
+        # Posições adjacentes: a -> ci -> cj -> e vira a -> cj -> ci -> e
+        return (d[a][cj] + d[cj][ci] + d[ci][e]) - (d[a][ci] + d[ci][cj] + d[cj][e])
+
+    removido = d[a][ci] + d[ci][b] + d[c][cj] + d[cj][e]
+    adicionado = d[a][cj] + d[cj][b] + d[c][ci] + d[ci][e]
+    return adicionado - removido
+
+
+def aplicar_swap(rota, i, j):
+    """Aplica o swap in-place."""
+    rota[i], rota[j] = rota[j], rota[i]
+    return rota
+
+
+# --------------------------------------------------------
+# 2-OPT
+# --------------------------------------------------------
+def delta_2opt(rota, matriz_distancias, i, j):
+    """Variação do comprimento ao inverter o trecho rota[i..j] (i < j)."""
+    d = matriz_distancias
+    a, ci = rota[i - 1], rota[i]
+    cj, b = rota[j], rota[j + 1]
+    return (d[a][cj] + d[ci][b]) - (d[a][ci] + d[cj][b])
+
+
+def aplicar_2opt(rota, i, j):
+    """Inverte o trecho rota[i..j] in-place."""
+    rota[i:j + 1] = rota[i:j + 1][::-1]
+    return rota
+
+
+# --------------------------------------------------------
+# OR-OPT
+# --------------------------------------------------------
+def delta_oropt(rota, matriz_distancias, i, k, p):
+    """
+    Variação do comprimento ao mover o segmento rota[i..i+k-1] para entre
+    as posições p e p+1 (p fora do segmento e diferente de i-1).
+    """
+    d = matriz_distancias
+    antes, inicio = rota[i - 1], rota[i]
+    fim, depois = rota[i + k - 1], rota[i + k]
+    x, y = rota[p], rota[p + 1]
+
+    removido = d[antes][inicio] + d[fim][depois] + d[x][y]
+    adicionado = d[antes][depois] + d[x][inicio] + d[fim][y]
+    return adicionado - removido
+
+
+def aplicar_oropt(rota, i, k, p):
+    """Move o segmento rota[i..i+k-1] para depois da posição p, in-place."""
+    segmento = rota[i:i + k]
+    if p < i:
+        rota[p + 1:i + k] = segmento + rota[p + 1:i]
+    else:
+        rota[i:p + 1] = rota[i + k:p + 1] + segmento
+    return rota
+
+
+# --------------------------------------------------------
+# INTERFACE GENÉRICA DE MOVIMENTOS
+# --------------------------------------------------------
+def delta_movimento(rota, matriz_distancias, movimento):
+    """Variação do comprimento de qualquer movimento reportado pelos geradores."""
+    tipo = movimento[0]
+    if tipo == "swap":
+        return delta_swap(rota, matriz_distancias, movimento[1], movimento[2])
+    if tipo == "2opt":
+        return delta_2opt(rota, matriz_distancias, movimento[1], movimento[2])
+    return delta_oropt(rota, matriz_distancias, movimento[1], movimento[2], movimento[3])
+
+
+def aplicar_movimento(rota, movimento):
+    """Aplica qualquer movimento reportado pelos geradores, in-place."""
+    tipo = movimento[0]
+    if tipo == "swap":
+        return aplicar_swap(rota, movimento[1], movimento[2])
+    if tipo == "2opt":
+        return aplicar_2opt(rota, movimento[1], movimento[2])
+    return aplicar_oropt(rota, movimento[1], movimento[2], movimento[3])
+
+
+def sortear_movimento(rota, tipos=("swap", "2opt", "oropt")):
+    """Sorteia um movimento válido para a rota."""
+    ultimo = len(rota) - 2  # última posição interna
+    tipo = random.choice(tipos)
+
+    if tipo == "swap":
+        i, j = random.sample(range(1, ultimo + 1), 2)
+        return ("swap", i, j)
+
+    if tipo == "2opt":
+        i, j = sorted(random.sample(range(1, ultimo + 1), 2))
+        return ("2opt", i, j)
+
+    k = random.randint(1, min(TAMANHO_MAXIMO_OROPT, ultimo - 1))
+    i = random.randint(1, ultimo - k + 1)
+    # p pode ser qualquer posição em [0, i-2] ou [i+k, ultimo]
+    # (i-1 e as posições do próprio segmento não moveriam nada)
+    p = random.randint(0, ultimo - k - 1)
+    if p >= i - 1:
+        p += k + 1
+    return ("oropt", i, k, p)
+
+
+def gerar_movimentos_tsp(rota, n_vizinhos=10, tipos=("swap", "2opt", "oropt")):
+    """
+    Gera vizinhos para o TSP na forma de movimentos (sem copiar a rota)
+
+    Args:
+        rota: rota atual
+        n_vizinhos: número de vizinhos
+        tipos: tipos de movimento permitidos
+
+    Returns:
+        list: lista de movimentos
+    """
+    return [sortear_movimento(rota, tipos) for _ in range(n_vizinhos)]
+
+
+def gerar_vizinhos_tsp(rota, n_vizinhos=10, tipos=("swap", "2opt", "oropt")):
+    """
+    Gera vizinhos para o TSP como rotas completas (para uso sem avaliação delta)
+
+    Args:
+        rota: rota atual
+        n_vizinhos: número de vizinhos
+        tipos: tipos de movimento permitidos
+
+    Returns:
+        list: lista de vizinhos
+    """
+    return [
+        aplicar_movimento(rota[:], movimento)
+        for movimento in gerar_movimentos_tsp(rota, n_vizinhos, tipos)
+    ]
+
+
+class AvaliacaoDeltaTSP:
+    """
+    Avaliação incremental de movimentos do TSP para o HillClimbing
+    (mesmo protocolo de AvaliacaoDeltaKnapsack). Mantém o comprimento da rota
+    atual em cache e avalia cada movimento em O(1).
+    """
+
+    def __init__(self, matriz_distancias):
+        self.matriz_distancias = matriz_distancias
+        self.distancia_atual = 0
+
+    def iniciar(self, rota):
+        self.distancia_atual = comprimento_rota(rota, self.matriz_distancias)
+        return self.distancia_atual
+
+    def avaliar(self, rota, movimento):
+        return self.distancia_atual + delta_movimento(rota, self.matriz_distancias, movimento)
+
+    def aplicar(self, rota, movimento):
+        self.distancia_atual += delta_movimento(rota, self.matriz_distancias, movimento)
+        return aplicar_movimento(rota, movimento)
@@ -0,0 +1,209 @@
+import random
+from time import perf_counter
+
+import numpy as np
+
+# ==============================================================================
+# OPERADORES DE CROSSOVER PARA PERMUTAÇÕES EM TEMPO LINEAR
+# ==============================================================================
+# Todos recebem e devolvem rotas no formato do projeto, [0, c1, ..., c(n-1), 0]:
+# a cidade inicial/final é fixa e apenas o miolo da rota é recombinado.
+# Em vez de testar 'cidade in filho' (O(n) por teste, O(n²) por filho), os
+# operadores usam arrays de posição (índice de cada cidade no pai) ou arrays
+# booleanos de pertinência, o que deixa cada filho em O(n).
+
+
+def crossover_ox(pai1, pai2):
+    """
+    Order Crossover (OX).
+    Copia um segmento do pai1 e preenche o restante, a partir do fim do
+    segmento, com as cidades do pai2 na ordem em que aparecem.
+    """
+    tamanho = len(pai1) - 2  # exclui a cidade inicial e final
+    p1, p2 = random.sample(range(1, tamanho + 1), 2)
+    inicio, fim = min(p1, p2), max(p1, p2)
+
+    pai1 = np.asarray(pai1)
+    pai2 = np.asarray(pai2)
+
+    filho = np.zeros(tamanho + 2, dtype=pai1.dtype)
+    filho[inicio:fim] = pai1[inicio:fim]
+
+    # Pertinência das cidades já copiadas (array booleano, O(1) por consulta)
+    no_segmento = np.zeros(tamanho + 2, dtype=bool)
+    no_segmento[pai1[inicio:fim]] = True
+    miolo2 = pai2[1:-1]
+    restantes = miolo2[~no_segmento[miolo2]]
+
+    # Posições livres na ordem de preenchimento: fim..tamanho e depois 1..inicio-1
+    filho[fim:tamanho + 1] = restantes[:tamanho + 1 - fim]
+    filho[1:inicio] = restantes[tamanho + 1 - fim:]
+
+    return filho.tolist()
+
+
+def crossover_pmx(pai1, pai2):
+    """
+    Partially Mapped Crossover (PMX).
+    O filho herda o segmento do pai1 nas mesmas posições; as demais posições
+    vêm do pai2, resolvendo conflitos pelo mapeamento do segmento. Implementado
+    por trocas sucessivas sobre uma cópia do pai2 com um array de posições.
+    """
+    tamanho = len(pai1) - 2
+    p1, p2 = random.sample(range(1, tamanho + 1), 2)
+    inicio, fim = min(p1, p2), max(p1, p2)
+
+    filho = list(pai2)
+    posicao = [0] * (tamanho + 1)  # posicao[cidade] = índice da cidade no filho
+    for i in range(1, tamanho + 1):
+        posicao[filho[i]] = i
+
+    for i in range(inicio, fim):
+        cidade = pai1[i]
+        j = posicao[cidade]
+        if j != i:
+            outra = filho[i]
+            filho[i], filho[j] = cidade, outra
+            posicao[cidade], posicao[outra] = i, j
+
+    return filho
+
+
+def crossover_cx(pai1, pai2):
+    """
+    Cycle Crossover (CX).
+    Decompõe as posições em ciclos entre os pais; os ciclos alternam entre
+    herdar do pai1 e do pai2, então cada cidade mantém a posição de um dos pais.
+    """
+    tamanho = len(pai1) - 2
+    posicao_pai1 = [0] * (tamanho + 1)
+    for i in range(1, tamanho + 1):
+        posicao_pai1[pai1[i]] = i
+
+    filho = [0] * (tamanho + 2)
+    visitado = [False] * (tamanho + 2)
+    do_pai1 = True
+
+    for inicio in range(1, tamanho + 1):
+        if visitado[inicio]:
+            continue
+        origem = pai1 if do_pai1 else pai2
+        i = inicio
+        while not visitado[i]:
+            visitado[i] = True
+            filho[i] = origem[i]
+            i = posicao_pai1[pai2[i]]
+        do_pai1 = not do_pai1
+
+    return filho
+
+
+def crossover_erx(pai1, pai2):
+    """
+    Edge Recombination Crossover (ERX).
+    Monta a rota a partir da cidade 0 escolhendo, entre os vizinhos da cidade
+    atual nos dois pais, o que tem menos vizinhos ainda disponíveis.
+    Cada cidade tem no máximo 4 vizinhos, então cada passo é O(1).
+    """
+    num_cidades = len(pai1) - 1
+    vizinhos = [set() for _ in range(num_cidades)]
+    for pai in (pai1, pai2):
+        for i in range(num_cidades):
+            a, b = pai[i], pai[i + 1]
+            vizinhos[a].add(b)
+            vizinhos[b].add(a)
+
+    # Cidades ainda não visitadas, com remoção O(1) (troca com a última)
+    livres = list(range(1, num_cidades))
+    indice_livre = list(range(-1, num_cidades - 1))
+
+    def remover_livre(cidade):
+        pos = indice_livre[cidade]
+        ultima = livres[-1]
+        livres[pos] = ultima
+        indice_livre[ultima] = pos
+        livres.pop()
+
+    filho = [0]
+    atual = 0
+    for vizinho in vizinhos[atual]:
+        vizinhos[vizinho].discard(atual)
+
+    while livres:
+        candidatos = vizinhos[atual]
+        if candidatos:
+            menor = min(len(vizinhos[c]) for c in candidatos)
+            empatados = [c for c in candidatos if len(vizinhos[c]) == menor]
+            proxima = random.choice(empatados)
+        else:
+            proxima = random.choice(livres)
+
+        remover_livre(proxima)
+        for vizinho in vizinhos[proxima]:
+            vizinhos[vizinho].discard(proxima)
+        filho.append(proxima)
+        atual = proxima
+
+    filho.append(0)
+    return filho
+
+
+# Seleção do operador pelo nome (usado por 'nova_geracao')
+OPERADORES_CROSSOVER = {
+    "ox": crossover_ox,
+    "pmx": crossover_pmx,
+    "cx": crossover_cx,
+    "erx": crossover_erx,
+}
+
+
+# ==============================================================================
+# MICRO-BENCHMARK
+# ==============================================================================
+
+def medir_operadores(tamanhos=(13, 100, 500, 2000), tempo_minimo=0.2, semente=0):
+    """
+    Mede quantos filhos por segundo cada operador gera para cada quantidade
+    de cidades.
+
+    Args:
+        tamanhos: quantidades de cidades testadas
+        tempo_minimo: tempo mínimo (s) de medição por operador e tamanho
+        semente: semente usada para gerar os pais
+
+    Returns:
+        dict: {nome_operador: {num_cidades: filhos_por_segundo}}
+    """
+    random.seed(semente)
+    resultados = {nome: {} for nome in OPERADORES_CROSSOVER}
+
+    for num_cidades in tamanhos:
+        miolo = list(range(1, num_cidades))
+        pais = []
+        for _ in range(2):
+            random.shuffle(miolo)
+            pais.append([0] + miolo + [0])
+
+        for nome, operador in OPERADORES_CROSSOVER.items():
+            filhos = 0
+            inicio = perf_counter()
+            while True:
+                operador(pais[0], pais[1])
+                filhos += 1
+                decorrido = perf_counter() - inicio
+                if decorrido >= tempo_minimo:
+                    break
+            resultados[nome][num_cidades] = filhos / decorrido
+
+    return resultados
+
+
+if __name__ == "__main__":
+    TAMANHOS = (13, 100, 500, 2000, 5000)
+    resultados = medir_operadores(TAMANHOS)
+
+    print("Filhos por segundo x número de cidades")
+    print("Operador | " + " | ".join(f"{n:>9d}" for n in TAMANHOS))
+    print("-" * (11 + 12 * len(TAMANHOS)))
+    for nome, por_tamanho in resultados.items():
+        print(f"{nome:>8} | " + " | ".join(f"{por_tamanho[n]:9.0f}" for n in TAMANHOS))
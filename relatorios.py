@@ -0,0 +1,219 @@
+import os
+import sys
+
+# ==============================================================================
+# RELATÓRIOS GRÁFICOS
+# ==============================================================================
+# Os gráficos ficam fora dos módulos dos algoritmos: matplotlib e seaborn só
+# são importados quando um gráfico é pedido. Assim importar um AG (em cada
+# processo do pool, por exemplo) não paga o custo de carregar as bibliotecas
+# de plotagem. Sem tela (servidor, CI, SSH sem X) o backend Agg é usado e a
+# figura é gravada em arquivo em vez de aberta em uma janela.
+
+ARQUIVO_GRAFICO_TSP = "convergencia_ag_tsp.png"
+DPI = 150
+
+
+def sem_tela():
+    """True quando não há onde abrir uma janela (Linux sem DISPLAY/WAYLAND)."""
+    if not sys.platform.startswith("linux"):
+        return False
+    return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def _pyplot(mostrar):
+    """Importa o pyplot, escolhendo o Agg quando a figura não será mostrada."""
+    import matplotlib
+
+    # Um backend escolhido pelo usuário (MPLBACKEND) é respeitado
+    if not mostrar and "MPLBACKEND" not in os.environ:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def _finalizar(plt, fig, arquivo, mostrar):
+    """Grava a figura em 'arquivo' (se houver) e/ou mostra a janela."""
+    if arquivo:
+        fig.savefig(arquivo, dpi=DPI, bbox_inches="tight")
+        print(f"Gráfico salvo em {arquivo}")
+    if mostrar:
+        plt.show()
+    plt.close(fig)
+    return arquivo
+
+
+def grafico_execucoes_tsp(melhores_resultados, populacao_tamanho, geracoes,
+                          numero_execucoes, arquivo=None, mostrar=None):
+    """
+    Convergência (melhor distância por execução, com tendência linear) e
+    boxplot da distribuição final das execuções do AG do TSP.
+
+    Args:
+        melhores_resultados: melhor distância de cada execução
+        populacao_tamanho: tamanho da população (legenda)
+        geracoes: gerações por execução (legenda)
+        numero_execucoes: quantidade de execuções (legenda)
+        arquivo: caminho da imagem a gravar (opcional)
+        mostrar: abrir a janela (padrão: só quando há tela e não há 'arquivo')
+
+    Returns:
+        caminho da imagem gravada, ou None se ela só foi mostrada
+    """
+    if mostrar is None:
+        mostrar = not arquivo and not sem_tela()
+    if not mostrar and not arquivo:
+        arquivo = ARQUIVO_GRAFICO_TSP
+
+    plt = _pyplot(mostrar)
+    from matplotlib import gridspec
+    import matplotlib.patheffects as pe
+    import numpy as np
+    import seaborn as sns
+
+    # =============================================================
+    # CONFIGURAÇÃO DE ESTILO
+    # =============================================================
+    sns.set_theme(style="whitegrid", context="notebook", palette="crest")
+
+    plt.rcParams.update({
+        "figure.figsize": (10, 9),
+        "axes.titlesize": 18,
+        "axes.titleweight": 'bold',
+        "axes.labelsize": 14,
+        "xtick.labelsize": 12,
+        "ytick.labelsize": 12,
+        "axes.edgecolor": "#444",
+        "axes.linewidth": 1.2
+    })
+
+    # =============================================================
+    # DADOS
+    # =============================================================
+    execucoes = np.arange(1, len(melhores_resultados) + 1)
+    fit= np.array(melhores_resultados)
+
+    # =============================================================
+    # SUBPLOTS: 2 GRÁFICOS (CONVERGÊNCIA + BOXPLOT)
+    # =============================================================
+    # fig, (ax1, ax2) = plt.subplots(2, 1, sharex=False, height_ratios=[3, 1.2], figsize=(10, 10))
+    # fig.subplots_adjust(hspace=0.45)
+
+    fig = plt.figure(constrained_layout=False, figsize=(10, 9))
+    gs = gridspec.GridSpec(
+        2, 1,             # 2 linhas, 1 coluna
+        height_ratios=[3, 1.2],  # proporção entre os gráficos
+        hspace=0.5        # espaço vertical entre eles
+    )
+    # Cria os eixos com base no grid
+    ax1 = fig.add_subplot(gs[0, 0])  # gráfico de convergência
+    ax2 = fig.add_subplot(gs[1, 0])  # gráfico boxplot
+
+
+    # -------------------------------------------------------------
+    # 1️⃣ GRÁFICO DE CONVERGÊNCIA
+    # -------------------------------------------------------------
+    ax1.plot(
+        execucoes,
+        fit,
+        color=sns.color_palette("crest")[4],
+        linewidth=2.5,
+        label="Melhor fitness por execução",
+        path_effects=[pe.SimpleLineShadow(alpha=0.4), pe.Normal()]
+    )
+
+    ax1.scatter(
+        execucoes,
+        fit,
+        color=sns.color_palette("flare", 10)[5],
+        s=70,
+        zorder=3,
+        label="Execuções individuais"
+    )
+
+    # Tendência linear
+    z = np.polyfit(execucoes, fit, 1)
+    trend = np.poly1d(z)
+    ax1.plot(
+        execucoes,
+        trend(execucoes),
+        color="#E76F51",
+        linestyle="--",
+        linewidth=1.8,
+        label="Tendência linear"
+    )
+
+    ax1.set_title("Convergência do Algoritmo Genético", fontweight='bold', pad=15)
+    ax1.set_ylabel("Melhor distância (milhas)")
+    ax1.set_xlabel("Execução")
+    ax1.legend(frameon=True, loc="best", fancybox=True)
+    ax1.grid(True, linestyle="--", alpha=0.5)
+
+    for spine in ["top", "right"]:
+        ax1.spines[spine].set_visible(False)
+
+
+    ax1.text(
+        0.02, -0.12,
+        f"População: {populacao_tamanho} | Gerações: {geracoes} | Execuções: {numero_execucoes}",
+        transform=ax1.transAxes,
+        fontsize=10,
+        color="#555555"
+    )
+    # -------------------------------------------------------------
+    # 2️⃣ BOXPLOT DA DISTRIBUIÇÃO FINAL
+    # -------------------------------------------------------------
+    sns.boxplot(
+        y=fit,
+        width=0.3,
+        color=sns.color_palette("crest")[4],
+        boxprops={"alpha": 0.8, "linewidth": 1.2},
+        medianprops={"color": "#E76F51", "linewidth": 2},
+        whiskerprops={"linewidth": 1.2},
+        capprops={"linewidth": 1.2},
+        flierprops={"marker": "o", "color": "#243FD8", "alpha": 0.8, "markersize": 7},
+        ax=ax2
+    )
+
+
+    sns.stripplot(
+        y=fit,
+        color=sns.color_palette("flare", 10)[5],
+        alpha=0.7,
+        jitter=0.18,     # espalhamento horizontal
+        size=6,
+        zorder=3,
+        ax=ax2
+    )
+
+
+    ax2.set_title("Distribuição dos Melhores Fitness", pad=10)
+    ax2.set_ylabel("Distância (milhas)")
+    ax2.set_xticks([])
+
+    # Estatísticas
+    media = np.mean(fit)
+    mediana = np.median(fit)
+    desvio = np.std(fit)
+
+    ax2.text(
+        0.05, 0.95,
+        f"Média: {media:.2f}\nMediana: {mediana:.2f}\nDesvio: {desvio:.2f}",
+        transform=ax2.transAxes,
+        fontsize=10,
+        color="#333333",
+        verticalalignment="top",
+        bbox=dict(facecolor="white", alpha=0.8, edgecolor="#AAAAAA")
+    )
+
+    for spine in ["top", "right"]:
+        ax2.spines[spine].set_visible(False)
+
+    # =============================================================
+    # LAYOUT FINAL
+    # =============================================================
+    fig.suptitle("Análise de Desempenho do Algoritmo Genético (TSP)", fontsize=20, y=2.02)
+    fig.tight_layout()
+
+    return _finalizar(plt, fig, arquivo, mostrar)
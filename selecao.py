@@ -0,0 +1,152 @@
+import numpy as np
+
+# ==============================================================================
+# SELEÇÃO POR TORNEIO EM LOTE, ELITISMO E MELHOR ATÉ AGORA
+# ==============================================================================
+# Em vez de montar a lista de competidores a cada pai sorteado, todos os
+# torneios de uma geração são sorteados de uma vez: uma matriz de índices
+# (pais x tamanho_torneio) vinda de 'np.random' e um argmax/argmin sobre o
+# array de fitness escolhem o vencedor de cada linha. O custo da geração cai
+# de O(pais x população) para O(pais x tamanho_torneio), sem laço em Python.
+# Os competidores de um torneio são sorteados com reposição (o mesmo
+# indivíduo pode aparecer duas vezes na linha), o que só faz diferença
+# quando o torneio é grande em relação à população.
+#
+# O elitismo só precisa dos k melhores: 'melhores_indices' usa np.argpartition
+# (O(P)) e ordena apenas esses k, em vez de ordenar a população inteira a cada
+# geração. 'MelhorAteAgora' guarda o melhor indivíduo já visto na execução,
+# atualizado por um único argmax/argmin sobre o fitness de cada geração.
+#
+# No modelo estacionário (steady-state) poucos filhos entram por passo,
+# sobrescrevendo indivíduos da população no lugar: 'indices_substituicao'
+# escolhe quem sai, pela política configurada (POLITICAS_SUBSTITUICAO):
+#   - "pior": os piores da população;
+#   - "torneio": o perdedor de um torneio reverso para cada filho.
+# A elite (os 'protegidos' melhores) nunca é substituída.
+
+POLITICAS_SUBSTITUICAO = ("pior", "torneio")
+
+
+def torneios(fitness, numero_pais, tamanho_torneio, maximizar=True):
+    """
+    Sorteia os torneios de uma geração inteira.
+
+    Args:
+        fitness: array (ou sequência) com o fitness de cada indivíduo
+        numero_pais: quantidade de torneios (um vencedor por torneio)
+        tamanho_torneio: competidores por torneio
+        maximizar: True se fitness maior é melhor
+
+    Returns:
+        np.ndarray: índice, na população, do vencedor de cada torneio
+    """
+    fitness = np.asarray(fitness)
+    competidores = np.random.randint(0, len(fitness), size=(numero_pais, tamanho_torneio))
+    valores = fitness[competidores]
+    vencedores = valores.argmax(axis=1) if maximizar else valores.argmin(axis=1)
+    return np.take_along_axis(competidores, vencedores[:, None], axis=1)[:, 0]
+
+
+def melhores_indices(fitness, quantidade, maximizar=True):
+    """
+    Índices dos 'quantidade' melhores indivíduos, do melhor para o pior.
+
+    Args:
+        fitness: array (ou sequência) com o fitness de cada indivíduo
+        quantidade: quantos índices devolver (ex.: o tamanho da elite)
+        maximizar: True se fitness maior é melhor
+
+    Returns:
+        np.ndarray: índices na população; empates ficam na ordem original,
+        como em uma ordenação estável
+    """
+    fitness = np.asarray(fitness)
+    quantidade = min(quantidade, len(fitness))
+    if quantidade <= 0:
+        return np.empty(0, dtype=np.intp)
+    chave = -fitness if maximizar else fitness
+    if quantidade < len(chave):
+        candidatos = np.argpartition(chave, quantidade - 1)[:quantidade]
+    else:
+        candidatos = np.arange(len(chave))
+    return candidatos[np.lexsort((candidatos, chave[candidatos]))]
+
+
+class MelhorAteAgora:
+    def __init__(self, maximizar=True, fitness=None, individuo=None):
+        """
+        Inicializa o registro do melhor indivíduo da execução
+
+        Args:
+            maximizar: True se fitness maior é melhor
+            fitness: valor a ser superado (None = qualquer um)
+            individuo: indivíduo correspondente a 'fitness'
+        """
+        self.maximizar = maximizar
+        self.fitness = fitness
+        self.individuo = individuo
+        self.indice = None
+
+    def atualizar(self, fitness, populacao):
+        """
+        Compara o melhor da geração com o melhor até agora.
+
+        Args:
+            fitness: array com o fitness de cada indivíduo da geração
+            populacao: indivíduos da geração, na mesma ordem
+
+        Returns:
+            bool: True se o melhor até agora mudou ('indice' aponta para ele
+            na população da geração)
+        """
+        indice = int(np.argmax(fitness) if self.maximizar else np.argmin(fitness))
+        valor = fitness[indice].item()
+        if self.fitness is not None and (
+            valor <= self.fitness if self.maximizar else valor >= self.fitness
+        ):
+            return False
+        self.fitness, self.individuo, self.indice = valor, populacao[indice], indice
+        return True
+
+
+def indices_substituicao(fitness, quantidade, politica="pior", tamanho_torneio=2,
+                         protegidos=0, maximizar=True):
+    """
+    Posições da população que recebem os filhos de um passo estacionário.
+
+    Args:
+        fitness: array com o fitness de cada indivíduo
+        quantidade: filhos a inserir
+        politica: "pior" ou "torneio" (ver POLITICAS_SUBSTITUICAO)
+        tamanho_torneio: competidores de cada torneio reverso
+        protegidos: quantos dos melhores nunca são substituídos (a elite)
+        maximizar: True se fitness maior é melhor
+
+    Returns:
+        np.ndarray: posições distintas; no torneio podem ser menos que
+        'quantidade' quando só a elite foi sorteada (o filho é descartado)
+    """
+    fitness = np.asarray(fitness)
+    if politica == "pior":
+        return melhores_indices(fitness, quantidade, maximizar=not maximizar)
+    if politica != "torneio":
+        raise ValueError(
+            f"Política de substituição desconhecida: {politica}. Use uma de {POLITICAS_SUBSTITUICAO}."
+        )
+
+    # Quanto maior a chave, pior o indivíduo; protegidos e já escolhidos saem da disputa
+    chave = (-fitness if maximizar else fitness).astype(np.float64)
+    chave[melhores_indices(fitness, protegidos, maximizar)] = -np.inf
+    competidores = np.random.randint(0, len(fitness), size=(quantidade, tamanho_torneio))
+    valores = chave[competidores]
+    alvos = competidores[np.arange(quantidade), valores.argmax(axis=1)]
+    if np.isfinite(valores.max(axis=1)).all() and len(np.unique(alvos)) == len(alvos):
+        return alvos  # caso comum: perdedores distintos, nenhum da elite
+    alvos = []
+    for linha in competidores:
+        alvo = int(linha[np.argmax(chave[linha])])
+        if chave[alvo] == -np.inf:
+            continue
+        chave[alvo] = -np.inf
+        alvos.append(alvo)
+    return np.array(alvos, dtype=np.intp)
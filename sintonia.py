@@ -0,0 +1,253 @@
+import math
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from execucao_paralela import NUMERO_WORKERS, executar_tarefas, gerar_sementes
+
+# ==============================================================================
+# SINTONIA DE PARÂMETROS (SUCCESSIVE HALVING / RACING)
+# ==============================================================================
+# Em vez de pagar NUMERO_EXECUCOES execuções completas por configuração, as
+# configurações candidatas correm em rodadas:
+#   - na rodada r, cada sobrevivente acumula EXECUCOES_INICIAIS * ETA^r
+#     execuções (as já feitas são reaproveitadas);
+#   - todas usam as mesmas sementes (números aleatórios comuns), então as
+#     médias parciais são comparáveis entre si;
+#   - só a melhor fração 1/ETA (pela média parcial) segue para a próxima.
+# As execuções de todas as candidatas de uma rodada vão juntas para um único
+# pool de processos. No fim sai uma tabela ordenada e a configuração vencedora.
+
+NUMERO_CANDIDATOS = 16
+ETA = 2                  # a cada rodada sobrevive 1/ETA das candidatas
+EXECUCOES_INICIAIS = 2   # execuções por candidata na primeira rodada
+MAXIMO_EXECUCOES = 30    # execuções da candidata que chega à última rodada
+
+# Valores testados por parâmetro de cada ConfiguracaoAG
+ESPACO_TSP = {
+    "populacao_tamanho": (30, 50, 100),
+    "tamanho_torneio": (2, 3, 5),
+    "taxa_crossover": (0.6, 0.8, 0.9, 1.0),
+    "taxa_mutacao": (0.01, 0.05, 0.1, 0.2),
+    "elitismo": (1, 2, 5),
+}
+ESPACO_KNAPSACK = {
+    "tamanho_populacao": (30, 50, 100),
+    "tamanho_torneio": (2, 3, 5),
+    "taxa_crossover": (0.6, 0.8, 0.9, 1.0),
+    "taxa_mutacao": (0.005, 0.01, 0.02, 0.05, 0.1),
+    "qtd_elitismo": (1, 2, 5),
+}
+
+
+def _execucao_tsp(configuracao, instancia):
+    """Uma execução do AG do TSP (distância da melhor rota)."""
+    from a_genetico_tsp_atv_06 import AlgoritmoGeneticoTSP
+
+    return AlgoritmoGeneticoTSP(configuracao, instancia).executar()["fitness"]
+
+
+def _execucao_knapsack(configuracao, nome_crossover):
+    """Uma execução do AG da mochila (ganho do melhor indivíduo)."""
+    import a_genetico_knapsack_ativ04 as ag_knapsack
+
+    motor = ag_knapsack.AlgoritmoGeneticoKnapsack(configuracao)
+    return motor.executar(getattr(ag_knapsack, nome_crossover))[0][0]
+
+
+def amostrar_candidatos(espaco, numero_candidatos, fixos=None, semente=None):
+    """
+    Sorteia combinações distintas de valores do espaço de busca.
+
+    Args:
+        espaco: {parametro: valores possíveis}
+        numero_candidatos: quantidade desejada (limitada ao tamanho do espaço)
+        fixos: parâmetros com valor fixo em todas as candidatas
+        semente: semente do sorteio
+
+    Returns:
+        list: dicionários de parâmetros
+    """
+    rng = random.Random(semente)
+    nomes = sorted(espaco)
+    total = math.prod(len(espaco[nome]) for nome in nomes)
+    numero_candidatos = min(numero_candidatos, total)
+
+    vistos, candidatos = set(), []
+    while len(candidatos) < numero_candidatos:
+        valores = tuple(rng.choice(espaco[nome]) for nome in nomes)
+        if valores in vistos:
+            continue
+        vistos.add(valores)
+        candidatos.append({**dict(zip(nomes, valores)), **(fixos or {})})
+    return candidatos
+
+
+def _rodadas(numero_candidatos, eta, execucoes_iniciais, maximo_execucoes):
+    """Execuções acumuladas por candidata em cada rodada."""
+    rodadas, execucoes, restantes = [], execucoes_iniciais, numero_candidatos
+    while True:
+        execucoes = min(execucoes, maximo_execucoes)
+        rodadas.append(execucoes)
+        if restantes <= 1 or execucoes >= maximo_execucoes:
+            return rodadas
+        restantes = math.ceil(restantes / eta)
+        execucoes *= eta
+
+
+def successive_halving(funcao, candidatos, criar_configuracao, args=(), maximizar=False,
+                       eta=ETA, execucoes_iniciais=EXECUCOES_INICIAIS,
+                       maximo_execucoes=MAXIMO_EXECUCOES, num_workers=None,
+                       semente=None, verbose=True):
+    """
+    Corrida das candidatas por successive halving.
+
+    Args:
+        funcao: execução do AG, chamada como funcao(configuracao, *args) e
+            devolvendo o fitness final (definida no nível do módulo)
+        candidatos: dicionários de parâmetros (ver amostrar_candidatos)
+        criar_configuracao: parâmetros -> ConfiguracaoAG
+        args: argumentos extras de 'funcao' (ex.: a instância)
+        maximizar: True se fitness maior é melhor
+        eta: fator de eliminação (sobrevive 1/eta por rodada)
+        execucoes_iniciais: execuções por candidata na primeira rodada
+        maximo_execucoes: teto de execuções por candidata
+        num_workers: processos do pool (1 = serial)
+        semente: semente base (as mesmas sementes para todas as candidatas)
+        verbose: imprime o andamento de cada rodada
+
+    Returns:
+        list: uma entrada por candidata, da melhor para a pior, com
+        "parametros", "resultados", "media", "desvio" e "rodada" (a última
+        rodada que ela disputou)
+    """
+    configuracoes = [criar_configuracao(parametros) for parametros in candidatos]
+    rodadas = _rodadas(len(candidatos), eta, execucoes_iniciais, maximo_execucoes)
+    sementes = gerar_sementes(rodadas[-1], semente)
+    entradas = [
+        {"parametros": parametros, "resultados": [], "rodada": 0}
+        for parametros in candidatos
+    ]
+
+    def chave(entrada):
+        media = statistics.fmean(entrada["resultados"])
+        return -media if maximizar else media
+
+    if num_workers is None:
+        num_workers = NUMERO_WORKERS or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+
+    try:
+        vivas = list(range(len(candidatos)))
+        for rodada, execucoes in enumerate(rodadas, start=1):
+            # Só as execuções que faltam: as das rodadas anteriores são mantidas
+            tarefas, donos = [], []
+            for indice in vivas:
+                for execucao in range(len(entradas[indice]["resultados"]), execucoes):
+                    tarefas.append((funcao, (configuracoes[indice], *args), sementes[execucao],
+                                    execucao + 1))
+                    donos.append(indice)
+            for indice, resultado in zip(donos, executar_tarefas(tarefas, executor)):
+                entradas[indice]["resultados"].append(resultado)
+
+            for indice in vivas:
+                entradas[indice]["rodada"] = rodada
+            vivas.sort(key=lambda indice: chave(entradas[indice]))
+            if verbose:
+                melhor = entradas[vivas[0]]
+                print(
+                    f"Rodada {rodada}: {len(vivas)} candidatas x {execucoes} execuções "
+                    f"({len(tarefas)} novas) | melhor média {statistics.fmean(melhor['resultados']):.2f}"
+                )
+            if rodada < len(rodadas):
+                vivas = vivas[:max(1, math.ceil(len(vivas) / eta))]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    for entrada in entradas:
+        entrada["media"] = statistics.fmean(entrada["resultados"])
+        entrada["desvio"] = (
+            statistics.stdev(entrada["resultados"]) if len(entrada["resultados"]) > 1 else 0.0
+        )
+    # Quem foi mais longe vem antes; na mesma rodada, a melhor média
+    entradas.sort(key=lambda entrada: (-entrada["rodada"], chave(entrada)))
+    return entradas
+
+
+def tabela_ranking(entradas):
+    """Texto da tabela ordenada (posição, rodada, execuções, média, desvio, parâmetros)."""
+    nomes = sorted(entradas[0]["parametros"]) if entradas else []
+    cabecalho = f"{'#':>3} {'rodada':>6} {'execuções':>9} {'média':>12} {'desvio':>10}  " + " ".join(
+        f"{nome:>18}" for nome in nomes
+    )
+    linhas = [cabecalho, "-" * len(cabecalho)]
+    for posicao, entrada in enumerate(entradas, start=1):
+        linhas.append(
+            f"{posicao:>3} {entrada['rodada']:>6} {len(entrada['resultados']):>9} "
+            f"{entrada['media']:>12.2f} {entrada['desvio']:>10.2f}  "
+            + " ".join(f"{str(entrada['parametros'][nome]):>18}" for nome in nomes)
+        )
+    return "\n".join(linhas)
+
+
+def sintonizar(problema="tsp", numero_candidatos=NUMERO_CANDIDATOS, eta=ETA,
+               execucoes_iniciais=EXECUCOES_INICIAIS, maximo_execucoes=MAXIMO_EXECUCOES,
+               num_workers=None, semente=None, fixos=None, instancia=None,
+               crossover="crossover_uniforme", verbose=True):
+    """
+    Sintoniza os parâmetros do AG do TSP ou da mochila.
+
+    Args:
+        problema: "tsp" ou "knapsack"
+        numero_candidatos: configurações sorteadas do espaço de busca
+        eta, execucoes_iniciais, maximo_execucoes: ver successive_halving
+        num_workers: processos do pool
+        semente: semente do sorteio das candidatas e das execuções
+        fixos: parâmetros fixos em todas as candidatas (ex.: {"geracoes": 100})
+        instancia: InstanciaTSP (padrão: a do AG do TSP)
+        crossover: nome do operador do AG da mochila
+        verbose: imprime o andamento e a tabela final
+
+    Returns:
+        tuple: (ConfiguracaoAG vencedora, entradas ordenadas)
+    """
+    if problema == "tsp":
+        import a_genetico_tsp_atv_06 as modulo
+
+        espaco, funcao, maximizar = ESPACO_TSP, _execucao_tsp, False
+        args = (instancia if instancia is not None else modulo.INSTANCIA,)
+    elif problema == "knapsack":
+        import a_genetico_knapsack_ativ04 as modulo
+
+        espaco, funcao, maximizar = ESPACO_KNAPSACK, _execucao_knapsack, True
+        args = (crossover,)
+    else:
+        raise ValueError(f"Problema desconhecido: {problema}. Use 'tsp' ou 'knapsack'.")
+
+    # Parâmetros fixos saem do espaço de busca
+    espaco = {nome: valores for nome, valores in espaco.items() if nome not in (fixos or {})}
+    candidatos = amostrar_candidatos(espaco, numero_candidatos, fixos, semente)
+    # Combinações inválidas (ex.: elitismo >= população) não entram na corrida
+    validos = []
+    for parametros in candidatos:
+        try:
+            modulo.ConfiguracaoAG(**parametros)
+        except ValueError:
+            continue
+        validos.append(parametros)
+
+    entradas = successive_halving(
+        funcao, validos, lambda parametros: modulo.ConfiguracaoAG(**parametros), args,
+        maximizar=maximizar, eta=eta, execucoes_iniciais=execucoes_iniciais,
+        maximo_execucoes=maximo_execucoes, num_workers=num_workers, semente=semente,
+        verbose=verbose,
+    )
+    vencedora = modulo.ConfiguracaoAG(**entradas[0]["parametros"])
+
+    if verbose:
+        print()
+        print(tabela_ranking(entradas))
+        print(f"\nConfiguração vencedora: {vencedora}")
+    return vencedora, entradas
@@ -2,38 +2,61 @@ import copy
 import random
 import statistics
 
-def gerar_vizinhos_knapsack(solucao, n_vizinhos=10):
+import numpy as np
+
+def gerar_movimentos_knapsack(solucao, n_vizinhos=10):
     """
-    Gera vizinhos para o problema knapsack
-    Estratégia: flip de um bit aleatório
+    Sorteia os movimentos (posições de flip) que definem os vizinhos,
+    sem copiar a solução
 
     Args:
         solucao: solução binária atual
-        n_vizinhos: número de vizinhos
+        n_vizinhos: número de sorteios
 
     Returns:
-        list: lista de vizinhos
+        list: posições distintas a serem invertidas
     """
-    vizinhos = []
     n_itens = len(solucao)
 
-    # Gerar vizinhos por flip de bit
     sorted_pos = []
+    vistos = set()
     for i in range(n_vizinhos):
         # Escolher posição aleatória para flip
         pos = random.randint(0, n_itens - 1)
-        if pos in sorted_pos:
+        if pos in vistos:
             continue
 
+        vistos.add(pos)
+        sorted_pos.append(pos)
+
+    return sorted_pos
+
+
+def gerar_vizinhos_knapsack(solucao, n_vizinhos=10):
+    """
+    Gera vizinhos para o problema knapsack
+    Estratégia: flip de um bit aleatório
+
+    Args:
+        solucao: solução binária atual
+        n_vizinhos: número de vizinhos
+
+    Returns:
+        list: lista de vizinhos
+    """
+    vizinhos = []
+
+    # Gerar vizinhos por flip de bit
+    for pos in gerar_movimentos_knapsack(solucao, n_vizinhos):
         vizinho = solucao.copy()
         vizinho[pos] = 1 - vizinho[pos]  # Flip do bit
         vizinhos.append(vizinho)
-        sorted_pos.append(pos)
 
     return vizinhos
 
 class HillClimbing:
-    def __init__(self, funcao_fitness, gerar_vizinhos, maximizar=True):
+    def __init__(self, funcao_fitness, gerar_vizinhos, maximizar=True,
+                 avaliacao_delta=None):
         """
         Inicializa o algoritmo Hill Climbing
 
@@ -41,13 +64,20 @@ class HillClimbing:
             funcao_fitness: função que avalia soluções
             gerar_vizinhos: função que gera vizinhos de uma solução
             maximizar: True para maximização, False para minimização
+            avaliacao_delta: avaliador incremental opcional (ex.:
+                AvaliacaoDeltaKnapsack). Quando informado, 'gerar_vizinhos'
+                deve devolver movimentos (ex.: gerar_movimentos_knapsack) e
+                cada vizinho é avaliado pelo delta, sem ser construído
         """
         self.funcao_fitness = funcao_fitness
         self.gerar_vizinhos = gerar_vizinhos
         self.maximizar = maximizar
+        self.avaliacao_delta = avaliacao_delta
         self.historico = []
+        self.motivo_parada = None
 
-    def executar(self, solucao_inicial, max_iteracoes=1000, verbose=False):
+    def executar(self, solucao_inicial, max_iteracoes=1000, verbose=False,
+                 criterio=None, telemetria=None, guardar_historico=True, checkpoint=None):
         """
         Executa o algoritmo Hill Climbing
 
@@ -55,16 +85,57 @@ class HillClimbing:
             solucao_inicial: solução inicial
             max_iteracoes: número máximo de iterações
             verbose: imprimir progresso
+            criterio: critério de parada adicional (criterios_parada);
+                o motivo da parada fica em 'self.motivo_parada'
+            telemetria: telemetria.Telemetria que recebe o fitness de cada
+                iteração amostrada
+            guardar_historico: False para não manter o histórico em memória
+                (útil com telemetria em execuções longas)
+            checkpoint: checkpoint.Checkpoint que grava o estado a cada
+                'intervalo' iterações e permite retomar a execução
 
         Returns:
             tuple: (melhor_solucao, melhor_fitness, historico)
         """
-        solucao_atual = copy.deepcopy(solucao_inicial)
-        fitness_atual = self.funcao_fitness(solucao_atual)
-
-        self.historico = [fitness_atual]
-        iteracao = 0
-        melhorias = 0
+        estado = checkpoint.carregar() if checkpoint is not None else None
+        if estado is not None and estado["concluida"]:
+            self.historico = estado["historico"].tolist()
+            self.motivo_parada = str(estado["motivo_parada"])
+            if criterio is not None:
+                criterio.iniciar(self.maximizar)
+                criterio.registrar(self.motivo_parada, int(estado["iteracao"]))
+            return estado["solucao"].tolist(), estado["fitness"].item(), self.historico
+
+        delta = self.avaliacao_delta
+        if estado is not None:
+            from checkpoint import restaurar_rng
+
+            # Continua da última iteração gravada
+            solucao_atual = estado["solucao"].tolist()
+            fitness_atual = estado["fitness"].item()
+            if delta is not None:
+                delta.iniciar(solucao_atual)
+            self.historico = estado["historico"].tolist()
+            iteracao, melhorias, avaliacoes = (int(valor) for valor in estado["contadores"])
+            restaurar_rng(estado)
+        else:
+            solucao_atual = copy.deepcopy(solucao_inicial)
+            if delta is not None:
+                fitness_atual = delta.iniciar(solucao_atual)
+            else:
+                fitness_atual = self.funcao_fitness(solucao_atual)
+
+            self.historico = [fitness_atual] if guardar_historico else []
+            iteracao = 0
+            melhorias = 0
+            avaliacoes = 1
+        self.motivo_parada = f"máximo de iterações ({max_iteracoes})"
+        if criterio is not None:
+            criterio.iniciar(self.maximizar)
+        if telemetria is not None:
+            telemetria.iniciar_execucao()
+            if estado is None:
+                telemetria.registrar(iteracao, fitness_atual)
 
         if verbose:
             print(f"Iteração {iteracao}: Fitness = {fitness_atual:.4f}")
@@ -74,13 +145,18 @@ class HillClimbing:
 
             # Gerar vizinhos
             vizinhos = self.gerar_vizinhos(solucao_atual)
+            avaliacoes += len(vizinhos)
 
             # Avaliar vizinhos e encontrar o melhor
             melhor_vizinho = None
             melhor_fitness_vizinho = fitness_atual
             melhores_vizinhos = []
             for vizinho in vizinhos:
-                fitness_vizinho = self.funcao_fitness(vizinho)
+                if delta is not None:
+                    # 'vizinho' é o movimento reportado pelo gerador
+                    fitness_vizinho = delta.avaliar(solucao_atual, vizinho)
+                else:
+                    fitness_vizinho = self.funcao_fitness(vizinho)
 
                 # Verificar se é melhor
                 eh_melhor = (
@@ -99,71 +175,158 @@ class HillClimbing:
             #     solucao_atual = copy.deepcopy(melhor_vizinho)
             #     fitness_atual = melhor_fitness_vizinho
             if melhores_vizinhos:
-                solucao_atual, fitness_atual = random.choice(melhores_vizinhos)
+                vizinho_escolhido, fitness_atual = random.choice(melhores_vizinhos)
+                if delta is not None:
+                    solucao_atual = delta.aplicar(solucao_atual, vizinho_escolhido)
+                else:
+                    solucao_atual = vizinho_escolhido
                 melhorias += 1
 
                 if verbose:
                     print(f"Iteração {iteracao}: Fitness = {fitness_atual:.4f}")
             else:
                 # Nenhum vizinho melhor encontrado - parar
+                self.motivo_parada = "convergiu (nenhum vizinho melhor)"
                 if verbose:
                     print(f"Convergiu na iteração {iteracao}")
                 break
 
-            self.historico.append(fitness_atual)
+            if guardar_historico:
+                self.historico.append(fitness_atual)
+            if telemetria is not None:
+                telemetria.registrar(iteracao, fitness_atual)
+            if checkpoint is not None and checkpoint.deve_salvar(iteracao):
+                checkpoint.salvar(
+                    solucao=np.array(solucao_atual), fitness=np.array(fitness_atual),
+                    historico=np.array(self.historico),
+                    contadores=np.array([iteracao, melhorias, avaliacoes]),
+                )
+
+            if criterio is not None and criterio.parar(iteracao, fitness_atual, avaliacoes):
+                self.motivo_parada = criterio.motivo
+                if verbose:
+                    print(f"Parou na iteração {iteracao}: {criterio.motivo}")
+                break
+
+        if criterio is not None:
+            criterio.registrar(self.motivo_parada, iteracao, avaliacoes)
+        if telemetria is not None:
+            telemetria.descarregar()
+        if checkpoint is not None:
+            checkpoint.concluir(
+                solucao=np.array(solucao_atual), fitness=np.array(fitness_atual),
+                historico=np.array(self.historico), iteracao=np.array(iteracao),
+                motivo_parada=np.array(self.motivo_parada),
+            )
 
         if verbose:
             print(f"Melhorias realizadas: {melhorias}")
             print(f"Fitness final: {fitness_atual:.4f}")
+            print(f"Motivo da parada: {self.motivo_parada}")
 
         return solucao_atual, fitness_atual, self.historico
 
-if __name__ == "__main__":
-    import sys
-    from knapsack_20dim import knapsack
-    import random
-
-    # Configuração do problema knapsack
-    DIM = 20
-    MAX_ITERACOES = 200
-
-    melhores_fitness = []
-    count = 0
-    for i in range(30):
-        # Gerar solução inicial aleatória
-        solucao_inicial = [int(random.random() > 0.8) for _ in range(DIM)]
-
-        # Inicializar e executar Hill Climbing
-        hill_climbing = HillClimbing(    
-            funcao_fitness=lambda sol: knapsack(sol, dim=DIM)[0],  # Maximizar valor total
-            gerar_vizinhos=gerar_vizinhos_knapsack,
-            maximizar=True,
-        )
-
-        melhor_solucao, melhor_fitness, historico = hill_climbing.executar(
-            solucao_inicial, max_iteracoes=MAX_ITERACOES, verbose=True
-        )
-
-        print("\n=== RESULTADOS FINAIS ===")
-        print(f"Solução inicial: {solucao_inicial}")
-        print(f"Melhor solução: {melhor_solucao}")
-        print(f"Melhor valor total: {melhor_fitness}")
-        peso_total = knapsack(melhor_solucao, dim=DIM)[1]
-        print(f"Peso total da melhor solução: {peso_total}")
+def executar_knapsack(dim, max_iteracoes, instancia=None, criterio=None, telemetria=None,
+                      checkpoint=None):
+    """
+    Uma execução independente do Hill Climbing no knapsack
+    (roda em um processo do pool de execucao_paralela)
+
+    Args:
+        dim: número de itens da instância clássica (10 ou 20)
+        max_iteracoes: número máximo de iterações
+        instancia: InstanciaKnapsack a usar no lugar da instância clássica
+        criterio: critério de parada adicional (criterios_parada)
+        telemetria: telemetria.Telemetria; com ela o histórico vai para o
+            arquivo em vez de ficar em memória
+        checkpoint: checkpoint.Checkpoint da execução (ver HillClimbing.executar)
 
+    Returns:
+        melhor fitness encontrado
+    """
+    from knapsack_20dim import knapsack, AvaliacaoDeltaKnapsack
+    from instancias_knapsack import instancia_classica
+
+    if instancia is None:
+        instancia = instancia_classica(dim)
+    dim = instancia.dimensao
+
+    # Gerar solução inicial aleatória
+    solucao_inicial = [int(random.random() > 0.8) for _ in range(dim)]
+
+    # Inicializar e executar Hill Climbing
+    hill_climbing = HillClimbing(    
+        funcao_fitness=lambda sol: knapsack(sol, instancia=instancia)[0],  # Maximizar valor total
+        gerar_vizinhos=gerar_movimentos_knapsack,
+        maximizar=True,
+        avaliacao_delta=AvaliacaoDeltaKnapsack(instancia=instancia),  # Avalia cada flip em O(1)
+    )
+
+    melhor_solucao, melhor_fitness, historico = hill_climbing.executar(
+        solucao_inicial, max_iteracoes=max_iteracoes, verbose=True, criterio=criterio,
+        telemetria=telemetria, guardar_historico=telemetria is None, checkpoint=checkpoint,
+    )
+
+    print("\n=== RESULTADOS FINAIS ===")
+    print(f"Solução inicial: {solucao_inicial}")
+    print(f"Melhor solução: {melhor_solucao}")
+    print(f"Melhor valor total: {melhor_fitness}")
+    peso_total = knapsack(melhor_solucao, instancia=instancia)[1]
+    print(f"Peso total da melhor solução: {peso_total}")
+
+    if telemetria is None:
         print("\nHistórico de fitness ao longo das iterações:")
         print(historico)
-        
-        melhores_fitness.append(melhor_fitness)
-        count += melhor_fitness
 
-    media = count/30
+    return melhor_fitness
+
+DIM = 20
+MAX_ITERACOES = 200
+NUMERO_EXECUCOES = 30
+
+def main(dim=DIM, max_iteracoes=MAX_ITERACOES, num_workers=None, semente=None,
+         criterio=None, telemetria=None, checkpoint=None):
+    """
+    Executa NUMERO_EXECUCOES repetições independentes no knapsack e imprime
+    as estatísticas e o gap até o ótimo exato.
+    Com 'checkpoint' (checkpoint.Checkpoint), cada execução grava o seu
+    estado e, com 'retomar', continua de onde parou.
+    """
+    from execucao_paralela import executar_repeticoes
+    from instancias_knapsack import instancia_classica
+    from knapsack_exato import gap_otimalidade, resolver_knapsack
+
+    if telemetria is not None:
+        telemetria.criar_arquivo(manter_existente=checkpoint is not None and checkpoint.retomar)
+    if checkpoint is not None:
+        semente = checkpoint.semente_sessao(semente)
+
+    # As execuções são independentes: distribui entre processos
+    melhores_fitness = executar_repeticoes(
+        executar_knapsack, NUMERO_EXECUCOES,
+        (dim, max_iteracoes, None, criterio, telemetria, checkpoint),
+        num_workers=num_workers, semente=semente,
+    )
+    count = sum(melhores_fitness)
+
+    media = count/NUMERO_EXECUCOES
     media_statistics = statistics.mean(melhores_fitness)
     desvio_padrao = statistics.stdev(melhores_fitness)
 
 
-    print("\nOs 30 melhores fitness para o hill climbing Estocástico foram:")
+    print(f"\nOs {NUMERO_EXECUCOES} melhores fitness para o hill climbing Estocástico foram:")
     print(melhores_fitness)
     print(f"\nMédia:{media:.2f}")
     print(f"media statistics {media_statistics:.2f}")
-    print(f"Desvio Padrão:{desvio_padrao:.2f}")
\ No newline at end of file
+    print(f"Desvio Padrão:{desvio_padrao:.2f}")
+
+    # Distância de cada execução até o ótimo exato da instância
+    instancia = instancia_classica(dim)
+    otimo = resolver_knapsack(instancia.ganhos, instancia.pesos, instancia.capacidade)["valor"]
+    gaps = [gap_otimalidade(fitness, otimo) for fitness in melhores_fitness]
+    print(f"\nÓtimo exato: {otimo}")
+    print("Gap de cada execução: " + ", ".join(f"{gap:.2%}" for gap in gaps))
+    print(f"Gap médio: {statistics.mean(gaps):.2%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import copy
+import json
+import os
+from time import perf_counter
+
+from execucao_paralela import execucao_atual
+
+# ==============================================================================
+# TELEMETRIA POR GERAÇÃO (JSONL / CSV) COM ESCRITA EM LOTES
+# ==============================================================================
+# Em vez de guardar o histórico de todas as gerações de todas as execuções em
+# listas, os laços dos AGs e do Hill Climbing enviam um registro por geração
+# (ou a cada 'intervalo' gerações) para um arquivo:
+#   execucao, geracao, melhor, media, diversidade, tempo
+# Os registros ficam em um buffer e são gravados em lotes de 'tamanho_lote'
+# linhas, com uma única escrita em modo append. Assim a memória fica constante
+# e vários processos do pool podem escrever no mesmo arquivo: cada lote é uma
+# escrita inteira no fim do arquivo. O formato vem da extensão (.csv ou
+# .jsonl) e pode ser lido depois com pandas (read_csv / read_json(lines=True)).
+# Os laços consultam 'amostrar' antes de calcular média e diversidade, então
+# gerações fora do intervalo não pagam por essas estatísticas.
+
+INTERVALO_PADRAO = 1
+TAMANHO_LOTE_PADRAO = 500
+
+CAMPOS = ("execucao", "geracao", "melhor", "media", "diversidade", "tempo")
+FORMATOS = ("jsonl", "csv")
+
+
+def proporcao_distintos(chaves):
+    """Diversidade da população: fração de indivíduos distintos (0 a 1]."""
+    chaves = list(chaves)
+    return len(set(chaves)) / len(chaves) if chaves else 0.0
+
+
+def _numero(valor):
+    """Converte escalares NumPy para tipos Python (serializáveis em JSON)."""
+    if valor is None:
+        return None
+    inteiro = int(valor)
+    return inteiro if inteiro == valor else float(valor)
+
+
+class Telemetria:
+    def __init__(self, caminho, intervalo=INTERVALO_PADRAO,
+                 tamanho_lote=TAMANHO_LOTE_PADRAO, formato=None, rotulo=None):
+        """
+        Inicializa o destino da telemetria
+
+        Args:
+            caminho: arquivo de saída (.jsonl ou .csv)
+            intervalo: grava uma geração a cada 'intervalo' (amostragem)
+            tamanho_lote: registros acumulados antes de cada escrita
+            formato: "jsonl" ou "csv" (padrão: pela extensão do arquivo)
+            rotulo: prefixo do identificador da execução (ex.: o nome da
+                variante), para várias séries no mesmo arquivo
+        """
+        if formato is None:
+            formato = "csv" if caminho.lower().endswith(".csv") else "jsonl"
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconhecido: {formato}. Use um de {FORMATOS}.")
+        self.caminho = caminho
+        self.intervalo = max(1, intervalo)
+        self.tamanho_lote = max(1, tamanho_lote)
+        self.formato = formato
+        self.rotulo = rotulo
+        self._buffer = []
+        self._inicio = perf_counter()
+        self._descritor = None
+
+    def __getstate__(self):
+        # Cada processo do pool abre o arquivo e mantém o próprio buffer
+        estado = self.__dict__.copy()
+        estado["_buffer"] = []
+        estado["_descritor"] = None
+        return estado
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def criar_arquivo(self, manter_existente=False):
+        """
+        Cria (ou esvazia) o arquivo e grava o cabeçalho do CSV. Deve ser
+        chamado uma vez, no processo principal, antes das execuções.
+        Com 'manter_existente' (ex.: ao retomar de um checkpoint), um arquivo
+        já existente recebe os novos registros no fim.
+        """
+        self.fechar()
+        if manter_existente and os.path.exists(self.caminho):
+            return self
+        with open(self.caminho, "w", encoding="utf-8") as arquivo:
+            if self.formato == "csv":
+                arquivo.write(",".join(CAMPOS) + "\n")
+        return self
+
+    def com_rotulo(self, rotulo):
+        """Cópia que grava no mesmo arquivo, com outro rótulo de execução."""
+        self.descarregar()
+        copia = copy.copy(self)
+        copia.rotulo = rotulo
+        copia._buffer = []
+        copia._descritor = None
+        return copia
+
+    def iniciar_execucao(self):
+        """Marca o início de uma execução (referência do campo 'tempo')."""
+        self._inicio = perf_counter()
+
+    def amostrar(self, geracao):
+        """Indica se a geração cai no intervalo de amostragem."""
+        return geracao % self.intervalo == 0
+
+    def registrar(self, geracao, melhor, media=None, diversidade=None,
+                  execucao=None, forcar=False):
+        """
+        Registra uma geração, respeitando o intervalo de amostragem.
+
+        Args:
+            geracao: número da geração/iteração
+            melhor: melhor fitness da geração
+            media: fitness médio da geração (opcional)
+            diversidade: diversidade da população (opcional)
+            execucao: identificador da execução (padrão: número da execução
+                em andamento em execucao_paralela)
+            forcar: grava mesmo fora do intervalo (ex.: última geração)
+        """
+        if not forcar and not self.amostrar(geracao):
+            return
+        if execucao is None:
+            execucao = execucao_atual()
+        if self.rotulo is not None:
+            execucao = f"{self.rotulo}-{execucao}" if execucao is not None else self.rotulo
+        registro = (
+            execucao, geracao, _numero(melhor), _numero(media),
+            _numero(diversidade), round(perf_counter() - self._inicio, 6),
+        )
+
+        if self.formato == "csv":
+            linha = ",".join("" if valor is None else str(valor) for valor in registro)
+        else:
+            linha = json.dumps(dict(zip(CAMPOS, registro)))
+        self._buffer.append(linha + "\n")
+
+        if len(self._buffer) >= self.tamanho_lote:
+            self.descarregar()
+
+    def descarregar(self):
+        """Grava o buffer com uma única escrita em modo append."""
+        if not self._buffer:
+            return
+        if self._descritor is None:
+            self._descritor = os.open(
+                self.caminho, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+            )
+        os.write(self._descritor, "".join(self._buffer).encode("utf-8"))
+        self._buffer.clear()
+
+    def fechar(self):
+        """Grava o que restou no buffer e fecha o arquivo."""
+        self.descarregar()
+        if self._descritor is not None:
+            os.close(self._descritor)
+            self._descritor = None
@@ -0,0 +1,285 @@
+import numpy as np
+
+from movimentos_tsp import aplicar_2opt, comprimento_rota, delta_2opt
+from tsp_problem_atv_05 import USA13
+
+# ==============================================================================
+# SOLUÇÃO EXATA DO TSP (REFERÊNCIA PARA OS EXPERIMENTOS)
+# ==============================================================================
+# - Held-Karp (programação dinâmica sobre subconjuntos) para n <= LIMITE_HELD_KARP.
+#   A tabela é um array int32 indexado por (subconjunto, última cidade), sem a
+#   cidade inicial: para n = 20 são 2^19 x 19 x 4 bytes ~ 40 MB (+10 MB de pais).
+# - Branch-and-bound para n um pouco maior: limite inferior da 1-árvore com
+#   penalidades de Held-Karp (otimização por subgradiente) na raiz e, em cada
+#   nó, árvore geradora mínima penalizada das cidades que faltam.
+# As rotas seguem o formato do projeto: começam e terminam na cidade 0.
+# O limite da 1-árvore e o branch-and-bound supõem matriz simétrica.
+
+LIMITE_HELD_KARP = 20
+LIMITE_NOS_BB = 2_000_000
+ITERACOES_SUBGRADIENTE = 200
+
+
+def held_karp(matriz_distancias):
+    """
+    Resolve o TSP de forma exata por programação dinâmica (Held-Karp).
+    Cada camada (subconjuntos de mesmo tamanho) é processada de forma
+    vetorizada para cada última cidade.
+
+    Returns:
+        tuple: (distancia_otima, rota_otima)
+    """
+    d = np.asarray(matriz_distancias, dtype=np.int64)
+    n = len(d)
+    if n <= 2:
+        rota = list(range(n)) + [0]
+        return int(comprimento_rota(rota, d)), rota
+
+    m = n - 1  # cidades 1..n-1 viram os bits 0..m-1
+    infinito = np.iinfo(np.int32).max
+    tabela_dtype = np.int32 if d.max() * n < infinito else np.int64
+    infinito = np.iinfo(tabela_dtype).max
+
+    custo = np.full((1 << m, m), infinito, dtype=tabela_dtype)
+    pai = np.full((1 << m, m), -1, dtype=np.int8)
+    custo[1 << np.arange(m), np.arange(m)] = d[0, 1:]
+
+    mascaras = np.arange(1 << m, dtype=np.int64)
+    cardinalidade = np.zeros(1 << m, dtype=np.int8)
+    for bit in range(m):
+        cardinalidade += ((mascaras >> bit) & 1).astype(np.int8)
+
+    custo_entre = d[1:, 1:]  # custo_entre[i, j] = distância da cidade i+1 à j+1
+    for tamanho in range(2, m + 1):
+        camada = mascaras[cardinalidade == tamanho]
+        for j in range(m):
+            com_j = camada[(camada >> j) & 1 == 1]
+            anteriores = com_j ^ (1 << j)
+            parcial = custo[anteriores].astype(np.int64)  # (subconjuntos, m)
+            parcial[parcial == infinito] = np.iinfo(np.int64).max // 2
+            candidatos = parcial + custo_entre[:, j]
+            melhor_i = np.argmin(candidatos, axis=1)
+            custo[com_j, j] = candidatos[np.arange(len(com_j)), melhor_i]
+            pai[com_j, j] = melhor_i
+
+    completo = (1 << m) - 1
+    fechamento = custo[completo].astype(np.int64) + d[1:, 0]
+    ultima = int(np.argmin(fechamento))
+    distancia = int(fechamento[ultima])
+
+    # Reconstrução da rota de trás para frente
+    caminho = []
+    mascara = completo
+    while ultima != -1:
+        caminho.append(ultima + 1)
+        anterior = int(pai[mascara, ultima])
+        mascara ^= 1 << ultima
+        ultima = anterior if mascara else -1
+
+    return distancia, [0] + caminho[::-1] + [0]
+
+
+def _arvore_geradora_minima(custos):
+    """Custo da árvore geradora mínima (Prim vetorizado) de uma matriz densa."""
+    k = len(custos)
+    if k <= 1:
+        return 0.0
+    na_arvore = np.zeros(k, dtype=bool)
+    na_arvore[0] = True
+    menor = custos[0].astype(np.float64).copy()
+    total = 0.0
+    for _ in range(k - 1):
+        menor[na_arvore] = np.inf
+        v = int(np.argmin(menor))
+        total += menor[v]
+        na_arvore[v] = True
+        menor = np.minimum(menor, custos[v])
+    return total
+
+
+def _graus_1_arvore(custos):
+    """Custo e grau de cada vértice na 1-árvore mínima (vértice especial 0)."""
+    k = len(custos)
+    graus = np.zeros(k, dtype=np.int64)
+
+    # Árvore geradora mínima dos vértices 1..k-1 (Prim com registro dos pais)
+    na_arvore = np.zeros(k, dtype=bool)
+    na_arvore[0] = True  # fora da árvore: será ligado depois
+    na_arvore[1] = True
+    menor = custos[1].astype(np.float64).copy()
+    origem = np.ones(k, dtype=np.int64)
+    total = 0.0
+    for _ in range(k - 2):
+        menor[na_arvore] = np.inf
+        v = int(np.argmin(menor))
+        total += menor[v]
+        graus[v] += 1
+        graus[origem[v]] += 1
+        na_arvore[v] = True
+        melhora = custos[v] < menor
+        menor = np.where(melhora, custos[v], menor)
+        origem = np.where(melhora, v, origem)
+
+    # O vértice 0 se liga às duas arestas mais baratas
+    duas = np.argsort(custos[0, 1:])[:2] + 1
+    total += custos[0, duas].sum()
+    graus[0] = 2
+    graus[duas] += 1
+    return total, graus
+
+
+def limite_1_arvore(matriz_distancias, limite_superior=None,
+                    iteracoes=ITERACOES_SUBGRADIENTE):
+    """
+    Limite inferior de Held-Karp: 1-árvore mínima com penalidades nos
+    vértices ajustadas por subgradiente.
+
+    Returns:
+        tuple: (limite_inferior, penalidades)
+    """
+    d = np.asarray(matriz_distancias, dtype=np.float64)
+    n = len(d)
+    penalidades = np.zeros(n)
+    melhor_limite = -np.inf
+    melhores_penalidades = penalidades.copy()
+    if limite_superior is None:
+        limite_superior = comprimento_rota(_vizinho_mais_proximo(d), d)
+
+    passo = 2.0
+    for _ in range(iteracoes):
+        custos = d + penalidades[:, None] + penalidades[None, :]
+        np.fill_diagonal(custos, np.inf)
+        valor, graus = _graus_1_arvore(custos)
+        limite = valor - 2 * penalidades.sum()
+        if limite > melhor_limite:
+            melhor_limite = limite
+            melhores_penalidades = penalidades.copy()
+
+        subgradiente = graus - 2
+        norma = float((subgradiente ** 2).sum())
+        if norma == 0:
+            break  # a 1-árvore já é uma rota: limite ótimo
+        penalidades = penalidades + passo * (limite_superior - limite) / norma * subgradiente
+        passo *= 0.97
+
+    return float(melhor_limite), melhores_penalidades
+
+
+def _vizinho_mais_proximo(d):
+    """Rota inicial pelo vizinho mais próximo, partindo da cidade 0."""
+    n = len(d)
+    visitada = np.zeros(n, dtype=bool)
+    visitada[0] = True
+    rota = [0]
+    for _ in range(n - 1):
+        distancias = np.where(visitada, np.inf, d[rota[-1]])
+        proxima = int(np.argmin(distancias))
+        visitada[proxima] = True
+        rota.append(proxima)
+    return rota + [0]
+
+
+def _melhorar_2opt(rota, d):
+    """2-opt completo (primeira melhora) para obter um bom limite superior."""
+    melhorou = True
+    while melhorou:
+        melhorou = False
+        for i in range(1, len(rota) - 2):
+            for j in range(i + 1, len(rota) - 1):
+                if delta_2opt(rota, d, i, j) < -1e-9:
+                    aplicar_2opt(rota, i, j)
+                    melhorou = True
+    return rota
+
+
+def branch_and_bound(matriz_distancias, limite_nos=LIMITE_NOS_BB):
+    """
+    Branch-and-bound em profundidade para o TSP simétrico.
+    O limite de cada nó é: custo do caminho parcial + árvore geradora
+    mínima penalizada das cidades restantes (incluindo a atual e a 0),
+    descontadas as penalidades.
+
+    Returns:
+        dict: rota, distância, limite inferior (1-árvore) e se o ótimo foi provado
+    """
+    d = np.asarray(matriz_distancias, dtype=np.float64)
+    n = len(d)
+
+    melhor_rota = _melhorar_2opt(_vizinho_mais_proximo(d), d)
+    melhor_distancia = comprimento_rota(melhor_rota, d)
+    limite_raiz, pi = limite_1_arvore(d, melhor_distancia)
+
+    custos = d + pi[:, None] + pi[None, :]
+    inteiro = bool(np.all(d == np.round(d)))
+    folga = 1 - 1e-6 if inteiro else 1e-9
+
+    nos = 0
+    # Pilha de (caminho, custo, visitadas como bitmask); vazia se a rota
+    # inicial já atinge o limite da raiz
+    pilha = [([0], 0.0, 1)] if limite_raiz <= melhor_distancia - folga else []
+    while pilha:
+        nos += 1
+        if nos > limite_nos:
+            break
+        caminho, custo, visitadas = pilha.pop()
+        atual = caminho[-1]
+
+        if len(caminho) == n:
+            total = custo + d[atual, 0]
+            if total < melhor_distancia - 1e-9:
+                melhor_distancia = total
+                melhor_rota = caminho + [0]
+            continue
+
+        restantes = [c for c in range(1, n) if not (visitadas >> c) & 1]
+        vertices = [atual, 0] + restantes
+        arvore = _arvore_geradora_minima(custos[np.ix_(vertices, vertices)])
+        limite = custo + arvore - 2 * pi[restantes].sum() - pi[atual] - pi[0]
+        if limite > melhor_distancia - folga:
+            continue
+
+        # Explora primeiro a cidade mais próxima (empilhada por último)
+        for proxima in sorted(restantes, key=lambda c: -d[atual, c]):
+            pilha.append((caminho + [proxima], custo + d[atual, proxima], visitadas | (1 << proxima)))
+
+    provado = not pilha
+    if inteiro:
+        melhor_distancia = int(round(melhor_distancia))
+    return {
+        "rota": [int(c) for c in melhor_rota],
+        "distancia": melhor_distancia,
+        "limite_inferior": melhor_distancia if provado else limite_raiz,
+        "limite_1_arvore": limite_raiz,
+        "otimo_provado": provado,
+        "metodo": "branch_and_bound",
+    }
+
+
+def resolver_tsp(matriz_distancias=USA13):
+    """
+    Resolve o TSP de forma exata (Held-Karp até LIMITE_HELD_KARP cidades,
+    branch-and-bound acima disso).
+
+    Returns:
+        dict: rota ótima, distância, limite inferior e método
+    """
+    d = np.asarray(matriz_distancias)
+    if len(d) <= LIMITE_HELD_KARP:
+        distancia, rota = held_karp(d)
+        limite_raiz, _ = limite_1_arvore(d, distancia)
+        return {
+            "rota": rota,
+            "distancia": distancia,
+            "limite_inferior": distancia,
+            "limite_1_arvore": limite_raiz,
+            "otimo_provado": True,
+            "metodo": "held_karp",
+        }
+    return branch_and_bound(d)
+
+
+if __name__ == "__main__":
+    resultado = resolver_tsp(USA13)
+    print(f"Rota ótima: {resultado['rota']}")
+    print(f"Distância ótima: {resultado['distancia']} milhas ({resultado['metodo']})")
+    print(f"Limite inferior da 1-árvore: {resultado['limite_1_arvore']:.2f} milhas")
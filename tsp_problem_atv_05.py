@@ -38,13 +38,18 @@ def distancia_total(rota, matriz_distancias):
     return distancia_total
 
 
-def rota_valida(rota, num_cidades):
+def rota_valida(rota, instancia):
     """
     Uma rota é válida se:
       - Começa e termina na mesma cidade.
       - Todas as outras cidades são visitadas exatamente uma vez.
       - Não há cidades fora do intervalo permitido (0 até num_cidades - 1).
+
+    'instancia' é uma InstanciaTSP (instancias_tsp); um número de cidades
+    também é aceito.
     """
+    num_cidades = getattr(instancia, "dimensao", instancia)
+
     # Verifica se a rota não está vazia
     if not rota:
         print("Rota vazia.")